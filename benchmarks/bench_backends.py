@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+# bench_backends.py
+#
+# purpose:  Benchmark the compiled backends against NumPy, per function.
+#
+# obs:  Run with `python bench_backends.py [backend] [sizes...]`.  The first
+# call of each function is left out of the timings (compilation or loading
+# from the cache).  Peak memory is traced for a call without `out`, so it
+# includes the result array.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+import tracemalloc
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+
+
+def ctd_scans(n, seed=42):
+    """Synthetic CTD scans spanning the oceanographic range."""
+    rng = np.random.RandomState(seed)
+    p = rng.uniform(0, 6000, n)
+    t = 2 + 26 * np.exp(-p / 800.) + rng.normal(0, 0.5, n)
+    s = 34.7 + 0.8 * np.exp(-p / 500.) + rng.normal(0, 0.1, n)
+    return s, t, p
+
+
+def functions(s, t, p):
+    return (('adtg', sw.adtg, (s, t, p)),
+            ('ptmp', sw.ptmp, (s, t, p, 1000.)),
+            ('temp', sw.temp, (s, t, p, 1000.)),
+            ('seck', sw.seck, (s, t, p)),
+            ('dens0', sw.dens0, (s, t)),
+            ('dens', sw.dens, (s, t, p)),
+            ('pden', sw.pden, (s, t, p, 1000.)),
+            ('svan', sw.svan, (s, t, p)),
+            ('svel', sw.svel, (s, t, p)),
+            ('cp', sw.cp, (s, t, p)),
+            ('alpha', sw.alpha, (s, t, p)),
+            ('cndr', sw.cndr, (s, t, p)))
+
+
+def measure(func, args, out, repeat=3):
+    """Best wall time [s] and peak traced memory [MB]."""
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func(*args, out=out)
+        timings.append(default_timer() - start)
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak / 2. ** 20
+
+
+def main(backend='numba', sizes=(1e3, 1e6, 1e7)):
+    print('%10s %8s %10s %10s %10s %10s %9s %9s' %
+          ('n', 'function', 'numpy [s]', '[MB]', '%s [s]' % backend, '[MB]',
+           'speed-up', 'max rel'))
+    for n in sizes:
+        n = int(n)
+        out = np.empty(n)
+        for name, func, args in functions(*ctd_scans(n)):
+            sw.set_backend('numpy')
+            expected = func(*args)
+            ref = measure(func, args, out)
+            if sw.set_backend(backend) != backend:
+                raise SystemExit('%s backend is not available.' % backend)
+            res = func(*args)  # Warm up.
+            new = measure(func, args, out)
+            sw.set_backend('numpy')
+            err = np.nanmax(np.abs(res - expected) / np.abs(expected))
+            print('%10d %8s %10.6f %10.1f %10.6f %10.1f %9.2f %9.1e' %
+                  ((n, name) + ref + new + (ref[0] / new[0], err)))
+
+
+if __name__ == '__main__':
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'numba'
+    sizes = [float(arg) for arg in sys.argv[2:]] or (1e3, 1e6, 1e7)
+    main(backend, sizes)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# bench_bfrq.py
+#
+# purpose:  Benchmark the N2 kernel of bfrq.
+#
+# obs:  Run with `python bench_bfrq.py [levels stations]`, default is a
+# 2000 levels x 1000 stations section.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+from suite import profiles
+
+
+def bfrq_reference(s, t, p, lat):
+    """N2, q and p_ave as computed before the N2 kernel, with a full `pden`
+    for the upper and for the lower levels."""
+    z = sw.dpth(p, lat)
+    grav = sw.g(lat, -z)
+    cor = -sw.f(lat)
+    p_ave = (p[0:-1, ...] + p[1:, ...]) / 2.
+    pden_up = sw.pden(s[0:-1, ...], t[0:-1, ...], p[0:-1, ...], p_ave)
+    pden_lo = sw.pden(s[1:, ...], t[1:, ...], p[1:, ...], p_ave)
+    mid_pden = (pden_up + pden_lo) / 2.
+    dif_pden = pden_up - pden_lo
+    mid_g = (grav[0:-1, ...] + grav[1:, ...]) / 2.
+    den = (z[1:, ...] - z[0:-1, ...]) * mid_pden
+    n2 = -mid_g * dif_pden / den
+    q = cor * dif_pden / den
+    return n2, q, p_ave
+
+
+def best(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func()
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def main(levels=2000, stations=1000):
+    s, t, p, lat, lon = profiles(int(levels), int(stations))
+    for x, y in zip(sw.bfrq(s, t, p, lat), bfrq_reference(s, t, p, lat)):
+        np.testing.assert_array_equal(x, y)
+
+    ws = sw.Workspace()
+    out = tuple(np.empty_like(x) for x in sw.bfrq(s, t, p, lat))
+    cases = (('reference', lambda: bfrq_reference(s, t, p, lat)),
+             ('bfrq', lambda: sw.bfrq(s, t, p, lat)),
+             ('bfrq n2', lambda: sw.bfrq(s, t, p, lat, outputs='n2')),
+             ('bfrq ws', lambda: sw.bfrq(s, t, p, lat, out=out, ws=ws)),
+             ('no lat', lambda: sw.bfrq(s, t, p, outputs='n2')))
+    print('%d levels x %d stations' % (levels, stations))
+    print('%10s %12s %9s' % ('case', 'time [s]', 'speed-up'))
+    ref = None
+    for name, func in cases:
+        elapsed = best(func)
+        ref = ref or elapsed
+        print('%10s %12.6f %9.2f' % (name, elapsed, ref / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
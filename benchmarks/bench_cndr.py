@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# bench_cndr.py
+#
+# purpose:  Benchmark the vectorized Newton-Raphson solver in cndr.
+#
+# obs:  Run with `python bench_cndr.py [sizes...]`.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+from seawater.library import T68conv, salds, sals, salrt, d, e
+
+
+def cndr_loop(s, t, p):
+    """The element-wise loop used before the vectorized solver.  Used as a
+    reference for both the timings and the results."""
+    s, t, p = map(np.asanyarray, (s, t, p))
+    T68 = T68conv(t)
+    Rx = []
+    for S, T in zip(np.ravel(s), np.ravel(t)):
+        Rx_loop = np.sqrt(S / 35.0)
+        SInc = sals(Rx_loop * Rx_loop, T)
+        iloop = 0
+        while True:
+            Rx_loop = Rx_loop + (S - SInc) / salds(Rx_loop, T / 1.00024 - 15)
+            SInc = sals(Rx_loop * Rx_loop, T)
+            iloop += 1
+            if not (abs(SInc - S) > 1.0e-10 and iloop < 100):
+                break
+        Rx.append(Rx_loop)
+    Rx = np.array(Rx).reshape(s.shape)
+    A = (d[2] + d[3] * T68)
+    B = 1 + d[0] * T68 + d[1] * T68 ** 2
+    C = p * (e[0] + e[1] * p + e[2] * p ** 2)
+    Rt = Rx ** 2
+    rt = salrt(t)
+    D = B - A * rt * Rt
+    E = rt * Rt * A * (B + C)
+    r = np.sqrt(np.abs(D ** 2 + 4 * E)) - D
+    return 0.5 * r / A
+
+
+def ctd_scans(n, seed=42):
+    """Synthetic CTD scans spanning the oceanographic range."""
+    rng = np.random.RandomState(seed)
+    p = rng.uniform(0, 6000, n)
+    t = 2 + 26 * np.exp(-p / 800.) + rng.normal(0, 0.5, n)
+    s = 34.7 + 0.8 * np.exp(-p / 500.) + rng.normal(0, 0.1, n)
+    return s, t, p
+
+
+def best_of(func, args, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func(*args)
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def main(sizes=(1e3, 1e6, 1e7), loop_max=1e4):
+    print('%10s %14s %14s %10s' % ('n', 'cndr [s]', 'loop [s]', 'speed-up'))
+    for n in sizes:
+        n = int(n)
+        args = ctd_scans(n)
+        repeat = 3 if n <= 1e6 else 1
+        vec = best_of(sw.cndr, args, repeat)
+        if n <= loop_max:
+            loop = best_of(cndr_loop, args, 1)
+            np.testing.assert_array_equal(sw.cndr(*args), cndr_loop(*args))
+            print('%10d %14.6f %14.6f %10.1f' % (n, vec, loop, loop / vec))
+        else:
+            print('%10d %14.6f %14s %10s' % (n, vec, '-', '-'))
+
+
+if __name__ == '__main__':
+    sizes = [float(arg) for arg in sys.argv[1:]] or (1e3, 1e6, 1e7)
+    main(sizes)
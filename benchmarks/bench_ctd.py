@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# bench_ctd.py
+#
+# purpose:  Benchmark the CTD conversion pipeline against the chain of
+#           individual functions.
+#
+# obs:  Run with `python bench_ctd.py [levels...]`, 10 casts per size.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+from seawater.constants import c3515
+
+
+def casts(levels, stations=10, seed=42):
+    """Synthetic conductivity, temperature and pressure casts."""
+    rng = np.random.RandomState(seed)
+    p = np.linspace(0, 6000, levels)[:, None] * np.ones((1, stations))
+    t = 2 + 26 * np.exp(-p / 800.) + rng.normal(0, 0.05, p.shape)
+    s = 34.7 + 0.8 * np.exp(-p / 500.) + rng.normal(0, 0.01, p.shape)
+    lat = np.linspace(-30, -20, stations)
+    return sw.cndr(s, t, p) * c3515, t, p, lat
+
+
+def chain(c, t, p, lat):
+    """The workflow before `process_cast`."""
+    s = sw.salt(c / c3515, t, p)
+    n2, q, p_ave = sw.bfrq(s, t, p, lat)
+    return (s, sw.ptmp(s, t, p), sw.pden(s, t, p) - 1000, sw.svel(s, t, p),
+            sw.dpth(p, lat), n2, p_ave)
+
+
+def best(func, args, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func(*args)
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def main(sizes=(100, 10000, 100000)):
+    print('%10s %12s %12s %12s %9s' %
+          ('levels', 'chain [s]', 'cast [s]', 'ws [s]', 'speed-up'))
+    for levels in sizes:
+        args = casts(int(levels))
+        ws = sw.Workspace()
+        ref = best(chain, args)
+        new = best(sw.process_cast, args)
+        new_ws = best(lambda *a: sw.process_cast(*a, ws=ws), args)
+        print('%10d %12.6f %12.6f %12.6f %9.2f' %
+              (levels, ref, new, new_ws, ref / new_ws))
+
+
+if __name__ == '__main__':
+    main([float(arg) for arg in sys.argv[1:]] or (100, 10000, 100000))
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# bench_float32.py
+#
+# purpose:  Accuracy and speed of float32 inputs in the 'preserve' dtype mode.
+#
+# obs:  Run with `python bench_float32.py [n]`.  Inputs are drawn over the
+# oceanographic range, s 30 to 40, t -2 to 30 and p 0 to 6000, rounded to
+# float32 and fed to both paths, so the errors are those of the computation
+# alone.  The relative error is the maximum absolute error over the largest
+# magnitude of the float64 results.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+import tracemalloc
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+from seawater.library import T68conv, T90conv
+
+
+def inputs(n, seed=42):
+    rng = np.random.RandomState(seed)
+    s = rng.uniform(30, 40, n)
+    t = rng.uniform(-2, 30, n)
+    p = rng.uniform(0, 6000, n)
+    lat = rng.uniform(-80, 80, n)
+    lon = rng.uniform(-180, 180, n)
+    r = sw.cndr(s, t, p)
+    # Profiles: 100 levels per station.
+    m = n // 100
+    P = np.linspace(0, 6000, 100)[:, None] * np.ones(m)
+    T = 2 + 26 * np.exp(-P / 800.) + rng.normal(0, 0.01, P.shape)
+    S = 34.7 + 0.8 * np.exp(-P / 500.) + rng.normal(0, 0.001, P.shape)
+    return s, t, p, r, lat, lon, S, T, P
+
+
+def functions(s, t, p, r, lat, lon, S, T, P):
+    return (('adtg', sw.adtg, (s, t, p)),
+            ('alpha', sw.alpha, (s, t, p)),
+            ('aonb', sw.aonb, (s, t, p)),
+            ('beta', sw.beta, (s, t, p)),
+            ('cndr', sw.cndr, (s, t, p)),
+            ('cp', sw.cp, (s, t, p)),
+            ('dens0', sw.dens0, (s, t)),
+            ('dens', sw.dens, (s, t, p)),
+            ('dpth', sw.dpth, (p, lat)),
+            ('fp', sw.fp, (s, p)),
+            ('g', sw.g, (lat,)),
+            ('pden', sw.pden, (s, t, p)),
+            ('pres', sw.pres, (p, lat)),
+            ('ptmp', sw.ptmp, (s, t, p)),
+            ('salt', sw.salt, (r, t, p)),
+            ('svel', sw.svel, (s, t, p)),
+            ('temp', sw.temp, (s, t, p)),
+            ('salrp', sw.salrp, (r, t, p)),
+            ('salrt', sw.salrt, (t,)),
+            ('seck', sw.seck, (s, t, p)),
+            ('sals', sw.sals, (r, t)),
+            ('smow', sw.smow, (t,)),
+            ('T68conv', T68conv, (t,)),
+            ('T90conv', T90conv, (t,)),
+            ('f', sw.f, (lat,)),
+            ('satAr', sw.satAr, (s, t)),
+            ('satN2', sw.satN2, (s, t)),
+            ('satO2', sw.satO2, (s, t)),
+            ('svan', sw.svan, (s, t, p)),
+            ('dist', lambda lat, lon: sw.dist(lat, lon)[0], (lat, lon)),
+            ('gpan', sw.gpan, (S, T, P)),
+            ('bfrq', lambda S, T, P: sw.bfrq(S, T, P)[0], (S, T, P)))
+
+
+def measure(func, args, repeat=3):
+    """Best wall time [s], peak traced memory [MB] and the result."""
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func(*args)
+        timings.append(default_timer() - start)
+    tracemalloc.start()
+    res = func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak / 2. ** 20, res
+
+
+def main(n=1e6):
+    n = int(n)
+    args64 = [x.astype(np.float32).astype(np.float64) for x in inputs(n)]
+    args32 = [x.astype(np.float32) for x in args64]
+    print('%8s %10s %8s %10s %8s %9s %9s %9s' %
+          ('function', 'f64 [s]', '[MB]', 'f32 [s]', '[MB]', 'speed-up',
+           'max abs', 'rel'))
+    for (name, func, a64), (_, _, a32) in zip(functions(*args64),
+                                              functions(*args32)):
+        ref = measure(func, a64)
+        sw.set_dtype_mode('preserve')
+        try:
+            new = measure(func, a32)
+        finally:
+            sw.set_dtype_mode('promote')
+        expected, res = ref[2], new[2]
+        if res.dtype != np.float32:
+            raise SystemExit('%s returned %s.' % (name, res.dtype))
+        err = np.nanmax(np.abs(res - expected))
+        rel = err / np.nanmax(np.abs(expected))
+        print('%8s %10.6f %8.1f %10.6f %8.1f %9.2f %9.1e %9.1e' %
+              (name, ref[0], ref[1], new[0], new[1], ref[0] / new[0], err,
+               rel))
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
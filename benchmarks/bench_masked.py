@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# bench_masked.py
+#
+# purpose:  Benchmark the evaluation on the valid cells of a masked grid.
+#
+# obs:  Run with `python bench_masked.py [land fraction]`, a 50 x 180 x 360
+# (depth, lat, lon) grid with 30% of land by default.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+
+
+def grid(land=0.3, shape=(50, 180, 360), seed=42):
+    """Synthetic (s, t, p) on a model grid, NaN over a random land mask."""
+    rng = np.random.RandomState(seed)
+    mask = rng.uniform(0, 1, shape[1:]) < land
+    p = np.linspace(0, 5000, shape[0])[:, None, None] * np.ones(shape)
+    t = 2 + 20 * np.exp(-p / 700.) + rng.normal(0, 0.1, shape)
+    s = 34.7 + np.exp(-p / 400.) + rng.normal(0, 0.01, shape)
+    s[:, mask] = t[:, mask] = np.NaN
+    return s, t, p, mask
+
+
+def best(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func()
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def main(land=0.3):
+    s, t, p, mask = grid(land)
+    index = sw.masked.MaskIndex(mask, shape=s.shape)
+    ms, mt = [np.ma.masked_invalid(x) for x in (s, t)]
+    ws = sw.Workspace()
+    print('%.0f%% land, %s grid' % (100 * land, 'x'.join(map(str, s.shape))))
+    print('%8s %12s %12s %12s %12s %9s' %
+          ('function', 'NaN [s]', 'masked [s]', 'compact [s]', 'index [s]',
+           'speed-up'))
+    for name in ('dens', 'ptmp', 'svel'):
+        func = getattr(sw, name)
+        with np.errstate(invalid='ignore'):
+            nan = best(lambda: func(s, t, p))
+            masked = best(lambda: func(ms, mt, p))
+        compact = best(lambda: sw.masked.run(func, (s, t, p)))
+        indexed = best(lambda: sw.masked.run(func, (s, t, p), index=index,
+                                             ws=ws))
+        print('%8s %12.6f %12.6f %12.6f %12.6f %9.2f' %
+              (name, nan, masked, compact, indexed, nan / indexed))
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# bench_parallel.py
+#
+# purpose:  Scaling of the multi-threaded evaluation from 1 to N threads.
+#
+# obs:  Run with `python bench_parallel.py [n] [max workers]`.  Defaults to
+# 1e7 elements and the number of CPUs, doubling the workers from 1.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+from multiprocessing import cpu_count
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+
+
+def ctd_scans(n, seed=42):
+    """Synthetic CTD scans spanning the oceanographic range."""
+    rng = np.random.RandomState(seed)
+    p = rng.uniform(0, 6000, n)
+    t = 2 + 26 * np.exp(-p / 800.) + rng.normal(0, 0.5, n)
+    s = 34.7 + 0.8 * np.exp(-p / 500.) + rng.normal(0, 0.1, n)
+    return s, t, p
+
+
+def best(func, args, workers, out, repeat=3):
+    """Best wall time [s]."""
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        sw.parallel.run(func, args, workers=workers, out=out)
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def main(n=1e7, max_workers=None):
+    n = int(n)
+    s, t, p = ctd_scans(n)
+    out = np.empty(n)
+    workers = [1]
+    while workers[-1] * 2 <= (max_workers or cpu_count()):
+        workers.append(workers[-1] * 2)
+    print('%8s %8s %12s %9s %11s' %
+          ('function', 'workers', 'time [s]', 'speed-up', 'efficiency'))
+    for name, func, args in (('dens', sw.dens, (s, t, p)),
+                             ('ptmp', sw.ptmp, (s, t, p, 1000.)),
+                             ('svel', sw.svel, (s, t, p)),
+                             ('pden', sw.pden, (s, t, p, 1000.)),
+                             ('cndr', sw.cndr, (s, t, p))):
+        serial = None
+        for k in workers:
+            sw.parallel.run(func, args, workers=k, out=out)  # Warm up.
+            elapsed = best(func, args, k, out)
+            serial = serial or elapsed
+            print('%8s %8d %12.6f %9.2f %11.2f' %
+                  (name, k, elapsed, serial / elapsed, serial / elapsed / k))
+
+
+if __name__ == '__main__':
+    n = float(sys.argv[1]) if len(sys.argv) > 1 else 1e7
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    main(n, max_workers)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# bench_profiling.py
+#
+# purpose:  Overhead of the profiling counters.
+#
+# obs:  Run with `python bench_profiling.py [number]`, the time per call
+# with profiling disabled, enabled, and the difference.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+from timeit import repeat
+
+import numpy as np
+import seawater as sw
+
+
+def main(number=2000):
+    number = int(number)
+    print('%8s %8s %12s %12s %12s' %
+          ('function', 'n', 'off [us]', 'on [us]', 'extra [us]'))
+    for n in (1, 1000, 100000):
+        s, t, p = 35 + np.zeros(n), 10 + np.zeros(n), np.linspace(0, 5000, n)
+        for name in ('dens', 'ptmp', 'svel'):
+            times = []
+            for enable in (False, True):
+                if enable:
+                    sw.profiling.enable()
+                func = getattr(sw, name)
+                times.append(min(repeat(lambda: func(s, t, p),
+                                        number=max(number // n, 5),
+                                        repeat=5)) / max(number // n, 5) * 1e6)
+                sw.profiling.disable()
+            print('%8s %8d %12.2f %12.2f %12.2f' %
+                  ((name, n) + tuple(times) + (times[1] - times[0],)))
+    sw.profiling.reset()
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
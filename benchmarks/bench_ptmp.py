@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# bench_ptmp.py
+#
+# purpose:  Benchmark the potential temperature engine.
+#
+# obs:  Run with `python bench_ptmp.py [sizes...]`.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+import tracemalloc
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+from seawater.library import T68conv, T90conv
+
+
+def ptmp_reference(s, t, p, pr=0):
+    """The Runge-Kutta integration as written before the engine rewrite."""
+    s, t, p, pr = map(np.asanyarray, (s, t, p, pr))
+    del_P = pr - p
+    del_th = del_P * sw.adtg(s, t, p)
+    th = T68conv(t) + 0.5 * del_th
+    q = del_th
+    del_th = del_P * sw.adtg(s, T90conv(th), p + 0.5 * del_P)
+    th = th + (1 - 1 / 2 ** 0.5) * (del_th - q)
+    q = (2 - 2 ** 0.5) * del_th + (-2 + 3 / 2 ** 0.5) * q
+    del_th = del_P * sw.adtg(s, T90conv(th), p + 0.5 * del_P)
+    th = th + (1 + 1 / 2 ** 0.5) * (del_th - q)
+    q = (2 + 2 ** 0.5) * del_th + (-2 - 3 / 2 ** 0.5) * q
+    del_th = del_P * sw.adtg(s, T90conv(th), p + del_P)
+    return T90conv(th + (del_th - 2 * q) / 6)
+
+
+def ctd_scans(n, seed=42):
+    """Synthetic CTD scans spanning the oceanographic range."""
+    rng = np.random.RandomState(seed)
+    p = rng.uniform(0, 6000, n)
+    t = 2 + 26 * np.exp(-p / 800.) + rng.normal(0, 0.5, n)
+    s = 34.7 + 0.8 * np.exp(-p / 500.) + rng.normal(0, 0.1, n)
+    return s, t, p
+
+
+def measure(func, args, kw, repeat=3):
+    """Best wall time [s] and peak traced memory [MB]."""
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func(*args, **kw)
+        timings.append(default_timer() - start)
+    tracemalloc.start()
+    func(*args, **kw)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak / 2. ** 20
+
+
+def main(sizes=(1e3, 1e6, 1e7)):
+    print('%10s %12s %12s %12s %12s %12s %12s %9s' %
+          ('n', 'ref [s]', 'ref [MB]', 'ptmp [s]', 'ptmp [MB]',
+           'out= [s]', 'out= [MB]', 'speed-up'))
+    for n in sizes:
+        n = int(n)
+        args = ctd_scans(n)
+        np.testing.assert_array_equal(sw.ptmp(*args), ptmp_reference(*args))
+        out = np.empty(n)
+        ref = measure(ptmp_reference, args, dict())
+        new = measure(sw.ptmp, args, dict())
+        new_out = measure(sw.ptmp, args, dict(out=out))
+        print('%10d %12.6f %12.1f %12.6f %12.1f %12.6f %12.1f %9.2f' %
+              ((n,) + ref + new + new_out + (ref[0] / new_out[0],)))
+
+
+if __name__ == '__main__':
+    sizes = [float(arg) for arg in sys.argv[1:]] or (1e3, 1e6, 1e7)
+    main(sizes)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# bench_scalar.py
+#
+# purpose:  Benchmark the scalar routines against the array ones for single
+#           values.
+#
+# obs:  Run with `python bench_scalar.py [number]`, the time per call of one
+# CTD scan.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+from timeit import repeat
+
+import seawater as sw
+from seawater import scalar
+
+
+def main(number=10000):
+    number = int(number)
+    s, t, p, r, lat = 35.2, 12.5, 1234., 1.05, -23.
+    cases = (('dens', (s, t, p)),
+             ('svel', (s, t, p)),
+             ('ptmp', (s, t, p)),
+             ('pden', (s, t, p)),
+             ('salt', (r, t, p)),
+             ('cndr', (s, t, p)),
+             ('svan', (s, t, p)),
+             ('alpha', (s, t, p)),
+             ('cp', (s, t, p)),
+             ('dpth', (p, lat)),
+             ('satO2', (s, t)))
+    print('%8s %12s %12s %9s %9s' %
+          ('function', 'array [us]', 'scalar [us]', 'speed-up', 'max rel'))
+    for name, args in cases:
+        array, fast = getattr(sw, name), getattr(scalar, name)
+        expected, res = array(*args), fast(*args)
+        ref = min(repeat(lambda: array(*args), number=number,
+                         repeat=3)) / number * 1e6
+        new = min(repeat(lambda: fast(*args), number=number,
+                         repeat=3)) / number * 1e6
+        print('%8s %12.2f %12.2f %9.1f %9.1e' %
+              (name, ref, new, ref / new, abs(res - expected) / expected))
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
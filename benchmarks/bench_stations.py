@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# bench_stations.py
+#
+# purpose:  Benchmark the nearest station search against brute force.
+#
+# obs:  Run with `python bench_stations.py [stations queries sample]`, default
+# is 1e5 stations x 1e6 queries.  The brute force search is timed on the
+# first `sample` queries (default 1e4) only and scaled to all of them.
+#
+
+
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+
+
+def positions(n, rng):
+    """Positions uniformly distributed on the sphere."""
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    return lat, lon
+
+
+def timed(func):
+    start = default_timer()
+    res = func()
+    return default_timer() - start, res
+
+
+def main(stations=1e5, queries=1e6, sample=1e4):
+    stations, queries, sample = int(stations), int(queries), int(sample)
+    rng = np.random.RandomState(42)
+    lat, lon = positions(stations, rng)
+    qlat, qlon = positions(queries, rng)
+
+    build, tree = timed(lambda: sw.StationIndex(lat, lon))
+    brute = sw.StationIndex(lat, lon, brute=True)
+    print('%d stations x %d queries, KD-tree built in %.3f s' %
+          (stations, queries, build))
+    print('%10s %14s %14s %9s' % ('query', 'KD-tree [s]', 'brute [s]',
+                                  'speed-up'))
+    cases = (('k=1', lambda index, n: index.query(qlat[:n], qlon[:n])),
+             ('k=8', lambda index, n: index.query(qlat[:n], qlon[:n], k=8)),
+             ('r=50 km', lambda index, n: index.query_radius(
+                 qlat[:n], qlon[:n], 50)))
+    for name, query in cases:
+        elapsed, res = timed(lambda: query(tree, queries))
+        sampled, expected = timed(lambda: query(brute, sample))
+        # Same stations and distances on the sample.
+        for x, y in zip(res, expected):
+            if isinstance(x, sw.Ragged):
+                x, y = x.values[:y.values.size], y.values
+            np.testing.assert_array_equal(x[:len(y)], y)
+        estimate = sampled * queries / sample
+        print('%10s %14.3f %14.3f %9.1f' % (name, elapsed, estimate,
+                                            estimate / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+#
+# suite.py
+#
+# purpose:  Time and peak memory of every public function.
+#
+# obs:  Run with `python suite.py [--sizes 1 1e3 ...] [--only dens ptmp ...]
+# [--workspace] [--save results.json] [--compare baseline.json]`.  The
+# element-wise functions are timed on `n` CTD scans, `bfrq`, `gpan` and
+# `gvel` on profile x station sections of about `n` elements and
+# `dist_matrix` on the stations of those sections.  All inputs are
+# synthetic, so the suite runs offline.
+#
+# Comparing against a baseline saved by an older version exits with status 1
+# when a case got slower than `--threshold` times (or used more memory than
+# `--memory-threshold` times) the baseline, e.g.:
+#
+#   python suite.py --save baseline.json   # Before the upgrade.
+#   python suite.py --compare baseline.json
+#
+
+
+from __future__ import division, print_function
+
+import argparse
+import inspect
+import json
+import platform
+import sys
+import tracemalloc
+from timeit import default_timer
+
+import numpy as np
+import seawater as sw
+
+
+# Profile x station shapes with about n elements.
+sections = {1: (2, 2), 1000: (100, 10), 1000000: (1000, 1000),
+            10000000: (2000, 5000)}
+
+
+def profiles(levels, stations, seed=42):
+    """Synthetic section of `stations` CTD profiles with `levels` pressure
+    levels from 0 to 5000 db: a mixed layer over a thermocline, a shallow
+    salinity maximum over an intermediate water minimum, small scale noise
+    and a gentle trend along the section, from 30 S to 20 S."""
+    rng = np.random.RandomState(seed)
+    p = np.linspace(0, 5000, levels)[:, None] * np.ones((1, stations))
+    x = np.linspace(0, 1, stations)[None, :]
+    mld = 30 + 40 * x + rng.uniform(0, 20, (1, stations))
+    z = np.maximum(p - mld, 0)
+    t = (2 + 20 * np.exp(-z / (600 + 200 * x)) + 4 * x +
+         rng.normal(0, 0.02, p.shape))
+    s = (34.7 + 1.2 * np.exp(-z / 150.) -
+         0.4 * np.exp(-((p - 900) / 300.) ** 2) +
+         rng.normal(0, 0.005, p.shape))
+    lat = -30 + 10 * x[0]
+    lon = -40 + 2 * np.sin(np.pi * x[0])
+    return s, t, p, lat, lon
+
+
+def scans(n, seed=42):
+    """`n` CTD scans, taken from a synthetic section."""
+    levels = 100 if n >= 100 else n
+    stations = -(-n // levels)
+    s, t, p, lat, lon = profiles(max(levels, 2), stations, seed)
+    lat = lat[None, :] * np.ones_like(p)
+    lon = lon[None, :] * np.ones_like(p)
+    return [x.ravel()[:n] for x in (s, t, p, lat, lon)]
+
+
+def cases(n):
+    """(name, function, args, kwargs) of every case for size `n`.  Cases of
+    functions the installed version does not have are left out, e.g.: when
+    saving a baseline with an older release, and so are the keywords it does
+    not accept."""
+    s, t, p, lat, lon = scans(n)
+    r = sw.cndr(s, t, p)
+    rt = sw.salrt(t)
+    S, T, P, Lat, Lon = profiles(*sections.get(n, (100, max(n // 100, 2))))
+    ga = sw.gpan(S, T, P)
+    table = (('adtg', (s, t, p), {}),
+             ('alpha', (s, t, p), {}),
+             ('aonb', (s, t, p), {}),
+             ('beta', (s, t, p), {}),
+             ('cndr', (s, t, p), {}),
+             ('cp', (s, t, p), {}),
+             ('dens0', (s, t), {}),
+             ('dens', (s, t, p), {}),
+             ('dpth', (p, lat), {}),
+             ('fp', (s, p), {}),
+             ('g', (lat, -p), {}),
+             ('pden', (s, t, p), {'pr': 1000}),
+             ('pres', (p, lat), {}),
+             ('ptmp', (s, t, p), {}),
+             ('salt', (r, t, p), {}),
+             ('state', (s, t, p), {}),
+             ('svel', (s, t, p), {}),
+             ('temp', (s, t, p), {'pr': 1000}),
+             ('salds', (r ** 0.5, t - 15), {}),
+             ('salrp', (r, t, p), {}),
+             ('salrt', (t,), {}),
+             ('seck', (s, t, p), {}),
+             ('sals', (r / rt, t), {}),
+             ('smow', (t,), {}),
+             ('dist', (lat, lon), {}),
+             ('dist_matrix', (Lat, Lon), {}),
+             ('f', (lat,), {}),
+             ('satAr', (s, t), {}),
+             ('satN2', (s, t), {}),
+             ('satO2', (s, t), {}),
+             ('gas_saturation', (s, t), {'p': p, 'units': 'umol/kg',
+                                         'o2': 250 - 0.03 * p}),
+             ('swvel', (p + 10, p), {}),
+             ('svan', (s, t, p), {}),
+             ('bfrq', (S, T, P, Lat), {}),
+             ('gpan', (S, T, P), {}),
+             ('gvel', (ga, Lat, Lon), {}))
+    return tuple((name, getattr(sw, name), args,
+                  accepted(getattr(sw, name), kwargs))
+                 for name, args, kwargs in table if hasattr(sw, name))
+
+
+def accepted(func, kwargs):
+    """The keyword arguments in `kwargs` that `func` accepts."""
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return kwargs
+    if [par for par in params.values() if par.kind == par.VAR_KEYWORD]:
+        return kwargs
+    return dict((key, value) for key, value in kwargs.items() if
+                key in params)
+
+
+def public():
+    """Names of the functions exported by `seawater`."""
+    return sorted(name for name, obj in vars(sw).items() if
+                  inspect.isfunction(obj) and not name.startswith('_') and
+                  obj.__module__.split('.')[-1] in ('eos80', 'extras',
+                                                    'geostrophic', 'library'))
+
+
+def measure(func, args, kwargs, budget=0.5):
+    """Best wall time [s] of the calls repeated for about `budget` seconds
+    (at least one, at most 1000), and peak traced memory [MB] of one more
+    call."""
+    timings = []
+    while not timings or sum(timings) < budget and len(timings) < 1000:
+        start = default_timer()
+        func(*args, **kwargs)
+        timings.append(default_timer() - start)
+    tracemalloc.start()
+    func(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak / 2. ** 20
+
+
+def empty_like(res):
+    """New array(s) for the `out` argument of a call that returned `res`."""
+    if isinstance(res, tuple):
+        return tuple(np.empty_like(x) for x in res)
+    return np.empty_like(res)
+
+
+def run(sizes, only=None, workspace=False):
+    """Results keyed by 'name n' (and the section shape for the profile
+    functions).  With `workspace` the functions that accept them get an
+    `out` array and a warm `Workspace`, and the name is suffixed by '+ws'."""
+    results = dict()
+    print('%17s %10s %12s %10s' % ('function', 'n', 'time [s]', 'peak [MB]'))
+    for n in sizes:
+        for name, func, args, kwargs in cases(n):
+            if only and name not in only:
+                continue
+            if workspace and hasattr(sw, 'Workspace'):
+                kwargs = accepted(func, dict(kwargs, ws=sw.Workspace(),
+                                             out=empty_like(func(*args,
+                                                                 **kwargs))))
+                if 'ws' in kwargs:
+                    name += '+ws'
+            shape = np.broadcast(*args).shape
+            key = '%s %s' % (name, 'x'.join(str(k) for k in shape) or 1)
+            results[key] = measure(func, args, kwargs)
+            print('%17s %10s %12.6f %10.1f' % ((name, key.split()[1]) +
+                                              results[key]))
+            sys.stdout.flush()
+    return results
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """Prints the ratios to the `baseline` and returns the regressions."""
+    regressions = []
+    print('\n%17s %10s %12s %10s %9s %9s' %
+          ('function', 'n', 'time [s]', 'peak [MB]', 'time', 'memory'))
+    for key in sorted(results):
+        if key not in baseline:
+            continue
+        (time, mb), (time0, mb0) = results[key], baseline[key]
+        ratio, mb_ratio = time / time0, (mb + 1e-3) / (mb0 + 1e-3)
+        flag = ''
+        if ratio > threshold or mb_ratio > memory_threshold:
+            regressions.append(key)
+            flag = ' <-- regression'
+        print('%17s %10s %12.6f %10.1f %8.2fx %8.2fx%s' %
+              (tuple(key.split()) + (time, mb, ratio, mb_ratio, flag)))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Time and peak memory of every public function.')
+    parser.add_argument('--sizes', nargs='+', type=float,
+                        default=[1, 1e3, 1e6, 1e7])
+    parser.add_argument('--only', nargs='+', help='function names')
+    parser.add_argument('--workspace', action='store_true',
+                        help='pass out= and a reusable Workspace')
+    parser.add_argument('--save', help='write the results to a JSON file')
+    parser.add_argument('--compare', help='JSON file saved by --save')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown flagged as a regression')
+    parser.add_argument('--memory-threshold', type=float, default=1.1,
+                        help='peak memory growth flagged as a regression')
+    args = parser.parse_args(argv)
+
+    covered = set(case[0] for case in cases(1))
+    missing = [name for name in public() if name not in covered]
+    if missing:
+        raise SystemExit('No benchmark for %s.' % ', '.join(missing))
+
+    results = run([int(n) for n in args.sizes], args.only, args.workspace)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(dict(seawater=sw.__version__, numpy=np.__version__,
+                           python=platform.python_version(),
+                           machine=platform.platform(), results=results),
+                      f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print('\nBaseline: seawater %s, NumPy %s, Python %s on %s.' %
+              tuple(baseline[k] for k in ('seawater', 'numpy', 'python',
+                                          'machine')))
+        regressions = compare(results, baseline['results'], args.threshold,
+                              args.memory_threshold)
+        if regressions:
+            print('\n%d regressions.' % len(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,10 +2,31 @@
 
 from __future__ import absolute_import
 
+import os
+
 __version__ = '3.3.1'
 
-from .geostrophic import bfrq, svan, gpan, gvel
-from .extras import dist, f, satAr, satN2, satO2, swvel
-from .library import cndr, salds, salrp, salrt, seck, sals, smow
-from .eos80 import (adtg, alpha, aonb, beta, dpth, g, salt, fp, svel,
-                    pres, dens0, dens, pden, cp, ptmp, temp)
+try:
+    import numpy
+except ImportError:  # Only `seawater.scalar` works without NumPy.
+    numpy = None
+
+if numpy is not None:
+    from .geostrophic import bfrq, svan, gpan, gvel, GpanAccumulator
+    from .extras import (dist, dist_matrix, f, gas_saturation, satAr, satN2,
+                         satO2, swvel)
+    from .library import (cndr, salds, salrp, salrt, seck, sals, smow,
+                          Workspace)
+    from .eos80 import (adtg, alpha, aonb, beta, dpth, g, salt, fp, svel,
+                        pres, dens0, dens, pden, cp, ptmp, state, temp)
+    from .cache import SeawaterState
+    from .ctd import process_cast, process_casts
+    from .ragged import Ragged
+    from .stations import StationIndex
+    from .backend import (get_backend, get_dtype_mode, set_backend,
+                          set_dtype_mode)
+    from . import masked, parallel, profiling, stream
+
+    if os.environ.get('SEAWATER_PROFILE', '0') not in ('', '0'):
+        profiling.enable()
+del numpy
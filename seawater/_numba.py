@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+#
+# _numba.py
+#
+# purpose:  Numba compiled kernels for the numba backend.
+#
+# obs:  Each function is written for a single element and compiled into a
+# parallel ufunc, so the whole chain of polynomials runs in one loop.  The
+# operations are carried in the same order as in the NumPy code.  Compiled
+# code is cached on disk.
+#
+
+from __future__ import division
+
+import math
+
+from numba import njit, vectorize
+
+from .library import a, b, c, d, e, k
+
+_a, _b, _c, _d, _e = map(tuple, (a, b, c, d, e))
+
+_jit = dict(cache=True)
+_ufunc = dict(target='parallel', cache=True)
+_sig2 = ['float64(float64, float64)']
+_sig3 = ['float64(float64, float64, float64)']
+_sig4 = ['float64(float64, float64, float64, float64)']
+
+
+@njit(**_jit)
+def _horner(x, coefs):
+    y = x * coefs[-1]
+    for i in range(len(coefs) - 2, 0, -1):
+        y = (y + coefs[i]) * x
+    return y + coefs[0]
+
+
+# library.
+@njit(**_jit)
+def _salds(rtx, delt):
+    ds = _horner(rtx, (_a[1], 2 * _a[2], 3 * _a[3], 4 * _a[4], 5 * _a[5]))
+    w = delt / (delt * k + 1)
+    w = w * _horner(rtx, (_b[1], 2 * _b[2], 3 * _b[3], 4 * _b[4], 5 * _b[5]))
+    return ds + w
+
+
+@njit(**_jit)
+def _sals(rt, T68):
+    del_T68 = T68 - 15
+    Rtx = math.sqrt(rt)
+    w = del_T68 / (del_T68 * k + 1)
+    del_S = w * _horner(Rtx, _b)
+    return _horner(Rtx, _a) + del_S
+
+
+@njit(**_jit)
+def _cndr(s, t, p):
+    T68 = t * 1.00024
+    # Newton-Raphson iteration for inverse interpolation of Rt from s.
+    Rx = math.sqrt(s / 35.0)
+    SInc = _sals(Rx * Rx, T68)
+    delt = t / 1.00024 - 15
+    for iloop in range(100):
+        Rx = Rx + (s - SInc) / _salds(Rx, delt)
+        SInc_loop = _sals(Rx * Rx, T68)
+        if not abs(SInc_loop - s) > 1.0e-10:
+            break
+        SInc = SInc_loop
+
+    # Eqn(4) p.8 UNESCO 1983.
+    A = T68 * _d[3] + _d[2]
+    B = (T68 * _d[0] + 1) + T68 * T68 * _d[1]
+    C = p * ((p * _e[1] + _e[0]) + p * p * _e[2])
+
+    # Eqn(6) p.9 UNESCO 1983.
+    Rt = Rx * Rx
+    rt = _horner(T68, _c)
+    D = B - A * rt * Rt
+    E = rt * Rt * A * (B + C)
+    r = math.sqrt(abs(D * D + 4 * E)) - D
+    return 0.5 * r / A
+
+
+@njit(**_jit)
+def _seck68(s, T68, p, s_sqrt):
+    h = (3.239908, 1.43713e-3, 1.16092e-4, -5.77905e-7)
+    k = (8.50935e-5, -6.12293e-6, 5.2787e-8)
+    e = (19652.21, 148.4206, -2.327105, 1.360477e-2, -5.155288e-5)
+    j0 = 1.91075e-4
+    i = (2.2838e-3, -1.0981e-5, -1.6078e-6)
+    m = (-9.9348e-7, 2.0816e-8, 9.1697e-10)
+    f = (54.6746, -0.603459, 1.09987e-2, -6.1670e-5)
+    g = (7.944e-2, 1.6483e-2, -5.3009e-4)
+
+    K0 = _horner(T68, e) + (_horner(T68, f) + _horner(T68, g) * s_sqrt) * s
+    A = _horner(T68, h) + (_horner(T68, i) + s_sqrt * j0) * s
+    B = _horner(T68, k) + _horner(T68, m) * s
+    return K0 + (A + B * p) * p
+
+
+@njit(**_jit)
+def _seck(s, t, p):
+    return _seck68(s, t * 1.00024, p / 10.0, math.sqrt(s))
+
+
+# eos80.
+@njit(**_jit)
+def _adtg68(s35, T68, p):
+    a = (3.5803e-5, 8.5258e-6, -6.836e-8, 6.6228e-10)
+    b = (1.8932e-6, -4.2393e-8)
+    c = (1.8741e-8, -6.7795e-10, 8.733e-12, -5.4481e-14)
+    d = (-1.1351e-10, 2.7759e-12)
+    e = (-4.6206e-13, 1.8676e-14, -2.1687e-16)
+    y = _horner(T68, a) + _horner(T68, b) * s35
+    y = y + (_horner(T68, c) + _horner(T68, d) * s35) * p
+    return y + _horner(T68, e) * p * p
+
+
+@njit(**_jit)
+def _adtg(s, t, p):
+    return _adtg68(s - 35, t * 1.00024, p)
+
+
+# Theta2 and Theta3 coefficients of the Runge-Kutta integration.
+_stages = ((1 - 1 / 2 ** 0.5, 2 - 2 ** 0.5, -2 + 3 / 2 ** 0.5),
+           (1 + 1 / 2 ** 0.5, 2 + 2 ** 0.5, -2 - 3 / 2 ** 0.5))
+
+
+@njit(**_jit)
+def _ptmp(s, t, p, pr):
+    del_P = pr - p
+    s35 = s - 35
+
+    # Theta1.
+    T68 = t * 1.00024
+    del_th = _adtg68(s35, T68, p) * del_P
+    th = del_th * 0.5 + T68
+    q = del_th
+
+    # Theta2 and Theta3.
+    p_mid = del_P * 0.5 + p
+    for a, b, c in _stages:
+        T68 = th / 1.00024 * 1.00024
+        del_th = _adtg68(s35, T68, p_mid) * del_P
+        th = th + (del_th - q) * a
+        q = q * c + del_th * b
+
+    # Theta4.
+    T68 = th / 1.00024 * 1.00024
+    del_th = _adtg68(s35, T68, p + del_P) * del_P
+    th = th + (del_th - q * 2) / 6
+    return th / 1.00024
+
+
+@njit(**_jit)
+def _dens068(s, T68, s_sqrt):
+    a = (999.842594, 6.793952e-2, -9.095290e-3, 1.001685e-4, -1.120083e-6,
+         6.536332e-9)
+    b = (8.24493e-1, -4.0899e-3, 7.6438e-5, -8.2467e-7, 5.3875e-9)
+    c = (-5.72466e-3, 1.0227e-4, -1.6546e-6)
+    d = 4.8314e-4
+    y = _horner(T68, a) + _horner(T68, b) * s
+    return y + _horner(T68, c) * s * s_sqrt + s * s * d
+
+
+@njit(**_jit)
+def _dens0(s, t):
+    return _dens068(s, t * 1.00024, math.sqrt(s))
+
+
+@njit(**_jit)
+def _dens(s, t, p):
+    T68, p, s_sqrt = t * 1.00024, p / 10., math.sqrt(s)
+    return _dens068(s, T68, s_sqrt) / (1 - p / _seck68(s, T68, p, s_sqrt))
+
+
+@njit(**_jit)
+def _svel(s, t, p):
+    p = p / 10
+    T68 = t * 1.00024
+
+    # Eqn 34 p.46.
+    c0 = (5.03711, -5.80852e-2, 3.3420e-4, -1.47800e-6, 3.1464e-9)
+    c1 = (0.153563, 6.8982e-4, -8.1788e-6, 1.3621e-7, -6.1185e-10)
+    c2 = (3.1260e-5, -1.7107e-6, 2.5974e-8, -2.5335e-10, 1.0405e-12)
+    c3 = (-9.7729e-9, 3.8504e-10, -2.3643e-12)
+    w = ((_horner(T68, c3) * p + _horner(T68, c2)) * p +
+         _horner(T68, c1)) * p
+    Cw = (w + _horner(T68, c0) * T68) + 1402.388
+
+    # Eqn. 35. p.47
+    a0 = (-1.262e-2, 7.164e-5, 2.006e-6, -3.21e-8)
+    a1 = (9.4742e-5, -1.2580e-5, -6.4885e-8, 1.0507e-8, -2.0122e-10)
+    a2 = (-3.9064e-7, 9.1041e-9, -1.6002e-10, 7.988e-12)
+    a3 = (1.100e-10, 6.649e-12, -3.389e-13)
+    w = ((_horner(T68, a3) * p + _horner(T68, a2)) * p +
+         _horner(T68, a1)) * p
+    A = (w + _horner(T68, a0) * T68) + 1.389
+
+    # Eqn 36 p.47.
+    B = (T68 * -4.42e-5 + -1.922e-2) + (T68 * 1.7945e-7 + 7.3637e-5) * p
+
+    # Eqn 37 p.47.
+    D = p * -7.9836e-6 + 1.727e-3
+
+    # Eqn 33 p.46.
+    return Cw + A * s + B * s * math.sqrt(s) + D * (s * s)
+
+
+@njit(**_jit)
+def _cp(s, t, p):
+    p = p / 10.
+    T68 = t * 1.00024
+    s_sqrt = math.sqrt(s)
+
+    # Eqn. 26 p.32.
+    a = (-7.64357, 0.1072763, -1.38385e-3)
+    b = (0.1770383, -4.07718e-3, 5.148e-5)
+    c = (4217.4, -3.720283, 0.1412855, -2.654387e-3, 2.093236e-5)
+    y = _horner(T68, c)
+    y = y + ((T68 * a[1] + a[0]) + T68 * T68 * a[2]) * s
+    y = y + ((T68 * b[1] + b[0]) + T68 * T68 * b[2]) * s * s_sqrt
+
+    # Eqn. 28 p.33.
+    a0t0 = (-4.9592e-1, 1.45747e-2, -3.13885e-4, 2.0357e-6, 1.7168e-8)
+    b0t0 = (2.4931e-4, -1.08645e-5, 2.87533e-7, -4.0027e-9, 2.2956e-11)
+    c0t0 = (-5.422e-8, 2.6380e-9, -6.5637e-11, 6.136e-13)
+    y = y + ((_horner(T68, c0t0) * p + _horner(T68, b0t0)) * p +
+             _horner(T68, a0t0)) * p
+
+    # Eqn 29 p.34.
+    d = (4.9247e-3, -1.28315e-4, 9.802e-7, 2.5941e-8, -2.9179e-10)
+    e = (-1.2331e-4, -1.517e-6, 3.122e-8)
+    f = (-2.9558e-6, 1.17054e-7, -2.3905e-9, 1.8448e-11)
+    g0 = 9.971e-8
+    h = (5.540e-10, -1.7682e-11, 3.513e-13)
+    j1 = -1.4300e-12
+
+    S3_2 = s * s_sqrt
+    w = (_horner(T68, d) * s + _horner(T68, e) * S3_2) * p
+    w = w + (_horner(T68, f) * s + S3_2 * g0) * (p * p)
+    w = w + (_horner(T68, h) * s + T68 * j1 * S3_2) * math.pow(p, 3.0)
+    return y + w
+
+
+adtg = vectorize(_sig3, **_ufunc)(_adtg)
+cndr = vectorize(_sig3, **_ufunc)(_cndr)
+cp = vectorize(_sig3, **_ufunc)(_cp)
+dens0 = vectorize(_sig2, **_ufunc)(_dens0)
+dens = vectorize(_sig3, **_ufunc)(_dens)
+ptmp = vectorize(_sig4, **_ufunc)(_ptmp)
+seck = vectorize(_sig3, **_ufunc)(_seck)
+svel = vectorize(_sig3, **_ufunc)(_svel)
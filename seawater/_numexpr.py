@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# _numexpr.py
+#
+# purpose:  numexpr expressions for the numexpr backend.
+#
+# obs:  Each function is a single expression.  numexpr evaluates it in
+# blocks that fit in the cache, on all the threads set with
+# `numexpr.set_num_threads`, so no full size temporary array is created.
+# The polynomials are written in the same order as in the NumPy code.
+#
+
+from __future__ import division
+
+import numexpr as ne
+
+
+def _horner(x, coefs):
+    """coefs[0] + (coefs[1] + (... + coefs[-1] * x) * x) * x as a string."""
+    y = '%s * %r' % (x, coefs[-1])
+    for coef in coefs[-2:0:-1]:
+        y = '(%s + %r) * %s' % (y, coef, x)
+    return '(%s + %r)' % (y, coefs[0])
+
+
+T68 = '(t * 1.00024)'
+P = '(p / 10.)'
+S_SQRT = 'sqrt(s)'
+
+
+def _dens0_expr():
+    a = (999.842594, 6.793952e-2, -9.095290e-3, 1.001685e-4, -1.120083e-6,
+         6.536332e-9)
+    b = (8.24493e-1, -4.0899e-3, 7.6438e-5, -8.2467e-7, 5.3875e-9)
+    c = (-5.72466e-3, 1.0227e-4, -1.6546e-6)
+    d = 4.8314e-4
+    return '(%s + %s * s + %s * s * %s + s * s * %r)' % (
+        _horner(T68, a), _horner(T68, b), _horner(T68, c), S_SQRT, d)
+
+
+def _seck_expr():
+    h = (3.239908, 1.43713e-3, 1.16092e-4, -5.77905e-7)
+    k = (8.50935e-5, -6.12293e-6, 5.2787e-8)
+    e = (19652.21, 148.4206, -2.327105, 1.360477e-2, -5.155288e-5)
+    j0 = 1.91075e-4
+    i = (2.2838e-3, -1.0981e-5, -1.6078e-6)
+    m = (-9.9348e-7, 2.0816e-8, 9.1697e-10)
+    f = (54.6746, -0.603459, 1.09987e-2, -6.1670e-5)
+    g = (7.944e-2, 1.6483e-2, -5.3009e-4)
+    K0 = '(%s + (%s + %s * %s) * s)' % (_horner(T68, e), _horner(T68, f),
+                                         _horner(T68, g), S_SQRT)
+    A = '(%s + (%s + %s * %r) * s)' % (_horner(T68, h), _horner(T68, i),
+                                        S_SQRT, j0)
+    B = '(%s + %s * s)' % (_horner(T68, k), _horner(T68, m))
+    return '(%s + (%s + %s * %s) * %s)' % (K0, A, B, P, P)
+
+
+def _svel_expr():
+    # Eqn 34 p.46.
+    c0 = (5.03711, -5.80852e-2, 3.3420e-4, -1.47800e-6, 3.1464e-9)
+    c1 = (0.153563, 6.8982e-4, -8.1788e-6, 1.3621e-7, -6.1185e-10)
+    c2 = (3.1260e-5, -1.7107e-6, 2.5974e-8, -2.5335e-10, 1.0405e-12)
+    c3 = (-9.7729e-9, 3.8504e-10, -2.3643e-12)
+    Cw = '((((%s * %s + %s) * %s + %s) * %s + %s * %s) + 1402.388)' % (
+        _horner(T68, c3), P, _horner(T68, c2), P, _horner(T68, c1), P,
+        _horner(T68, c0), T68)
+
+    # Eqn. 35. p.47
+    a0 = (-1.262e-2, 7.164e-5, 2.006e-6, -3.21e-8)
+    a1 = (9.4742e-5, -1.2580e-5, -6.4885e-8, 1.0507e-8, -2.0122e-10)
+    a2 = (-3.9064e-7, 9.1041e-9, -1.6002e-10, 7.988e-12)
+    a3 = (1.100e-10, 6.649e-12, -3.389e-13)
+    A = '((((%s * %s + %s) * %s + %s) * %s + %s * %s) + 1.389)' % (
+        _horner(T68, a3), P, _horner(T68, a2), P, _horner(T68, a1), P,
+        _horner(T68, a0), T68)
+
+    # Eqn 36 p.47.
+    B = '((%s * -4.42e-5 + -1.922e-2) + (%s * 1.7945e-7 + 7.3637e-5) * %s)' % (
+        T68, T68, P)
+
+    # Eqn 37 p.47.
+    D = '(%s * -7.9836e-6 + 1.727e-3)' % P
+
+    # Eqn 33 p.46.
+    return '%s + %s * s + %s * s * %s + %s * (s * s)' % (Cw, A, B, S_SQRT, D)
+
+
+def _cp_expr():
+    # Eqn. 26 p.32.
+    a = (-7.64357, 0.1072763, -1.38385e-3)
+    b = (0.1770383, -4.07718e-3, 5.148e-5)
+    c = (4217.4, -3.720283, 0.1412855, -2.654387e-3, 2.093236e-5)
+    y = '(%s + ((%s * %r + %r) + %s * %s * %r) * s' % (
+        _horner(T68, c), T68, a[1], a[0], T68, T68, a[2])
+    y = '%s + ((%s * %r + %r) + %s * %s * %r) * s * %s)' % (
+        y, T68, b[1], b[0], T68, T68, b[2], S_SQRT)
+
+    # Eqn. 28 p.33.
+    a = (-4.9592e-1, 1.45747e-2, -3.13885e-4, 2.0357e-6, 1.7168e-8)
+    b = (2.4931e-4, -1.08645e-5, 2.87533e-7, -4.0027e-9, 2.2956e-11)
+    c = (-5.422e-8, 2.6380e-9, -6.5637e-11, 6.136e-13)
+    y = '(%s + ((%s * %s + %s) * %s + %s) * %s)' % (
+        y, _horner(T68, c), P, _horner(T68, b), P, _horner(T68, a), P)
+
+    # Eqn 29 p.34.
+    d = (4.9247e-3, -1.28315e-4, 9.802e-7, 2.5941e-8, -2.9179e-10)
+    e = (-1.2331e-4, -1.517e-6, 3.122e-8)
+    f = (-2.9558e-6, 1.17054e-7, -2.3905e-9, 1.8448e-11)
+    g0 = 9.971e-8
+    h = (5.540e-10, -1.7682e-11, 3.513e-13)
+    j1 = -1.4300e-12
+    S3_2 = '(s * %s)' % S_SQRT
+    w = '(%s * s + %s * %s) * %s' % (_horner(T68, d), _horner(T68, e), S3_2,
+                                     P)
+    w = '(%s + (%s * s + %s * %r) * (%s * %s))' % (w, _horner(T68, f), S3_2,
+                                                   g0, P, P)
+    w = '(%s + (%s * s + %s * %r * %s) * (%s * %s * %s))' % (
+        w, _horner(T68, h), T68, j1, S3_2, P, P, P)
+    return '%s + %s' % (y, w)
+
+
+_exprs = dict(cp=_cp_expr(),
+              dens0=_dens0_expr(),
+              dens='%s / (1 - %s / %s)' % (_dens0_expr(), P, _seck_expr()),
+              seck=_seck_expr(),
+              svel=_svel_expr())
+
+
+def _evaluate(name, **arrays):
+    out = arrays.pop('out')
+    return ne.evaluate(_exprs[name], local_dict=arrays, out=out)
+
+
+def cp(s, t, p, out=None):
+    return _evaluate('cp', s=s, t=t, p=p, out=out)
+
+
+def dens0(s, t, out=None):
+    return _evaluate('dens0', s=s, t=t, out=out)
+
+
+def dens(s, t, p, out=None):
+    return _evaluate('dens', s=s, t=t, p=p, out=out)
+
+
+def seck(s, t, p, out=None):
+    return _evaluate('seck', s=s, t=t, p=p, out=out)
+
+
+def svel(s, t, p, out=None):
+    return _evaluate('svel', s=s, t=t, p=p, out=out)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# backend.py
+#
+# purpose:  Selects the implementation of the hot kernels.
+#
+# obs:
+#
+
+from __future__ import division
+
+import warnings
+
+import numpy as np
+
+__all__ = ['get_backend',
+           'get_dtype_mode',
+           'set_backend',
+           'set_dtype_mode']
+
+
+_backends = ('numpy', 'numba', 'numexpr')
+_dtype_modes = ('promote', 'preserve')
+_current = dict(name='numpy', module=None, dtype_mode='promote')
+
+
+def set_backend(name):
+    """Selects the implementation of `adtg`, `ptmp`, `temp`, `seck`,
+    `dens0`, `dens`, `svel`, `cp` and `cndr`.
+
+    Parameters
+    ----------
+    name : string
+           'numpy' (default), 'numba' or 'numexpr'.  The numba backend
+           compiles each of these functions into a single parallel loop over
+           the elements, instead of one NumPy pass per operation, and caches
+           the compiled code on disk.  The numexpr backend evaluates `seck`,
+           `dens0`, `dens`, `svel` and `cp` as single expressions, in cache
+           sized blocks on `numexpr.set_num_threads` threads, without full
+           size temporary arrays; the other functions stay on NumPy.
+           Functions built on top of them, like `pden`, `svan` or `alpha`,
+           use the backend too.
+
+    Returns
+    -------
+    name : string
+           the backend in use.  That is 'numpy' when Numba (or numexpr) is
+           not installed, a warning is issued in that case.
+
+    Notes
+    -----
+    The compiled kernels are only used for plain ndarrays with a float64
+    result, e.g.: masked arrays and float32 inputs always go through NumPy.
+    Results agree with the NumPy backend to round-off.
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> sw.set_backend('numba')  # doctest: +SKIP
+    'numba'
+    >>> sw.set_backend('numpy')
+    'numpy'
+    """
+    if name not in _backends:
+        raise NameError("Unrecognized backend %r.  Try 'numpy', 'numba' or "
+                        "'numexpr'" % name)
+
+    module = None
+    try:
+        if name == 'numba':
+            from . import _numba as module
+        elif name == 'numexpr':
+            from . import _numexpr as module
+    except ImportError as err:
+        warnings.warn("%s backend is not available (%s), using NumPy." %
+                      (name, err))
+        name = 'numpy'
+
+    _current.update(name=name, module=module)
+    return name
+
+
+def get_backend():
+    """Name of the backend in use, see `set_backend`."""
+    return _current['name']
+
+
+def _kernel(name, args):
+    """Compiled kernel for the function `name` when the backend has one and
+    `args` are plain ndarrays with a float64 result, None otherwise."""
+    module = _current['module']
+    if module is None:
+        return None
+    if [arg for arg in args if type(arg) is not np.ndarray]:
+        return None
+    if _result_type(args) != np.float64:
+        return None
+    return getattr(module, name, None)
+
+
+def set_dtype_mode(mode):
+    """Selects the floating point precision of the results.
+
+    Parameters
+    ----------
+    mode : string
+           'promote' (default) follows the NumPy casting rules, where
+           scalars, integer arguments and the float64 coefficients may turn
+           float32 inputs into float64 results, depending on the NumPy
+           version.  'preserve' computes float32 inputs in float32 and
+           returns float32: the results take the precision of the floating
+           point array arguments, scalars and integer arrays do not promote
+           them, and the polynomial coefficients are cast to that precision
+           once per evaluation.
+
+    Returns
+    -------
+    mode : string
+           the mode in use.
+
+    Notes
+    -----
+    Float32 halves the memory traffic and the size of the work arrays, and
+    about halves the run times, but keeps about 7 significant digits.  The
+    maximum absolute errors against the float64 results over the
+    oceanographic range (s 30 to 40, t -2 to 30 and p 0 to 6000), relative
+    to the largest result, are 1e-7 to 6e-7 for most functions, e.g.:
+    `dens`, `ptmp`, `svel`, `cp`, `salt` and `cndr`.  Functions that take
+    small differences lose more: 2e-6 for `pres`, 3e-5 for `satO2`,
+    `satN2` and `satAr`, 4e-5 for `svan`, 1.5e-4 for `gpan` and 8e-4 for
+    `bfrq`, see benchmarks/bench_float32.py.  Float64 and integer inputs
+    are not affected by the mode.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> s, t = np.float32([35., 35.]), np.float32([10., 20.])
+    >>> sw.set_dtype_mode('preserve')
+    'preserve'
+    >>> sw.ptmp(s, t, np.float32([0., 1000.])).dtype
+    dtype('float32')
+    >>> sw.set_dtype_mode('promote')
+    'promote'
+    """
+    if mode not in _dtype_modes:
+        raise NameError("Unrecognized dtype mode %r.  Try 'promote' or "
+                        "'preserve'" % mode)
+    _current['dtype_mode'] = mode
+    return mode
+
+
+def get_dtype_mode():
+    """Name of the dtype mode in use, see `set_dtype_mode`."""
+    return _current['dtype_mode']
+
+
+def _preserve():
+    return _current['dtype_mode'] == 'preserve'
+
+
+def _result_type(args):
+    """Floating point dtype of the results for `args`.  In the 'preserve'
+    mode only the floating point arrays count, with 0-d arrays only when
+    there are no others, so float32 arrays give float32."""
+    if _current['dtype_mode'] == 'preserve':
+        floats = [arg for arg in args if arg.dtype.kind in 'fc']
+        arrays = [arg for arg in floats if arg.ndim]
+        return np.result_type(1.0, *(arrays or floats))
+    return np.result_type(1.0, *args)
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+#
+# cache.py
+#
+# purpose:  Lazily computed and cached sea water properties.
+#
+# obs:
+#
+
+from __future__ import division
+
+from collections import OrderedDict
+
+import numpy as np
+
+from .extras import f, satAr, satN2, satO2
+from .library import T68conv, atleast_2d, cndr, _seck
+from .eos80 import _dens, _dens0, adtg, aonb, beta, cp, dpth, fp, g, ptmp, svel
+from .geostrophic import bfrq, _gpan
+
+__all__ = ['SeawaterState']
+
+
+def _nbytes(value):
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return getattr(value, 'nbytes', 0)
+
+
+def _cached(func):
+    """Turns `func` into a read-only property whose value is computed on
+    first access and then kept in the instance cache."""
+    name = func.__name__
+
+    def getter(self):
+        try:
+            value = self._cache.pop(name)
+        except KeyError:
+            value = func(self)
+            self._nbytes += _nbytes(value)
+        self._cache[name] = value  # Most recently used go to the end.
+        self._evict()
+        return value
+    return property(getter, doc=func.__doc__)
+
+
+class SeawaterState(object):
+    """Sea water properties computed on demand from a single (s, t, p)
+    sample.
+
+    Every property is computed on first access and cached.  Derived
+    properties reuse the cached ones, e.g.: `alpha` reuses `aonb`, `beta`
+    and `ptmp0` while `svan` reuses `dens`.  When `max_bytes` is set the
+    least recently used arrays are dropped from the cache once their total
+    size goes above it, they are recomputed if accessed again.
+
+    Parameters
+    ----------
+    s(p) : array_like
+           salinity [psu (PSS-78)]
+    t(p) : array_like
+           temperature [:math:`^\circ` C (ITS-90)]
+    p : array_like
+        pressure [db].
+    lat : number or array_like, optional
+          latitude in decimal degrees north [-90..+90].  Needed by `depth`,
+          `grav` and `f` and used by `n2` and `q`.
+    max_bytes : int, optional
+                upper bound for the cache size [bytes], default unbounded.
+
+    Attributes
+    ----------
+    T68, ptmp0, adtg, aonb, beta, alpha, cp, svel, fp, cndr, dens0, seck, dens,
+    sigma, pden0, sigma_theta, svan, gpan, n2, q, p_ave, depth, grav, f, satAr,
+    satN2 and satO2.  See the functions with the same name for the units.
+    The `0` suffix means relative to the sea surface.
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> from seawater.cache import SeawaterState
+    >>> s = [[0, 1, 2], [15, 16, 17], [30, 31, 32], [35, 35, 35]]
+    >>> t = [[15]*3]*4
+    >>> p = [[0], [250], [500], [1000]]
+    >>> state = SeawaterState(s, t, p, lat=[30, 32, 35])
+    >>> state.sigma_theta[-1]
+    array([ 26.00594044,  26.00594044,  26.00594044])
+    >>> state.gpan[-1]
+    array([ 104.95799186,   99.38799979,   93.82834339])
+    >>> state.clear()
+    """
+
+    def __init__(self, s, t, p, lat=None, max_bytes=None):
+        self.s, self.t, self.p = map(np.asanyarray, (s, t, p))
+        self.lat = None if lat is None else np.asanyarray(lat)
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._nbytes = 0
+
+    @property
+    def nbytes(self):
+        """Total size of the cached arrays [bytes]."""
+        return self._nbytes
+
+    def cached(self):
+        """Names of the properties currently in the cache."""
+        return list(self._cache.keys())
+
+    def clear(self):
+        """Drop all the cached properties."""
+        self._cache.clear()
+        self._nbytes = 0
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        # Never drop the property that was just accessed.
+        while self._nbytes > self.max_bytes and len(self._cache) > 1:
+            name, value = self._cache.popitem(last=False)
+            self._nbytes -= _nbytes(value)
+
+    def _need_lat(self, name):
+        if self.lat is None:
+            raise ValueError("%s needs the latitude." % name)
+
+    # Shared intermediate terms.
+    @_cached
+    def T68(self):
+        """Temperature [:math:`^\circ` C (IPTS-68)]."""
+        return T68conv(self.t)
+
+    @_cached
+    def _s_sqrt(self):
+        return self.s ** 0.5
+
+    @_cached
+    def _p_bar(self):
+        return self.p / 10.
+
+    @_cached
+    def ptmp0(self):
+        """Potential temperature relative to the sea surface."""
+        return ptmp(self.s, self.t, self.p, 0)
+
+    # eos80.
+    @_cached
+    def adtg(self):
+        """Adiabatic temperature gradient."""
+        return adtg(self.s, self.t, self.p)
+
+    @_cached
+    def aonb(self):
+        """Thermal expansion to saline contraction ratio."""
+        return aonb(self.s, self.ptmp0, self.p, pt=True)
+
+    @_cached
+    def beta(self):
+        """Saline contraction coefficient."""
+        return beta(self.s, self.ptmp0, self.p, pt=True)
+
+    @_cached
+    def alpha(self):
+        """Thermal expansion coefficient."""
+        return self.aonb * self.beta
+
+    @_cached
+    def cp(self):
+        """Heat capacity."""
+        return cp(self.s, self.t, self.p)
+
+    @_cached
+    def svel(self):
+        """Sound velocity."""
+        return svel(self.s, self.t, self.p)
+
+    @_cached
+    def fp(self):
+        """Freezing point."""
+        return fp(self.s, self.p)
+
+    @_cached
+    def cndr(self):
+        """Conductivity ratio."""
+        return cndr(self.s, self.t, self.p)
+
+    @_cached
+    def dens0(self):
+        """Density at atmospheric pressure."""
+        return _dens0(self.s, self.T68, self._s_sqrt)
+
+    @_cached
+    def seck(self):
+        """Secant bulk modulus."""
+        return _seck(self.s, self.T68, self._p_bar, self._s_sqrt)
+
+    @_cached
+    def dens(self):
+        """In situ density."""
+        return self.dens0 / (1 - self._p_bar / self.seck)
+
+    @_cached
+    def sigma(self):
+        """In situ density - 1000."""
+        return self.dens - 1000
+
+    @_cached
+    def pden0(self):
+        """Potential density relative to the sea surface."""
+        pr = np.asanyarray(0)
+        return _dens(self.s, T68conv(self.ptmp0), pr / 10., self._s_sqrt)
+
+    @_cached
+    def sigma_theta(self):
+        """Potential density relative to the sea surface - 1000."""
+        return self.pden0 - 1000
+
+    # geostrophic.
+    @_cached
+    def _dens_ref(self):
+        s_ref = np.asanyarray(35)
+        return _dens(s_ref, T68conv(0), self._p_bar, s_ref ** 0.5)
+
+    @_cached
+    def svan(self):
+        """Specific volume anomaly."""
+        return 1 / self.dens - 1 / self._dens_ref
+
+    @_cached
+    def gpan(self):
+        """Geopotential anomaly relative to the sea surface."""
+        svn, p = np.broadcast_arrays(self.svan, self.p)
+        return _gpan(*map(atleast_2d, (svn, p)))
+
+    @_cached
+    def _bfrq(self):
+        return bfrq(self.s, self.t, self.p, self.lat)
+
+    @property
+    def n2(self):
+        """Brünt-Väisälä Frequency squared at the mid pressures."""
+        return self._bfrq[0]
+
+    @property
+    def q(self):
+        """Planetary potential vorticity at the mid pressures."""
+        return self._bfrq[1]
+
+    @property
+    def p_ave(self):
+        """Mid pressure between the pressure levels."""
+        return self._bfrq[2]
+
+    # extras.
+    @_cached
+    def depth(self):
+        """Depth [m]."""
+        self._need_lat('depth')
+        return dpth(self.p, self.lat)
+
+    @_cached
+    def grav(self):
+        """Acceleration due to gravity at `depth`."""
+        return g(self.lat, -self.depth)
+
+    @_cached
+    def f(self):
+        """Coriolis factor."""
+        self._need_lat('f')
+        return f(self.lat)
+
+    @_cached
+    def satAr(self):
+        """Solubility of Ar."""
+        return satAr(self.s, self.t)
+
+    @_cached
+    def satN2(self):
+        """Solubility of N2."""
+        return satN2(self.s, self.t)
+
+    @_cached
+    def satO2(self):
+        """Solubility of O2."""
+        return satO2(self.s, self.t)
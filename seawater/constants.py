@@ -14,7 +14,7 @@
 
 """Constants."""
 
-from numpy import pi
+from math import pi
 
 # dbar to pascal.
 db2Pascal = 1e4
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# ctd.py
+#
+# purpose:  CTD cast conversion from raw C/T/P to the derived products.
+#
+# obs:
+#
+
+from __future__ import division
+
+import numpy as np
+
+from .backend import _kernel
+from .constants import c3515
+from .library import T68conv, Workspace, _asarray, _finish, _out, _salrp
+from .library import _salrt, _sals, _sqrt, _work, atleast_2d
+from .eos80 import _dens0, _svel, dpth, g, ptmp, svel
+from .geostrophic import _bfrq
+
+__all__ = ['process_cast',
+           'process_casts']
+
+
+_names = ('s', 'pt', 'sigma_theta', 'svel', 'depth', 'n2', 'p_ave')
+
+
+def _result(y, out):
+    """Squeezes the result like `gpan`, or copies it into `out`."""
+    if out is None:
+        return np.squeeze(y)
+    return _finish(y if y is out else y.reshape(out.shape), out)
+
+
+def process_cast(c, t, p, lat, ratio=False, out=None, ws=None):
+    """Converts a CTD cast from conductivity, temperature and pressure to
+    salinity, potential temperature, sigma-theta, sound speed, depth and
+    N :sup:`2` in a single pass.
+
+    The temperature in IPTS-68, the square root of the salinity, the
+    pressure in bars and the depth are computed only once and shared by all
+    the products.  Results are identical to the ones from `salt`, `ptmp`,
+    `pden`, `svel`, `dpth` and `bfrq`.
+
+    Parameters
+    ----------
+    c(p) : array_like
+           conductivity [mS cm :sup:`-1`], or the conductivity ratio
+           :math:`R = \frac{C(S,T,P)}{C(35,15(IPTS-68),0)}` if `ratio` is
+           True.
+    t(p) : array_like
+           temperature [:math:`^\circ` C (ITS-90)]
+    p : array_like
+        pressure [db].
+    lat : number or array_like
+          latitude in decimal degrees north [-90..+90].
+    ratio : bool, optional
+            True if `c` is already the conductivity ratio, default is
+            False.
+    out : tuple of ndarray, optional
+          arrays in which to place s, pt, sigma_theta, svel, depth, n2 and
+          p_ave.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
+
+    Returns
+    -------
+    s : array_like
+        salinity [psu (PSS-78)]
+    pt : array_like
+         potential temperature relative to the sea surface
+         [:math:`^\circ` C (ITS-90)]
+    sigma_theta : array_like
+                  potential density relative to the sea surface - 1000
+                  [kg m :sup:`3`]
+    svel : array_like
+           sound velocity  [m/s]
+    depth : array_like
+            depth [m]
+    n2 : array_like
+         Brünt-Väisälä Frequency squared (M-1xN)  [rad s :sup:`-2`]
+    p_ave : array_like
+            mid pressure between P grid (M-1xN) [db]
+
+    Like `gpan` the results are squeezed, pressure is the first dimension.
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> from seawater.library import T90conv
+    >>> r = [1, 1.2, 0.65]
+    >>> t = T90conv([15, 20, 5])
+    >>> p = [0, 2000, 1500]
+    >>> s, pt, sigma_theta, c, z, n2, p_ave = sw.process_cast(r, t, p, 30,
+    ...                                                       ratio=True)
+    >>> s
+    array([ 34.99999992,  37.24562765,  27.99534693])
+    """
+
+    c, t, p, lat = map(_asarray, (c, t, p, lat))
+    c, t, p = np.broadcast_arrays(c, t, p)
+    c, t, p = map(atleast_2d, (c, t, p))
+    # Latitude can be per station.
+    c, t, p = np.broadcast_arrays(c, t, p, lat)[:3]
+
+    args = (c, t, p)
+    args_mid = tuple(arg[1:, ...] for arg in args)
+    outs = (None,) * len(_names) if out is None else out
+    res = [_out(o, args, ws, 'process_cast.' + name) for o, name in
+           zip(outs[:5], _names[:5])]
+    res.append(_out(outs[5], args_mid, ws, 'process_cast.n2'))
+    res.append(_out(outs[6], args_mid[2:], ws, 'process_cast.p_ave'))
+    b_s, b_pt, b_sigma, b_svel, b_depth, b_n2, b_p_ave = res
+    b_r, b_T68, b_rt, b_s_sqrt, b_p, b_grav, b1, b2, b3, b4 = _work(
+        10, args, ws, 'process_cast')
+    b_up, b_lo, b5, b6 = _work(4, args_mid, ws, 'process_cast.mid')
+
+    r = c if ratio else np.divide(c, c3515, out=b_r)
+
+    # Salinity, same as `salt`.
+    T68 = T68conv(t, out=b_T68)
+    rt = _salrt(T68, b_rt)
+    rp = _salrp(r, T68, p, (b1, b2, b3))
+    rt = np.divide(r, np.multiply(rp, rt, out=b_rt), out=b_rt)
+    s = _sals(rt, T68, (b_s, b4, b1, b2))
+
+    s_sqrt = _sqrt(s, out=b_s_sqrt)
+    if _kernel('svel', (s, t, p)) is None:
+        p_bar = np.divide(p, 10, out=b_p)  # Convert db to bars.
+        sound = _svel(s, T68, p_bar, s_sqrt, (b_svel, b1, b2))
+    else:
+        sound = svel(s, t, p, out=b_svel, ws=ws)
+    del T68
+
+    # Sigma-theta.  At zero pressure `dens` is exactly `dens0`.
+    pt = ptmp(s, t, p, 0, out=b_pt, ws=ws)
+    T68 = T68conv(pt, out=b_T68)
+    sigma_theta = np.subtract(_dens0(s, T68, s_sqrt, (b_sigma, b1)), 1000,
+                              out=b_sigma)
+
+    # N2, the depth is shared with `bfrq`.
+    z = dpth(p, lat, out=b_depth, ws=ws)
+    grav = g(lat, np.negative(z, out=b_grav), out=b_grav, ws=ws)
+    n2, _, p_ave = _bfrq(s, t, p, z, grav, None,
+                         (b_n2, None, b_p_ave, b_up, b_lo, b5, b6), ws)
+
+    return tuple(_result(y, o) for y, o in
+                 zip((s, pt, sigma_theta, sound, z, n2, p_ave), outs))
+
+
+def process_casts(casts, ratio=False, ws=None):
+    """Same as `process_cast` for an iterable of (c, t, p, lat) casts.
+
+    Yields the results for each cast in turn.  The casts can have different
+    lengths.  A single Workspace is reused while they keep the same shape
+    and cleared when it changes, so it never holds more than the work
+    arrays of one cast.
+
+    Parameters
+    ----------
+    casts : iterable of tuples
+            conductivity (or conductivity ratio), temperature, pressure and
+            latitude of each cast.
+    ratio : bool, optional
+            True if the conductivities are conductivity ratios, default is
+            False.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
+
+    Returns
+    -------
+    results : iterator of tuples
+              s, pt, sigma_theta, svel, depth, n2 and p_ave of each cast.
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> casts = [([30., 40., 42.], [20., 10., 4.], [0, 500, 1000], -30),
+    ...          ([35., 38.], [15., 12.], [0, 200], -31)]
+    >>> [len(res[0]) for res in sw.process_casts(casts)]
+    [3, 2]
+    """
+
+    ws = Workspace() if ws is None else ws
+    shape = None
+    for c, t, p, lat in casts:
+        if np.broadcast(c, t, p).shape != shape:
+            ws.clear()
+            shape = np.broadcast(c, t, p).shape
+        yield process_cast(c, t, p, lat, ratio=ratio, ws=ws)
@@ -17,8 +17,11 @@ from __future__ import division
 
 import numpy as np
 
+from .backend import _kernel, _preserve
 from .constants import deg2rad, earth_radius
-from .library import T90conv, T68conv, salrt, salrp, sals, seck, smow
+from .library import T90conv, T68conv
+from .library import _asarray, _duck, _finish, _horner, _out, _salrp
+from .library import _salrt, _sals, _seck, _smow, _sqrt, _square, _work
 
 
 __all__ = ['adtg',
@@ -36,10 +39,11 @@ __all__ = ['adtg',
            'pden',
            'cp',
            'ptmp',
+           'state',
            'temp']
 
 
-def adtg(s, t, p):
+def adtg(s, t, p, out=None, ws=None):
     """Calculates adiabatic temperature gradient as per UNESCO 1983 routines.
 
     Parameters
@@ -50,6 +54,10 @@ def adtg(s, t, p):
            temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -99,23 +107,41 @@ def adtg(s, t, p):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p = map(np.asanyarray, (s, t, p))
+    s, t, p = map(_asarray, (s, t, p))
 
-    T68 = T68conv(t)
+    kernel = _kernel('adtg', (s, t, p))
+    if kernel is not None:
+        y = kernel(s, t, p, out=_out(out, (s, t, p), ws, 'adtg'))
+        return _finish(y, out)
+
+    b_adtg = _out(out, (s, t, p), ws, 'adtg')
+    b_s35, b_T68, w1, w2 = _work(4, (s, t, p), ws, 'adtg')
+    T68 = T68conv(t, out=b_T68)
+    s35 = np.subtract(s, 35, out=b_s35)
+    return _finish(_adtg(s35, T68, p, b_adtg, w1, w2), out)
+
+
+def _adtg(s35, T68, p, out=None, w1=None, w2=None):
+    """Adiabatic temperature gradient kernel.  Takes s - 35 and temperature
+    in IPTS-68 and writes into `out` using `w1` and `w2` as work arrays."""
 
     a = [3.5803e-5, 8.5258e-6, -6.836e-8, 6.6228e-10]
     b = [1.8932e-6, -4.2393e-8]
     c = [1.8741e-8, -6.7795e-10, 8.733e-12, -5.4481e-14]
     d = [-1.1351e-10, 2.7759e-12]
     e = [-4.6206e-13, 1.8676e-14, -2.1687e-16]
-    return (a[0] + (a[1] + (a[2] + a[3] * T68) * T68) * T68 +
-            (b[0] + b[1] * T68) * (s - 35) +
-            ((c[0] + (c[1] + (c[2] + c[3] * T68) * T68) * T68) +
-             (d[0] + d[1] * T68) * (s - 35)) * p +
-            (e[0] + (e[1] + e[2] * T68) * T68) * p * p)
-
-
-def alpha(s, t, p, pt=False):
+    # a + b * (s - 35) + (c + d * (s - 35)) * p + e * p * p
+    y = _horner(T68, a, out)
+    w = np.multiply(_horner(T68, b, w1), s35, out=w1)
+    y = np.add(y, w, out=out)
+    w = np.multiply(_horner(T68, d, w2), s35, out=w2)
+    w = np.add(_horner(T68, c, w1), w, out=w1)
+    y = np.add(y, np.multiply(w, p, out=w1), out=out)
+    w = np.multiply(_horner(T68, e, w1), p, out=w1)
+    return np.add(y, np.multiply(w, p, out=w1), out=out)
+
+
+def alpha(s, t, p, pt=False, out=None, ws=None):
     """Calculate the thermal expansion coefficient.
 
     Parameters
@@ -128,6 +154,10 @@ def alpha(s, t, p, pt=False):
         pressure [db].
     pt : bool
          True if temperature is potential, default is False
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -154,11 +184,18 @@ def alpha(s, t, p, pt=False):
                    99-06-25. Lindsay Pender, Fixed transpose of row vectors.
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
-    s, t, p, pt = map(np.asanyarray, (s, t, p, pt))
-    return aonb(s, t, p, pt) * beta(s, t, p, pt)
+    s, t, p, pt = map(_asarray, (s, t, p, pt))
+
+    b_alpha = _out(out, (s, t, p), ws, 'alpha')
+    b_pt, b_beta = _work(2, (s, t, p), ws, 'alpha')
+    if not pt:
+        t = ptmp(s, t, p, 0, out=b_pt, ws=ws)  # Now we have ptmp.
+    a = aonb(s, t, p, True, out=b_alpha, ws=ws)
+    b = beta(s, t, p, True, out=b_beta, ws=ws)
+    return _finish(np.multiply(a, b, out=b_alpha), out)
 
 
-def aonb(s, t, p, pt=False):
+def aonb(s, t, p, pt=False, out=None, ws=None):
     """Calculate :math:`\alpha/\beta`.
 
     Parameters
@@ -171,6 +208,10 @@ def aonb(s, t, p, pt=False):
         pressure [db].
     pt : bool
          True if temperature is potential, default is False
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -199,13 +240,17 @@ def aonb(s, t, p, pt=False):
     """
 
     # Ensure we use ptmp in calculations.
-    s, t, p, pt = map(np.asanyarray, (s, t, p, pt))
+    s, t, p, pt = map(_asarray, (s, t, p, pt))
+    p_in = p
+    if not _duck(p) and not (_preserve() and p.dtype.kind == 'f'):
+        p = np.asanyarray(p, dtype=np.float64)
 
+    b_aonb = _out(out, (s, t, p), ws, 'aonb')
+    b_pt, b_T68, b_sm35, b1, b2 = _work(5, (s, t, p), ws, 'aonb')
     if not pt:
-        t = ptmp(s, t, p, 0)  # Now we have ptmp.
+        t = ptmp(s, t, p_in, 0, out=b_pt, ws=ws)  # Now we have ptmp.
 
-    p = np.float_(p)
-    t = T68conv(t)
+    t = T68conv(t, out=b_T68)
 
     c1 = np.array([-0.255019e-7, 0.298357e-5, -0.203814e-3,
                    0.170907e-1, 0.665157e-1])
@@ -217,14 +262,24 @@ def aonb(s, t, p, pt=False):
     c6 = -0.302285e-13
 
     # Now calculate the thermal expansion saline contraction ratio aonb.
-    sm35 = s - 35.0
-    return (np.polyval(c1, t) + sm35 *
-            (np.polyval(c2, t) + np.polyval(c2a, p)) +
-            sm35 ** 2 * c3 + p * np.polyval(c4, t) +
-            c5 * (p ** 2) * (t ** 2) + c6 * p ** 3)
-
-
-def beta(s, t, p, pt=False):
+    # c1(t) + sm35 * (c2(t) + c2a(p)) + sm35**2 * c3 + p * c4(t) +
+    # c5 * p**2 * t**2 + c6 * p**3
+    sm35 = np.subtract(s, 35.0, out=b_sm35)
+    w = np.add(_horner(t, c2[::-1], b1), _horner(p, c2a[::-1], b2), out=b1)
+    w = np.multiply(sm35, w, out=b1)
+    y = np.add(_horner(t, c1[::-1], b_aonb), w, out=b_aonb)
+    w = np.multiply(_square(sm35, out=b1), c3, out=b1)
+    y = np.add(y, w, out=b_aonb)
+    w = np.multiply(p, _horner(t, c4[::-1], b1), out=b1)
+    y = np.add(y, w, out=b_aonb)
+    w = np.multiply(_square(p, out=b1), c5, out=b1)
+    w = np.multiply(w, _square(t, out=b2), out=b1)
+    y = np.add(y, w, out=b_aonb)
+    w = np.multiply(np.power(p, 3, out=b1), c6, out=b1)
+    return _finish(np.add(y, w, out=b_aonb), out)
+
+
+def beta(s, t, p, pt=False, out=None, ws=None):
     """Calculate the saline contraction coefficient :math:`\beta` as defined
     by T.J. McDougall.
 
@@ -238,6 +293,10 @@ def beta(s, t, p, pt=False):
         pressure [db].
     pt : bool
          True if temperature is potential, default is False
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -265,13 +324,15 @@ def beta(s, t, p, pt=False):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p, pt = map(np.asanyarray, (s, t, p, pt))
+    s, t, p, pt = map(_asarray, (s, t, p, pt))
 
+    b_beta = _out(out, (s, t, p), ws, 'beta')
+    b_pt, b_T68, b_sm35, b1, b2 = _work(5, (s, t, p), ws, 'beta')
     # Ensure we use ptmp in calculations
     if not pt:
-        t = ptmp(s, t, p, 0)  # Now we have ptmp.
+        t = ptmp(s, t, p, 0, out=b_pt, ws=ws)  # Now we have ptmp.
 
-    t = T68conv(t)
+    t = T68conv(t, out=b_T68)
 
     c1 = np.array([-0.415613e-9, 0.555579e-7, -0.301985e-5, 0.785567e-3])
     c2 = np.array([0.788212e-8, -0.356603e-6])
@@ -282,14 +343,24 @@ def beta(s, t, p, pt=False):
     c7 = 0.121551e-17
 
     # Now calculate the thermal expansion saline contraction ratio adb
-    sm35 = s - 35
-    return (np.polyval(c1, t) + sm35 *
-            (np.polyval(c2, t) + np.polyval(c3, p)) +
-            c4 * (sm35 ** 2) + p * np.polyval(c5, t) +
-            (p ** 2) * np.polyval(c6, t) + c7 * (p ** 3))
-
-
-def cp(s, t, p):
+    # c1(t) + sm35 * (c2(t) + c3(p)) + c4 * sm35**2 + p * c5(t) +
+    # p**2 * c6(t) + c7 * p**3
+    sm35 = np.subtract(s, 35, out=b_sm35)
+    w = np.add(_horner(t, c2[::-1], b1), _horner(p, c3[::-1], b2), out=b1)
+    w = np.multiply(sm35, w, out=b1)
+    y = np.add(_horner(t, c1[::-1], b_beta), w, out=b_beta)
+    w = np.multiply(_square(sm35, out=b1), c4, out=b1)
+    y = np.add(y, w, out=b_beta)
+    w = np.multiply(p, _horner(t, c5[::-1], b1), out=b1)
+    y = np.add(y, w, out=b_beta)
+    w = np.multiply(_square(p, out=b1), _horner(t, c6[::-1], b2),
+                    out=b1)
+    y = np.add(y, w, out=b_beta)
+    w = np.multiply(np.power(p, 3, out=b1), c7, out=b1)
+    return _finish(np.add(y, w, out=b_beta), out)
+
+
+def cp(s, t, p, out=None, ws=None):
     """Heat Capacity of Sea Water using UNESCO 1983 polynomial.
 
     Parameters
@@ -300,6 +371,10 @@ def cp(s, t, p):
            temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db].
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -345,29 +420,48 @@ def cp(s, t, p):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p = map(np.asanyarray, (s, t, p))
+    s, t, p = map(_asarray, (s, t, p))
+
+    kernel = _kernel('cp', (s, t, p))
+    if kernel is not None:
+        y = kernel(s, t, p, out=_out(out, (s, t, p), ws, 'cp'))
+        return _finish(y, out)
 
-    p = p / 10.  # To convert [db] to [bar] as used in UNESCO routines.
-    T68 = T68conv(t)
+    b_cp = _out(out, (s, t, p), ws, 'cp')
+    b_p, b_T68, b_S3_2, b1, b2, b3 = _work(6, (s, t, p), ws, 'cp')
+    # To convert [db] to [bar] as used in UNESCO routines.
+    p = np.divide(p, 10., out=b_p)
+    T68 = T68conv(t, out=b_T68)
 
     # Eqn. 26 p.32.
     a = (-7.64357, 0.1072763, -1.38385e-3)
     b = (0.1770383, -4.07718e-3, 5.148e-5)
     c = (4217.4, -3.720283, 0.1412855, -2.654387e-3, 2.093236e-5)
 
-    Cpst0 = ((((c[4] * T68 + c[3]) * T68 + c[2]) * T68 + c[1]) * T68 + c[0] +
-             (a[0] + a[1] * T68 + a[2] * T68 ** 2) * s +
-             (b[0] + b[1] * T68 + b[2] * T68 ** 2) * s * s ** 0.5)
+    # Cpst0 = c + (a0 + a1 * T68 + a2 * T68**2) * s +
+    #         (b0 + b1 * T68 + b2 * T68**2) * s * s**0.5
+    s_sqrt = _sqrt(s, out=b_S3_2)
+    y = _horner(T68, c, b_cp)
+    w = np.add(np.multiply(T68, a[1], out=b1), a[0], out=b1)
+    w = np.add(w, np.multiply(_square(T68, out=b2), a[2], out=b2),
+               out=b1)
+    y = np.add(y, np.multiply(w, s, out=b1), out=b_cp)
+    w = np.add(np.multiply(T68, b[1], out=b1), b[0], out=b1)
+    w = np.add(w, np.multiply(_square(T68, out=b2), b[2], out=b2),
+               out=b1)
+    w = np.multiply(np.multiply(w, s, out=b1), s_sqrt, out=b1)
+    y = np.add(y, w, out=b_cp)
 
     # Eqn. 28 p.33.
     a = (-4.9592e-1, 1.45747e-2, -3.13885e-4, 2.0357e-6, 1.7168e-8)
     b = (2.4931e-4, -1.08645e-5, 2.87533e-7, -4.0027e-9, 2.2956e-11)
     c = (-5.422e-8, 2.6380e-9, -6.5637e-11, 6.136e-13)
 
-    del_Cp0t0 = ((((((c[3] * T68 + c[2]) * T68 + c[1]) * T68 + c[0]) * p +
-                   ((((b[4] * T68 + b[3]) * T68 + b[2]) * T68 + b[1]) *
-                    T68 + b[0])) * p + ((((a[4] * T68 + a[3]) * T68 + a[2]) *
-                                         T68 + a[1]) * T68 + a[0])) * p)
+    # del_Cp0t0 = ((c * p + b) * p + a) * p
+    w = np.multiply(_horner(T68, c, b1), p, out=b1)
+    w = np.multiply(np.add(w, _horner(T68, b, b2), out=b1), p, out=b1)
+    w = np.multiply(np.add(w, _horner(T68, a, b2), out=b1), p, out=b1)
+    y = np.add(y, w, out=b_cp)
 
     # Eqn 29 p.34.
     d = (4.9247e-3, -1.28315e-4, 9.802e-7, 2.5941e-8, -2.9179e-10)
@@ -377,19 +471,26 @@ def cp(s, t, p):
     h = (5.540e-10, -1.7682e-11, 3.513e-13)
     j1 = -1.4300e-12
 
-    S3_2 = s * s ** 0.5
+    S3_2 = np.multiply(s, s_sqrt, out=b_S3_2)
 
-    del_Cpstp = ((((((d[4] * T68 + d[3]) * T68 + d[2]) * T68 + d[1]) *
-                   T68 + d[0]) * s + ((e[2] * T68 + e[1]) * T68 + e[0]) *
-                  S3_2) * p +
-                 ((((f[3] * T68 + f[2]) * T68 + f[1]) * T68 + f[0]) * s +
-                  g0 * S3_2) * p ** 2 + (((h[2] * T68 + h[1]) * T68 + h[0]) *
-                                         s + j1 * T68 * S3_2) * p ** 3)
+    # del_Cpstp = (d * s + e * S3_2) * p + (f * s + g0 * S3_2) * p**2 +
+    #             (h * s + j1 * T68 * S3_2) * p**3
+    w = np.multiply(_horner(T68, d, b1), s, out=b1)
+    v = np.multiply(_horner(T68, e, b2), S3_2, out=b2)
+    w = np.multiply(np.add(w, v, out=b1), p, out=b1)
+    v = np.multiply(_horner(T68, f, b2), s, out=b2)
+    v = np.add(v, np.multiply(S3_2, g0, out=b3), out=b2)
+    v = np.multiply(v, _square(p, out=b3), out=b2)
+    w = np.add(w, v, out=b1)
+    v = np.multiply(_horner(T68, h, b2), s, out=b2)
+    u = np.multiply(np.multiply(T68, j1, out=b3), S3_2, out=b3)
+    v = np.multiply(np.add(v, u, out=b2), np.power(p, 3, out=b3), out=b2)
+    w = np.add(w, v, out=b1)
 
-    return Cpst0 + del_Cp0t0 + del_Cpstp
+    return _finish(np.add(y, w, out=b_cp), out)
 
 
-def dens0(s, t):
+def dens0(s, t, out=None, ws=None):
     """Density of Sea Water at atmospheric pressure.
 
     Parameters
@@ -398,6 +499,10 @@ def dens0(s, t):
              salinity [psu (PSS-78)]
     t(p=0) : array_like
              temperature [:math:`^\circ` C (ITS-90)]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -430,20 +535,40 @@ def dens0(s, t):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t = map(np.asanyarray, (s, t))
+    s, t = map(_asarray, (s, t))
+
+    kernel = _kernel('dens0', (s, t))
+    if kernel is not None:
+        y = kernel(s, t, out=_out(out, (s, t), ws, 'dens0'))
+        return _finish(y, out)
+
+    b_dens0 = _out(out, (s, t), ws, 'dens0')
+    b_T68, b_s_sqrt, b1 = _work(3, (s, t), ws, 'dens0')
+    T68 = T68conv(t, out=b_T68)
+    s_sqrt = _sqrt(s, out=b_s_sqrt)
+    return _finish(_dens0(s, T68, s_sqrt, (b_dens0, b1)), out)
+
 
-    T68 = T68conv(t)
+def _dens0(s, T68, s_sqrt, work=(None,) * 2):
+    """Density at atmospheric pressure kernel for temperature in IPTS-68.
+    Writes into the 2 `work` arrays, the first one holds the result."""
 
+    b_dens0, b1 = work
     # UNESCO 1983 Eqn.(13) p17.
     b = (8.24493e-1, -4.0899e-3, 7.6438e-5, -8.2467e-7, 5.3875e-9)
     c = (-5.72466e-3, 1.0227e-4, -1.6546e-6)
     d = 4.8314e-4
-    return (smow(t) + (b[0] + (b[1] + (b[2] + (b[3] + b[4] * T68) * T68) *
-            T68) * T68) * s + (c[0] + (c[1] + c[2] * T68) * T68) * s *
-            s ** 0.5 + d * s ** 2)
+    # smow + b * s + c * s * s**0.5 + d * s**2
+    y = _smow(T68, b_dens0)
+    y = np.add(y, np.multiply(_horner(T68, b, b1), s, out=b1), out=b_dens0)
+    w = np.multiply(np.multiply(_horner(T68, c, b1), s, out=b1), s_sqrt,
+                    out=b1)
+    y = np.add(y, w, out=b_dens0)
+    w = np.multiply(_square(s, out=b1), d, out=b1)
+    return np.add(y, w, out=b_dens0)
 
 
-def dens(s, t, p):
+def dens(s, t, p, out=None, ws=None):
     """Density of Sea Water using UNESCO 1983 (EOS 80) polynomial.
 
     Parameters
@@ -454,6 +579,10 @@ def dens(s, t, p):
            temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db].
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -487,16 +616,34 @@ def dens(s, t, p):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p = map(np.asanyarray, (s, t, p))
+    s, t, p = map(_asarray, (s, t, p))
 
+    kernel = _kernel('dens', (s, t, p))
+    if kernel is not None:
+        y = kernel(s, t, p, out=_out(out, (s, t, p), ws, 'dens'))
+        return _finish(y, out)
+
+    b_dens = _out(out, (s, t, p), ws, 'dens')
+    b_p, b_T68, b_s_sqrt, b1, b2, b3, b4 = _work(7, (s, t, p), ws, 'dens')
+    p = np.divide(p, 10., out=b_p)  # Convert from db to atm pressure units.
+    T68 = T68conv(t, out=b_T68)
+    s_sqrt = _sqrt(s, out=b_s_sqrt)
+    return _finish(_dens(s, T68, p, s_sqrt, (b_dens, b1, b2, b3, b4)), out)
+
+
+def _dens(s, T68, p, s_sqrt, work=(None,) * 5):
+    """Density kernel for temperature in IPTS-68 and pressure in bars.
+    Writes into the 5 `work` arrays, the first one holds the result."""
+
+    b_dens, b_K, b1, b2, b3 = work
     # UNESCO 1983. Eqn..7  p.15.
-    densP0 = dens0(s, t)
-    K = seck(s, t, p)
-    p = p / 10.  # Convert from db to atm pressure units.
-    return densP0 / (1 - p / K)
+    densP0 = _dens0(s, T68, s_sqrt, (b_dens, b1))
+    K = _seck(s, T68, p, s_sqrt, (b_K, b1, b2, b3))
+    w = np.subtract(1, np.divide(p, K, out=b_K), out=b_K)
+    return np.divide(densP0, w, out=b_dens)
 
 
-def dpth(p, lat):
+def dpth(p, lat, out=None, ws=None):
     """Calculates depth in meters from pressure in dbars.
 
     Parameters
@@ -505,6 +652,10 @@ def dpth(p, lat):
         pressure [db].
     lat : number or array_like
           latitude in decimal degrees north [-90..+90].
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -538,23 +689,28 @@ def dpth(p, lat):
     Modifications: 92-04-06. Phil Morgan.
                    99-06-25. Lindsay Pender, Fixed transpose of row vectors.
     """
-    p, lat = map(np.asanyarray, (p, lat))
+    p, lat = map(_asarray, (p, lat))
 
     # Eqn 25, p26.  UNESCO 1983.
     c = [9.72659, -2.2512e-5, 2.279e-10, -1.82e-15]
     gam_dash = 2.184e-6
 
-    lat = abs(lat)
-    X = np.sin(lat * deg2rad)
-    X = X * X
+    b_depth = _out(out, (p, lat), ws, 'dpth')
+    b_X, b1 = _work(2, (p, lat), ws, 'dpth')
+    lat = np.absolute(lat, out=b_X)
+    X = np.sin(np.multiply(lat, deg2rad, out=b_X), out=b_X)
+    X = np.multiply(X, X, out=b_X)
 
-    bot_line = (9.780318 * (1.0 + (5.2788e-3 + 2.36e-5 * X) * X) +
-                gam_dash * 0.5 * p)
-    top_line = (((c[3] * p + c[2]) * p + c[1]) * p + c[0]) * p
-    return top_line / bot_line
+    # 9.780318 * (1.0 + (5.2788e-3 + 2.36e-5 * X) * X) + gam_dash * 0.5 * p
+    w = np.add(np.multiply(X, 2.36e-5, out=b1), 5.2788e-3, out=b1)
+    w = np.add(np.multiply(w, X, out=b1), 1.0, out=b1)
+    w = np.multiply(w, 9.780318, out=b1)
+    bot_line = np.add(w, np.multiply(p, gam_dash * 0.5, out=b_X), out=b1)
+    top_line = np.multiply(_horner(p, c, b_X), p, out=b_X)
+    return _finish(np.divide(top_line, bot_line, out=b_depth), out)
 
 
-def fp(s, p):
+def fp(s, p, out=None, ws=None):
     """Freezing point of Sea Water using UNESCO 1983 polynomial.
 
     Parameters
@@ -563,6 +719,10 @@ def fp(s, p):
         salinity [psu (PSS-78)]
     p : array_like
         pressure [db]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -595,16 +755,25 @@ def fp(s, p):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, p = map(np.asanyarray, (s, p))
+    s, p = map(_asarray, (s, p))
 
     # NOTE: P = P/10 # to convert db to Bar as used in UNESCO routines.
     # Eqn  p.29.
     a = [-0.0575, 1.710523e-3, -2.154996e-4]
     b = -7.53e-4
-    return T90conv(a[0] * s + a[1] * s * s ** 0.5 + a[2] * s ** 2 + b * p)
-
-
-def g(lat, z=0):
+    # a0 * s + a1 * s * s**0.5 + a2 * s**2 + b * p
+    b_fp = _out(out, (s, p), ws, 'fp')
+    b1, b2 = _work(2, (s, p), ws, 'fp')
+    y = np.multiply(s, a[0], out=b_fp)
+    w = np.multiply(np.multiply(s, a[1], out=b1), _sqrt(s, out=b2), out=b1)
+    y = np.add(y, w, out=b_fp)
+    w = np.multiply(_square(s, out=b1), a[2], out=b1)
+    y = np.add(y, w, out=b_fp)
+    y = np.add(y, np.multiply(p, b, out=b1), out=b_fp)
+    return _finish(T90conv(y, out=b_fp), out)
+
+
+def g(lat, z=0, out=None, ws=None):
     """Calculates acceleration due to gravity as function of latitude.
 
     Parameters
@@ -614,6 +783,10 @@ def g(lat, z=0):
 
     z : number or array_like. Default z = 0
         height in meters (+ve above sea surface, -ve below).
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -639,17 +812,26 @@ def g(lat, z=0):
     Modifications: 93-04-20. Phil Morgan.
     """
 
-    lat, z = map(np.asanyarray, (lat, z))
+    lat, z = map(_asarray, (lat, z))
 
     # Eqn p27.  UNESCO 1983.
-    lat = np.abs(lat)
-    X = np.sin(lat * deg2rad)
-    sin2 = X * X
-    grav = 9.780318 * (1.0 + (5.2788e-3 + 2.36e-5 * sin2) * sin2)
-    return grav / ((1 + z / earth_radius) ** 2)  # From A.E.Gill p.597.
-
-
-def pden(s, t, p, pr=0):
+    b_grav = _out(out, (lat, z), ws, 'g')
+    b1, = _work(1, (lat, z), ws, 'g')
+    lat = np.abs(lat, out=b1)
+    X = np.sin(np.multiply(lat, deg2rad, out=b1), out=b1)
+    sin2 = np.multiply(X, X, out=b1)
+    # 9.780318 * (1.0 + (5.2788e-3 + 2.36e-5 * sin2) * sin2)
+    grav = np.add(np.multiply(sin2, 2.36e-5, out=b_grav), 5.2788e-3,
+                  out=b_grav)
+    grav = np.add(np.multiply(grav, sin2, out=b_grav), 1.0, out=b_grav)
+    grav = np.multiply(grav, 9.780318, out=b_grav)
+    # From A.E.Gill p.597.
+    w = np.add(np.divide(z, earth_radius, out=b1), 1, out=b1)
+    return _finish(np.divide(grav, _square(w, out=b1), out=b_grav),
+                   out)
+
+
+def pden(s, t, p, pr=0, out=None, ws=None):
     """Calculates potential density of water mass relative to the specified
     reference pressure by pden = dens(S, ptmp, PR).
 
@@ -663,6 +845,10 @@ def pden(s, t, p, pr=0):
         pressure [db].
     pr : number
          reference pressure [db], default = 0
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -695,13 +881,14 @@ def pden(s, t, p, pr=0):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p, pr = map(np.asanyarray, (s, t, p, pr))
+    s, t, p, pr = map(_asarray, (s, t, p, pr))
 
-    pt = ptmp(s, t, p, pr)
-    return dens(s, pt, pr)
+    b_pt, = _work(1, (s, t, p, pr), ws, 'pden')
+    pt = ptmp(s, t, p, pr, out=b_pt, ws=ws)
+    return dens(s, pt, pr, out=out, ws=ws)
 
 
-def pres(depth, lat):
+def pres(depth, lat, out=None, ws=None):
     """Calculates pressure in dbars from depth in meters.
 
     Parameters
@@ -710,6 +897,10 @@ def pres(depth, lat):
             depth [meters]
     lat : array_like
           latitude in decimal degrees north [-90..+90]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -732,14 +923,23 @@ def pres(depth, lat):
     Modifications: 93-06-25. Phil Morgan.
                    99-06-25. Lindsay Pender, Fixed transpose of row vectors.
     """
-    depth, lat = map(np.asanyarray, (depth, lat))
-
-    X = np.sin(np.abs(lat * deg2rad))
-    C1 = 5.92e-3 + X ** 2 * 5.25e-3
-    return ((1 - C1) - (((1 - C1) ** 2) - (8.84e-6 * depth)) ** 0.5) / 4.42e-6
-
-
-def ptmp(s, t, p, pr=0):
+    depth, lat = map(_asarray, (depth, lat))
+
+    b_pres = _out(out, (depth, lat), ws, 'pres')
+    b_C1, b1 = _work(2, (depth, lat), ws, 'pres')
+    X = np.multiply(lat, deg2rad, out=b_C1)
+    X = np.sin(np.abs(X, out=b_C1), out=b_C1)
+    C1 = np.multiply(_square(X, out=b_C1), 5.25e-3, out=b_C1)
+    C1 = np.add(C1, 5.92e-3, out=b_C1)
+    # ((1 - C1) - ((1 - C1)**2 - 8.84e-6 * depth)**0.5) / 4.42e-6
+    C1 = np.subtract(1, C1, out=b_C1)
+    w = np.multiply(depth, 8.84e-6, out=b_pres)
+    w = _sqrt(np.subtract(_square(C1, out=b1), w, out=b1), out=b1)
+    y = np.subtract(C1, w, out=b_pres)
+    return _finish(np.divide(y, 4.42e-6, out=b_pres), out)
+
+
+def ptmp(s, t, p, pr=0, out=None, ws=None):
     """Calculates potential temperature as per UNESCO 1983 report.
 
     Parameters
@@ -752,6 +952,11 @@ def ptmp(s, t, p, pr=0):
         pressure [db].
     pr : array_like
         reference pressure [db], default = 0
+    out : ndarray, optional
+          array in which to place the result.  Must have the broadcast shape
+          of the inputs.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -800,30 +1005,71 @@ def ptmp(s, t, p, pr=0):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p, pr = map(np.asanyarray, (s, t, p, pr))
+    s, t, p, pr = map(_asarray, (s, t, p, pr))
+
+    kernel = _kernel('ptmp', (s, t, p, pr))
+    if kernel is not None:
+        y = kernel(s, t, p, pr, out=_out(out, (s, t, p, pr), ws, 'ptmp'))
+        return _finish(y, out)
+
+    # Integrates straight into `out` when it is safe to do so.
+    b_th = _out(out, (s, t, p, pr), ws, 'ptmp')
+    work = _work(8, (s, t, p, pr), ws, 'ptmp')
+    return _finish(_ptmp(s, t, p, pr, [b_th] + work), out)
 
-    # Theta1.
-    del_P = pr - p
-    del_th = del_P * adtg(s, t, p)
-    th = T68conv(t) + 0.5 * del_th
-    q = del_th
 
-    # Theta2.
-    del_th = del_P * adtg(s, T90conv(th), p + 0.5 * del_P)
-    th = th + (1 - 1 / 2 ** 0.5) * (del_th - q)
-    q = (2 - 2 ** 0.5) * del_th + (-2 + 3 / 2 ** 0.5) * q
+def _ptmp(s, t, p, pr, work=(None,) * 9, first=None):
+    """Potential temperature kernel.  The Runge-Kutta integration is carried
+    in IPTS-68 and all the stages write into the same 9 `work` arrays.  The
+    first one holds the result.  The first stage does not depend on `pr`,
+    callers integrating the same levels to several reference pressures can
+    pass s - 35, the temperature in IPTS-68 and `_adtg` at (s, t, p) as
+    `first`."""
 
-    # Theta3.
-    del_th = del_P * adtg(s, T90conv(th), p + 0.5 * del_P)
-    th = th + (1 + 1 / 2 ** 0.5) * (del_th - q)
-    q = (2 + 2 ** 0.5) * del_th + (-2 - 3 / 2 ** 0.5) * q
+    b_th, b_q, b_del_th, b_T68, b_p, b_del_P, b_s35, b1, b2 = work
+    del_P = np.subtract(pr, p, out=b_del_P)
+
+    # Theta1.
+    if first is None:
+        s35 = np.subtract(s, 35, out=b_s35)
+        T68 = np.multiply(t, 1.00024, out=b_T68)  # T68conv.
+        adtg0 = _adtg(s35, T68, p, b_del_th, b1, b2)
+    else:
+        s35, T68, adtg0 = first
+    del_th = np.multiply(adtg0, del_P, out=b_del_th)
+    th = np.add(np.multiply(del_th, 0.5, out=b_th), T68, out=b_th)
+    if b_q is None:
+        q = del_th
+    else:
+        q = b_q
+        q[...] = del_th
+
+    # Theta2 and Theta3.
+    p_mid = np.add(np.multiply(del_P, 0.5, out=b_p), p, out=b_p)
+    for a, b, c in ((1 - 1 / 2 ** 0.5, 2 - 2 ** 0.5, -2 + 3 / 2 ** 0.5),
+                    (1 + 1 / 2 ** 0.5, 2 + 2 ** 0.5, -2 - 3 / 2 ** 0.5)):
+        # Round trip through ITS-90, like T68conv(T90conv(th)), to keep the
+        # exact same numbers as the original algorithm.
+        T68 = np.multiply(np.divide(th, 1.00024, out=b_T68), 1.00024,
+                          out=b_T68)
+        del_th = np.multiply(_adtg(s35, T68, p_mid, b_del_th, b1, b2), del_P,
+                             out=b_del_th)
+        w = np.multiply(np.subtract(del_th, q, out=b1), a, out=b1)
+        th = np.add(th, w, out=b_th)
+        q = np.add(np.multiply(q, c, out=b_q),
+                   np.multiply(del_th, b, out=b1), out=b_q)
 
     # Theta4.
-    del_th = del_P * adtg(s, T90conv(th), p + del_P)
-    return T90conv(th + (del_th - 2 * q) / 6)
+    p_end = np.add(p, del_P, out=b_p)
+    T68 = np.multiply(np.divide(th, 1.00024, out=b_T68), 1.00024, out=b_T68)
+    del_th = np.multiply(_adtg(s35, T68, p_end, b_del_th, b1, b2), del_P,
+                         out=b_del_th)
+    w = np.subtract(del_th, np.multiply(q, 2, out=b1), out=b1)
+    th = np.add(th, np.divide(w, 6, out=b1), out=b_th)
+    return np.divide(th, 1.00024, out=b_th)  # T90conv.
 
 
-def salt(r, t, p):
+def salt(r, t, p, out=None, ws=None):
     """Calculates Salinity from conductivity ratio. UNESCO 1983 polynomial.
 
     Parameters
@@ -834,6 +1080,10 @@ def salt(r, t, p):
         temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -860,15 +1110,136 @@ def salt(r, t, p):
     Modifications: 93-04-17. Phil Morgan.
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
-    r, t, p = map(np.asanyarray, (r, t, p))
+    r, t, p = map(_asarray, (r, t, p))
+
+    b_s = _out(out, (r, t, p), ws, 'salt')
+    b_T68, b_rt, b1, b2, b3 = _work(5, (r, t, p), ws, 'salt')
+    T68 = T68conv(t, out=b_T68)
+    rt = _salrt(T68, b_rt)
+    rp = _salrp(r, T68, p, (b1, b2, b3))
+    rt = np.divide(r, np.multiply(rp, rt, out=b_rt), out=b_rt)
+    return _finish(_sals(rt, T68, (b_s, b_T68, b1, b2)), out)
+
 
-    rt = salrt(t)
-    rp = salrp(r, t, p)
-    rt = r / (rp * rt)
-    return sals(rt, t)
 
+def state(s, t, p, outputs=('dens', 'svan', 'pden'), pr=0, out=None,
+          ws=None):
+    """Evaluates several EOS 80 properties of sea water in a single pass.
+
+    The temperature conversion, the square root of the salinity, the
+    pressure conversion and the secant bulk modulus are computed only once
+    and shared by all the requested outputs.  Results are identical to the
+    ones from the individual functions.
+
+    Parameters
+    ----------
+    s(p) : array_like
+           salinity [psu (PSS-78)]
+    t(p) : array_like
+           temperature [:math:`^\circ` C (ITS-90)]
+    p : array_like
+        pressure [db].
+    outputs : string or sequence of strings, optional
+              any of 'dens0', 'seck', 'dens', 'sigma', 'svan' and 'pden'.
+              Default is ('dens', 'svan', 'pden').
+    pr : array_like
+         reference pressure [db] used by 'pden', default = 0
+    out : tuple of ndarray, optional
+          arrays in which to place the results, one per requested output.
+          A single array when `outputs` is a string.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
-def svel(s, t, p):
+    Returns
+    -------
+    results : tuple of array_like
+              one array per requested output and in the same order.  A
+              single array is returned when `outputs` is a string.
+
+              dens0 : density at atmospheric pressure [kg m :sup:`3`]
+              seck : secant bulk modulus [bars]
+              dens : density [kg m :sup:`3`]
+              sigma : density - 1000 [kg m :sup:`3`]
+              svan : specific volume anomaly [m :sup:`3` kg :sup:`-1`]
+              pden : potential density relative to `pr` [kg m :sup:`3`]
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> s = [0, 0, 35, 35]
+    >>> t = sw.T90conv([0, 30, 0, 30])
+    >>> p = [10000, 10000, 10000, 10000]
+    >>> dens, svan = sw.state(s, t, p, outputs=('dens', 'svan'))
+    >>> dens
+    array([ 1045.33710972,  1036.03148891,  1070.95838408,  1060.55058771])
+    >>> 1e8 * svan
+    array([ 2288.60985503,  3147.85290485,     0.        ,   916.33611313])
+    """
+
+    if isinstance(outputs, str):
+        out = None if out is None else (out,)
+        return state(s, t, p, outputs=(outputs,), pr=pr, out=out, ws=ws)[0]
+
+    for name in outputs:
+        if name not in ('dens0', 'seck', 'dens', 'sigma', 'svan', 'pden'):
+            raise NameError("Unrecognized output %r.  Try 'dens0', 'seck', "
+                            "'dens', 'sigma', 'svan' or 'pden'" % name)
+
+    s, t, p, pr = map(_asarray, (s, t, p, pr))
+
+    # Results go into `out` or new arrays, the intermediate terms that were
+    # not requested into work arrays.
+    outs = dict(zip(outputs, (None,) * len(outputs) if out is None else out))
+    res = dict()
+    for name in outputs:
+        args = {'dens0': (s, t), 'pden': (s, t, p, pr)}.get(name, (s, t, p))
+        res[name] = _out(outs[name], args, ws, 'state.' + name)
+    b_T68, b_s_sqrt, b_dens0, b_st = _work(4, (s, t), ws, 'state.dens0')
+    b_seck, b_dens, b1, b2, b3 = _work(5, (s, t, p), ws, 'state.seck')
+
+    s_sqrt = _sqrt(s, out=b_s_sqrt)
+    need_dens = [name for name in outputs if name in ('dens', 'sigma', 'svan')]
+    if need_dens or 'dens0' in outputs or 'seck' in outputs:
+        T68 = T68conv(t, out=b_T68)
+        b_p, = _work(1, (p,), ws, 'state.p')
+        # Convert from db to atm pressure units.
+        p_bar = np.divide(p, 10., out=b_p)
+        if need_dens or 'dens0' in outputs:
+            res['dens0'] = _dens0(s, T68, s_sqrt,
+                                  (res.get('dens0', b_dens0), b_st))
+        if need_dens or 'seck' in outputs:
+            res['seck'] = _seck(s, T68, p_bar, s_sqrt,
+                                (res.get('seck', b_seck), b1, b2, b3))
+        del T68
+
+    if need_dens:
+        w = np.subtract(1, np.divide(p_bar, res['seck'], out=b1), out=b1)
+        res['dens'] = np.divide(res['dens0'], w, out=res.get('dens', b_dens))
+    if 'sigma' in outputs:
+        res['sigma'] = np.subtract(res['dens'], 1000, out=res['sigma'])
+    if 'svan' in outputs:
+        # Reference is dens(35, 0, p), same as in `svan`.
+        work = _work(5, (p,), ws, 'state.svan')
+        s_ref, T68_ref = np.asanyarray(35.), T68conv(0.)
+        dens_ref = _dens(s_ref, T68_ref, p_bar, s_ref ** 0.5, work)
+        w = np.divide(1, dens_ref, out=work[0])
+        svan = np.divide(1, res['dens'], out=res['svan'])
+        res['svan'] = np.subtract(svan, w, out=res['svan'])
+        del dens_ref, w
+
+    if 'pden' in outputs:
+        b_pt, b_K, b1, b2, b3 = _work(5, (s, t, p, pr), ws, 'state.pden')
+        b_pr, = _work(1, (pr,), ws, 'state.pr')
+        T68 = T68conv(ptmp(s, t, p, pr, out=b_pt, ws=ws), out=b_pt)
+        pr = np.divide(pr, 10., out=b_pr)
+        res['pden'] = _dens(s, T68, pr, s_sqrt,
+                            (res['pden'], b_K, b1, b2, b3))
+        del T68
+
+    return tuple(_finish(res[name], outs[name]) for name in outputs)
+
+
+def svel(s, t, p, out=None, ws=None):
     """Sound Velocity in sea water using UNESCO 1983 polynomial.
 
     Parameters
@@ -879,6 +1250,10 @@ def svel(s, t, p):
            temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db].
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -924,11 +1299,29 @@ def svel(s, t, p):
                    99-06-25. Lindsay Pender, Fixed transpose of row vectors.
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
-    s, t, p = map(np.asanyarray, (s, t, p))
+    s, t, p = map(_asarray, (s, t, p))
+
+    kernel = _kernel('svel', (s, t, p))
+    if kernel is not None:
+        y = kernel(s, t, p, out=_out(out, (s, t, p), ws, 'svel'))
+        return _finish(y, out)
+
+    b_svel = _out(out, (s, t, p), ws, 'svel')
+    b_p, b_T68, b1, b2 = _work(4, (s, t, p), ws, 'svel')
 
     # UNESCO 1983. Eqn..33  p.46.
-    p = p / 10  # Convert db to bars as used in UNESCO routines.
-    T68 = T68conv(t)
+    p = np.divide(p, 10, out=b_p)  # Convert db to bars as used in UNESCO.
+    T68 = T68conv(t, out=b_T68)
+    return _finish(_svel(s, T68, p, None, (b_svel, b1, b2)), out)
+
+
+def _svel(s, T68, p, s_sqrt=None, work=(None,) * 3):
+    """Sound velocity kernel for temperature in IPTS-68 and pressure in
+    bars.  The square root of the salinity is computed when `s_sqrt` is not
+    given.  Writes into the 3 `work` arrays, the first one holds the
+    result."""
+
+    b_svel, b1, b2 = work
 
     # Eqn 34 p.46.
     c00, c01, c02, c03, c04, c05 = (1402.388, 5.03711, -5.80852e-2, 3.3420e-4,
@@ -939,11 +1332,16 @@ def svel(s, t, p):
                                1.0405e-12)
     c30, c31, c32 = (-9.7729e-9, 3.8504e-10, -2.3643e-12)
 
-    Cw = (((((c32 * T68 + c31) * T68 + c30) * p +
-            ((((c24 * T68 + c23) * T68 + c22) * T68 + c21) * T68 + c20)) * p +
-           ((((c14 * T68 + c13) * T68 + c12) * T68 + c11) * T68 + c10)) *
-          p + ((((c05 * T68 + c04) * T68 + c03) * T68 + c02) * T68 + c01) *
-          T68 + c00)
+    # Cw = ((c3 * p + c2) * p + c1) * p + c0, with the constant term of
+    # c0 added last.
+    w = np.multiply(_horner(T68, (c30, c31, c32), b1), p, out=b1)
+    w = np.add(w, _horner(T68, (c20, c21, c22, c23, c24), b2), out=b1)
+    w = np.multiply(w, p, out=b1)
+    w = np.add(w, _horner(T68, (c10, c11, c12, c13, c14), b2), out=b1)
+    w = np.multiply(w, p, out=b1)
+    v = np.multiply(_horner(T68, (c01, c02, c03, c04, c05), b2), T68,
+                    out=b2)
+    Cw = np.add(np.add(w, v, out=b_svel), c00, out=b_svel)
 
     # Eqn. 35. p.47
     a00, a01, a02, a03, a04 = (1.389, -1.262e-2, 7.164e-5, 2.006e-6, -3.21e-8)
@@ -952,24 +1350,39 @@ def svel(s, t, p):
     a20, a21, a22, a23 = (-3.9064e-7, 9.1041e-9, -1.6002e-10, 7.988e-12)
     a30, a31, a32 = (1.100e-10, 6.649e-12, -3.389e-13)
 
-    A = (((((a32 * T68 + a31) * T68 + a30) * p +
-           (((a23 * T68 + a22) * T68 + a21) * T68 + a20)) * p +
-          ((((a14 * T68 + a13) * T68 + a12) * T68 + a11) * T68 + a10)) * p +
-         (((a04 * T68 + a03) * T68 + a02) * T68 + a01) * T68 + a00)
+    # A = ((a3 * p + a2) * p + a1) * p + a0, with the constant term of
+    # a0 added last.
+    w = np.multiply(_horner(T68, (a30, a31, a32), b1), p, out=b1)
+    w = np.add(w, _horner(T68, (a20, a21, a22, a23), b2), out=b1)
+    w = np.multiply(w, p, out=b1)
+    w = np.add(w, _horner(T68, (a10, a11, a12, a13, a14), b2), out=b1)
+    w = np.multiply(w, p, out=b1)
+    v = np.multiply(_horner(T68, (a01, a02, a03, a04), b2), T68, out=b2)
+    A = np.add(np.add(w, v, out=b1), a00, out=b1)
+    y = np.add(Cw, np.multiply(A, s, out=b1), out=b_svel)
 
     # Eqn 36 p.47.
     b00, b01, b10, b11 = -1.922e-2, -4.42e-5, 7.3637e-5, 1.7945e-7
-    B = b00 + b01 * T68 + (b10 + b11 * T68) * p
+    # B = b00 + b01 * T68 + (b10 + b11 * T68) * p
+    w = np.add(np.multiply(T68, b01, out=b1), b00, out=b1)
+    v = np.add(np.multiply(T68, b11, out=b2), b10, out=b2)
+    B = np.add(w, np.multiply(v, p, out=b2), out=b1)
+    if s_sqrt is None:
+        s_sqrt = _sqrt(s, out=b2)
+    w = np.multiply(np.multiply(B, s, out=b1), s_sqrt, out=b1)
+    y = np.add(y, w, out=b_svel)
 
     # Eqn 37 p.47.
     d00, d10 = 1.727e-3, -7.9836e-6
-    D = d00 + d10 * p
+    D = np.add(np.multiply(p, d10, out=b1), d00, out=b1)
 
     # Eqn 33 p.46.
-    return Cw + A * s + B * s * s ** 0.5 + D * s ** 2
+    # Cw + A * s + B * s * s**0.5 + D * s**2
+    w = np.multiply(D, _square(s, out=b2), out=b1)
+    return np.add(y, w, out=b_svel)
 
 
-def temp(s, pt, p, pr=0):
+def temp(s, pt, p, pr=0, out=None, ws=None):
     """Calculates temperature from potential temperature at the reference
     pressure PR and in situ pressure P.
 
@@ -983,6 +1396,10 @@ def temp(s, pt, p, pr=0):
         pressure [db].
     pr : array_like
          reference pressure [db]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -1010,9 +1427,9 @@ def temp(s, pt, p, pr=0):
     Modifications: 92-04-06. Phil Morgan.
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
-    s, pt, p, pr = map(np.asanyarray, (s, pt, p, pr))
+    s, pt, p, pr = map(_asarray, (s, pt, p, pr))
     # Carry out inverse calculation by swapping p0 & pr.
-    return ptmp(s, pt, pr, p)
+    return ptmp(s, pt, pr, p, out=out, ws=ws)
 
 
 if __name__ == '__main__':
@@ -16,18 +16,36 @@
 from __future__ import division
 
 import numpy as np
-from .library import T68conv
+from .library import T68conv, _asarray, _duck, _finish, _out, _sqrt
+from .library import _square, _work
+from .stream import _flush, string_types
 from .constants import OMEGA, DEG2NM, NM2KM, Kelvin, deg2rad, rad2deg, gdef
+from .eos80 import dens
 
 __all__ = ['dist',
+           'dist_matrix',
            'f',
+           'gas_saturation',
            'satAr',
            'satN2',
            'satO2',
            'swvel']
 
 
-def dist(lat, lon, units='km'):
+# Constants a and b of Eqn (4) of Weiss 1970.
+_weiss = dict(Ar=((-173.5146, 245.4510, 141.8222, -21.8020),
+                  (-0.034474, 0.014934, -0.0017729)),
+              N2=((-172.4965, 248.4262, 143.0738, -21.7120),
+                  (-0.049781, 0.025018, -0.0034861)),
+              O2=((-173.4292, 249.6339, 143.3483, -21.8492),
+                  (-0.033096, 0.014259, -0.0017000)))
+
+# Molar volumes at STP [l mol-1], the ideal gas 22.414 corrected with the
+# second virial coefficient of each gas at 0 C.
+_molar_volume = dict(Ar=22.393, N2=22.404, O2=22.392)
+
+
+def dist(lat, lon, units='km', out=None, ws=None):
     """Calculate distance between two positions on globe using the "Plane
     Sailing" method. Also uses simple geometry to calculate the bearing of
     the path between position pairs.
@@ -40,6 +58,10 @@ def dist(lat, lon, units='km'):
           decimal degrees (+ve E, -ve W) [-180..+180]
     units : string, optional
             default kilometers
+    out : tuple of ndarray, optional
+          arrays in which to place the distance and the phase angle.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -74,36 +96,166 @@ def dist(lat, lon, units='km'):
                    99-06-25. Lindsay Pender, Fixed transpose of row vectors.
     """
 
-    lon, lat = map(np.asanyarray, (lon, lat))
+    lon, lat = map(_asarray, (lon, lat))
 
     if lat.size == 1:
         lat = np.repeat(lat, lon.size)
     elif lon.size == 1:
         lon = np.repeat(lon, lat.size)
 
-    npositions = max(lon.shape)
+    # Position pairs are (lat[:-1], lon[:-1]) and (lat[1:], lon[1:]).
+    args = (lat[1:, ...], lon[1:, ...])
+    out_dist, out_angle = (None, None) if out is None else out
+    b_dist = _out(out_dist, args, ws, 'dist.dist')
+    b_angle = _out(out_angle, args, ws, 'dist.angle')
+    b_dlon, b_dlat, b1 = _work(3, args, ws, 'dist')
+
+    dist, phaseangle = _dist(lat[0:-1, ...], lon[0:-1, ...], lat[1:, ...],
+                             lon[1:, ...], units,
+                             (b_dist, b_angle, b_dlon, b_dlat, b1))
+    return _finish(dist, out_dist), _finish(phaseangle, out_angle)
+
+
+def dist_matrix(lat, lon, units='km', upper=False, block=2 ** 20, out=None,
+                ws=None):
+    """Distances and bearings between all the pairs of positions, with the
+    same "Plane Sailing" method, units and angle convention as `dist`.
+
+    Entry [i, j] is the path from position i to position j, i.e.: the same
+    as ``dist([lat[i], lat[j]], [lon[i], lon[j]])``.  The matrices are
+    computed by blocks of rows and written straight into `out`, that can be
+    memory-mapped for a large number of positions.
+
+    Parameters
+    ----------
+    lat : array_like
+          decimal degrees (+ve N, -ve S) [- 90.. +90]
+    lon : array_like
+          decimal degrees (+ve E, -ve W) [-180..+180]
+    units : string, optional
+            default kilometers
+    upper : bool, optional
+            return only the pairs i < j, condensed row by row in 1D arrays
+            of length N * (N - 1) / 2, the same order as
+            `scipy.spatial.distance.pdist`.  The distance is symmetric and
+            the angle from j to i is the opposite direction.  Default is
+            False, the full N x N matrices.
+    block : int, optional
+            number of pairs computed at once, the memory use is a few times
+            `block` float64 values.  Default is 2**20.
+    out : tuple, optional
+          arrays in which to place the distance and the phase angle, or
+          paths of the .npy files to create as memory maps.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
+
+    Returns
+    -------
+    dist : array_like
+           distance between positions in units
+    phaseangle : array_like
+                 angle of line between stations with x axis (East).
+                 Range of values are -180..+180. (E=0, N=90, S=-90)
 
-    ind = np.arange(0, npositions - 1, 1)  # Index to first of position pairs.
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> lat, lon = [41, 40, 40], [35, 35, 36]
+    >>> d, a = sw.dist_matrix(lat, lon)
+    >>> d
+    array([[   0.        ,  111.12      ,  139.59685152],
+           [ 111.12      ,    0.        ,   85.12285852],
+           [ 139.59685152,   85.12285852,    0.        ]])
+    >>> sw.dist_matrix(lat, lon, upper=True)[1]
+    array([-90.        , -52.75042491,   0.        ])
+    """
 
-    dlon = np.diff(lon, axis=0)
-    if np.any(np.abs(dlon) > 180):
+    lat, lon = np.broadcast_arrays(*map(np.asanyarray, (lat, lon)))
+    lat, lon = lat.ravel(), lon.ravel()
+    n = lat.size
+    dtype = np.result_type(lat, lon, 1.)
+    shape = (n * (n - 1) // 2,) if upper else (n, n)
+
+    out = (None, None) if out is None else out
+    if len(out) != 2:
+        raise ValueError("2 outputs expected.")
+    res = []
+    for o in out:
+        if o is None:
+            o = np.empty(shape, dtype)
+        elif isinstance(o, string_types):
+            o = np.lib.format.open_memmap(o, mode='w+', dtype=dtype,
+                                          shape=shape)
+        elif o.shape != shape:
+            raise ValueError("Output shape %s, expected %s." %
+                             (o.shape, shape))
+        res.append(o)
+    out_dist, out_angle = res
+
+    rows = max(1, min(n, block // max(n, 1)))
+    start = 0  # Of row i in the condensed arrays.
+    for i0 in range(0, n, rows):
+        i1 = min(i0 + rows, n)
+        # Pairs with j > i0 only, in upper mode.
+        j0 = i0 + 1 if upper else 0
+        if j0 >= n:
+            break
+        lat0, lon0 = lat[i0:i1, None], lon[i0:i1, None]
+        lat1, lon1 = lat[None, j0:], lon[None, j0:]
+        work = _work(5, (lat0, lon0, lat1, lon1), ws, 'dist_matrix')
+        dist, angle = _dist(lat0, lon0, lat1, lon1, units, work)
+        if not upper:
+            out_dist[i0:i1], out_angle[i0:i1] = dist, angle
+            continue
+        for k, i in enumerate(range(i0, i1)):
+            # Row i holds the pairs (i, i + 1), ..., (i, n - 1).
+            end = start + n - 1 - i
+            out_dist[start:end] = dist[k, i - i0:]
+            out_angle[start:end] = angle[k, i - i0:]
+            start = end
+
+    _flush(res)
+    return out_dist, out_angle
+
+
+def _dist(lat0, lon0, lat1, lon1, units, work=(None,) * 5):
+    """Plane sailing distance and phase angle from (lat0, lon0) to (lat1,
+    lon1), broadcast against each other.  The 5 `work` arrays hold the
+    distance, the angle and the temporary results."""
+    b_dist, b_angle, b_dlon, b_dlat, b1 = work
+    dlon = np.subtract(lon1, lon0, out=b_dlon)
+    if _duck(dlon):  # Same without inspecting the values.
+        dlon = np.where(abs(dlon) > 180, -np.sign(dlon) * (360 - abs(dlon)),
+                        dlon)
+    elif dlon.size and np.fmax.reduce(np.abs(dlon, out=b1), axis=None) > 180:
         flag = abs(dlon) > 180
         dlon[flag] = -np.sign(dlon[flag]) * (360 - np.abs(dlon[flag]))
 
-    latrad = np.abs(lat * deg2rad)
-    dep = np.cos((latrad[ind + 1] + latrad[ind]) / 2) * dlon
-    dlat = np.diff(lat, axis=0)
-    dist = DEG2NM * (dlat ** 2 + dep ** 2) ** 0.5
+    # cos of the mean of abs(lat) for each pair.
+    w = np.abs(np.multiply(lat1, deg2rad, out=b1), out=b1)
+    v = np.abs(np.multiply(lat0, deg2rad, out=b_dlat), out=b_dlat)
+    w = np.divide(np.add(w, v, out=b1), 2, out=b1)
+    dep = np.multiply(np.cos(w, out=b1), dlon, out=b1)
+    dlat = np.subtract(lat1, lat0, out=b_dlat)
+    # DEG2NM * (dlat**2 + dep**2)**0.5
+    w = _square(dlat, out=b_dist)
+    w = np.add(w, _square(dep, out=b_dlon), out=b_dist)
+    dist = np.multiply(_sqrt(w, out=b_dist), DEG2NM, out=b_dist)
 
     if units == 'km':
-        dist = dist * NM2KM
-
-    # Calculate angle to x axis.
-    phaseangle = np.angle(dep + dlat * 1j) * rad2deg
+        dist = np.multiply(dist, NM2KM, out=b_dist)
+
+    # Calculate angle to x axis.  Same as np.angle(dep + dlat * 1j), the
+    # real part of the complex product keeps the sign of zero dlat.
+    re = np.subtract(np.multiply(dlat, 0, out=b_dlon), 0., out=b_dlon)
+    re = np.add(dep, re, out=b_dlon)
+    im = np.add(dlat, 0., out=b_dlat)
+    phaseangle = np.multiply(np.arctan2(im, re, out=b_angle), rad2deg,
+                             out=b_angle)
     return dist, phaseangle
 
 
-def f(lat):
+def f(lat, out=None, ws=None):
     """Calculates the Coriolis factor :math:`f` defined by:
 
     .. math::
@@ -120,6 +272,10 @@ def f(lat):
     ----------
     lat : array_like
           latitude in decimal degrees north [-90..+90].
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -146,12 +302,14 @@ def f(lat):
 
     Modifications: 93-04-20. Phil Morgan.
     """
-    lat = np.asanyarray(lat)
+    lat = _asarray(lat)
+    b_f = _out(out, (lat,), ws, 'f')
     # Eqn p27.  UNESCO 1983.
-    return 2 * OMEGA * np.sin(lat * deg2rad)
+    w = np.sin(np.multiply(lat, deg2rad, out=b_f), out=b_f)
+    return _finish(np.multiply(w, 2 * OMEGA, out=b_f), out)
 
 
-def satAr(s, t):
+def satAr(s, t, out=None, ws=None):
     """Solubility (saturation) of Argon (Ar) in sea water.
 
     Parameters
@@ -160,6 +318,10 @@ def satAr(s, t):
         salinity [psu (PSS-78)]
     t : array_like
         temperature [:math:`^\circ` C (ITS-90)]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -189,23 +351,13 @@ def satAr(s, t):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t = map(np.asanyarray, (s, t))
-
-    # Convert T to Kelvin.
-    t = Kelvin + T68conv(t)
-
-    # Constants for Eqn (4) of Weiss 1970.
-    a = [-173.5146, 245.4510, 141.8222, -21.8020]
-    b = [-0.034474, 0.014934, -0.0017729]
+    s, t = map(_asarray, (s, t))
 
-    # Eqn (4) of Weiss 1970.
-    lnC = (a[0] + a[1] * (100 / t) + a[2] * np.log(t / 100) + a[3] *
-           (t / 100) + s * (b[0] + b[1] * (t / 100) + b[2] * ((t / 100) ** 2)))
+    a, b = _weiss['Ar']
+    return _sat(s, t, a, b, out, ws, 'satAr')
 
-    return np.exp(lnC)
 
-
-def satN2(s, t):
+def satN2(s, t, out=None, ws=None):
     """Solubility (saturation) of Nitrogen (N2) in sea water.
 
     Parameters
@@ -214,6 +366,10 @@ def satN2(s, t):
         salinity [psu (PSS-78)]
     t : array_like
         temperature [:math:`^\circ` C (ITS-90)]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -244,23 +400,13 @@ def satN2(s, t):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t = map(np.asanyarray, (s, t))
-
-    # Convert T to Kelvin.
-    t = Kelvin + T68conv(t)
-
-    # Constants for Eqn (4) of Weiss 1970.
-    a = (-172.4965, 248.4262, 143.0738, -21.7120)
-    b = (-0.049781, 0.025018, -0.0034861)
+    s, t = map(_asarray, (s, t))
 
-    # Eqn (4) of Weiss 1970.
-    lnC = (a[0] + a[1] * (100 / t) + a[2] * np.log(t / 100) + a[3] *
-           (t / 100) + s * (b[0] + b[1] * (t / 100) + b[2] * ((t / 100) ** 2)))
+    a, b = _weiss['N2']
+    return _sat(s, t, a, b, out, ws, 'satN2')
 
-    return np.exp(lnC)
 
-
-def satO2(s, t):
+def satO2(s, t, out=None, ws=None):
     """Solubility (saturation) of Oxygen (O2) in sea water.
 
     Parameters
@@ -269,6 +415,10 @@ def satO2(s, t):
         salinity [psu (PSS-78)]
     t : array_like
         temperature [:math:`^\circ` C (ITS-68)]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -298,29 +448,188 @@ def satO2(s, t):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t = map(np.asanyarray, (s, t))
+    s, t = map(_asarray, (s, t))
+
+    a, b = _weiss['O2']
+    return _sat(s, t, a, b, out, ws, 'satO2')
+
+
+def _sat(s, t, a, b, out=None, ws=None, key=None):
+    """Eqn (4) of Weiss 1970 for the gas with constants `a` and `b`."""
 
+    b_sat = _out(out, (s, t), ws, key)
+    b_t, b_x, b1 = _work(3, (s, t), ws, key)
     # Convert T to Kelvin.
-    t = Kelvin + T68conv(t)
+    t = np.add(T68conv(t, out=b_t), Kelvin, out=b_t)
+    x = np.divide(t, 100, out=b_x)
+
+    # a0 + a1 * (100 / t) + a2 * log(t / 100) + a3 * (t / 100) +
+    # s * (b0 + b1 * (t / 100) + b2 * (t / 100)**2)
+    w = np.multiply(np.divide(100, t, out=b_t), a[1], out=b_t)
+    lnC = np.add(w, a[0], out=b_sat)
+    w = np.multiply(np.log(x, out=b_t), a[2], out=b_t)
+    lnC = np.add(lnC, w, out=b_sat)
+    lnC = np.add(lnC, np.multiply(x, a[3], out=b_t), out=b_sat)
+    w = np.add(np.multiply(x, b[1], out=b_t), b[0], out=b_t)
+    w = np.add(w, np.multiply(_square(x, out=b1), b[2], out=b1),
+               out=b_t)
+    lnC = np.add(lnC, np.multiply(s, w, out=b_t), out=b_sat)
+
+    return _finish(np.exp(lnC, out=b_sat), out)
+
+
+def gas_saturation(s, t, gases=('O2', 'N2', 'Ar'), p=0, units='ml/l',
+                   o2=None, out=None, ws=None):
+    """Solubility (saturation) of several gases in sea water in a single
+    pass.
+
+    The temperature terms of Eqn (4) of Weiss 1970 are computed once and
+    shared by all the gases.  Results in ml/l are identical to the ones from
+    `satO2`, `satN2` and `satAr`.
+
+    Parameters
+    ----------
+    s : array_like
+        salinity [psu (PSS-78)]
+    t : array_like
+        temperature [:math:`^\circ` C (ITS-90)]
+    gases : string or sequence of strings, optional
+            any of 'O2', 'N2' and 'Ar', only those are computed.  Default is
+            ('O2', 'N2', 'Ar').
+    p : array_like, optional
+        pressure [db] of the in-situ density used by the conversion to
+        umol/kg, default is 0.
+    units : string, optional
+            'ml/l', the default, or 'umol/kg'.
+    o2 : array_like, optional
+         measured oxygen in `units`, the percent O2 saturation and the
+         apparent oxygen utilization are then returned too.
+    out : tuple of ndarray, optional
+          arrays in which to place the results, one per returned array.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
-    # Constants for Eqn (4) of Weiss 1970.
-    a = (-173.4292, 249.6339, 143.3483, -21.8492)
-    b = (-0.033096, 0.014259, -0.0017000)
+    Returns
+    -------
+    One array per requested gas and in the same order, a single array when
+    `gases` is a string and `o2` is not given.
 
-    # Eqn (4) of Weiss 1970.
-    lnC = (a[0] + a[1] * (100 / t) + a[2] * np.log(t / 100) + a[3] *
-           (t / 100) + s * (b[0] + b[1] * (t / 100) + b[2] * ((t / 100) ** 2)))
+    sat : array_like
+          solubility of the gas [ml l :sup:`-1`] or [umol kg :sup:`-1`]
+    percent : array_like
+              oxygen saturation 100 * o2 / satO2 [%], only with `o2`.
+    aou : array_like
+          apparent oxygen utilization satO2 - o2 in `units`, only with
+          `o2`.
 
-    return np.exp(lnC)
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> from seawater.library import T90conv
+    >>> t = T90conv([-1, 10, 20, 40])
+    >>> s = [20, 20, 20, 20]
+    >>> sw.gas_saturation(s, t, 'Ar')
+    array([ 0.4455784 ,  0.33970659,  0.27660227,  0.19861429])
+    >>> sat, percent, aou = sw.gas_saturation(s, t, 'O2', o2=5.)
+    >>> percent
+    array([  54.57290374,   71.94164473,   88.5894247 ,  123.47168295])
 
+    References
+    ----------
+    .. [1] Weiss, R. F. 1970. The Solubility of Nitrogen, Oxygen and Argon in
+    Water and Seawater Deep-Sea Research Vol. 17, p. 721-735.
+    doi:10.1016/0011-7471(70)90037-9
+    """
 
-def swvel(length, depth):
+    single = isinstance(gases, str)
+    gases = (gases,) if single else tuple(gases)
+    for gas in gases:
+        if gas not in _weiss:
+            raise NameError("Unrecognized gas %r.  Try 'O2', 'N2' or 'Ar'" %
+                            gas)
+    if units not in ('ml/l', 'umol/kg'):
+        raise NameError("Unrecognized units %r.  Try 'ml/l' or 'umol/kg'" %
+                        units)
+    if single and o2 is None:
+        out = None if out is None else (out,)
+
+    s, t, p = map(_asarray, (s, t, p))
+    args = (s, t) if units == 'ml/l' else (s, t, p)
+    names = gases
+    if o2 is not None:
+        o2 = _asarray(o2)
+        args += (o2,)
+        names += ('percent', 'aou')
+    outs = (None,) * len(names) if out is None else out
+    if len(outs) != len(names):
+        raise ValueError("%d outputs expected." % len(names))
+    res = [_out(o, args, ws, 'gas_saturation.' + name) for o, name in
+           zip(outs, names)]
+    b_t, b_x, b_log, b_x2, b_w, b_v, b_rho = _work(7, args, ws,
+                                                   'gas_saturation')
+
+    if units == 'umol/kg':
+        # [ml l-1] / [l mol-1] * [l kg-1], dens is 1000 [l kg-1] per m3.
+        conv = np.divide(1000., dens(s, t, p, out=b_rho, ws=ws), out=b_rho)
+
+    # The temperature terms shared by all the gases, same as in `_sat`.
+    t = np.add(T68conv(t, out=b_t), Kelvin, out=b_t)
+    x = np.divide(t, 100, out=b_x)
+    inv = np.divide(100, t, out=b_t)
+    log = np.log(x, out=b_log)
+    x2 = _square(x, out=b_x2)
+
+    # O2 is also needed for the saturation and AOU of the measured oxygen.
+    computed, bufs = gases, res[:len(gases)]
+    if o2 is not None and 'O2' not in gases:
+        computed += ('O2',)
+        bufs += _work(1, args, ws, 'gas_saturation.O2')
+    sats = []
+    for gas, b_sat in zip(computed, bufs):
+        sat = _sat_gas(s, inv, x, log, x2, _weiss[gas], (b_sat, b_w, b_v))
+        if units == 'umol/kg':
+            sat = np.multiply(sat, 1000. / _molar_volume[gas], out=b_sat)
+            sat = np.multiply(sat, conv, out=b_sat)
+        sats.append(sat)
+
+    if o2 is not None:
+        sat = sats[computed.index('O2')]
+        b_percent, b_aou = res[len(gases):]
+        percent = np.divide(np.multiply(o2, 100, out=b_percent), sat,
+                            out=b_percent)
+        sats[len(gases):] = percent, np.subtract(sat, o2, out=b_aou)
+
+    sats = tuple(_finish(y, o) for y, o in zip(sats, outs))
+    return sats[0] if single and o2 is None else sats
+
+
+def _sat_gas(s, inv, x, log, x2, constants, work=(None,) * 3):
+    """Eqn (4) of Weiss 1970 from the temperature terms 100 / t, t / 100,
+    log(t / 100) and (t / 100)**2, in Kelvin.  The result goes into the
+    first of the 3 `work` arrays."""
+    (a, b), (b_sat, b_w, b_v) = constants, work
+    w = np.multiply(inv, a[1], out=b_w)
+    lnC = np.add(w, a[0], out=b_sat)
+    w = np.multiply(log, a[2], out=b_w)
+    lnC = np.add(lnC, w, out=b_sat)
+    lnC = np.add(lnC, np.multiply(x, a[3], out=b_w), out=b_sat)
+    w = np.add(np.multiply(x, b[1], out=b_w), b[0], out=b_w)
+    w = np.add(w, np.multiply(x2, b[2], out=b_v), out=b_w)
+    lnC = np.add(lnC, np.multiply(s, w, out=b_w), out=b_sat)
+    return np.exp(lnC, out=b_sat)
+
+
+def swvel(length, depth, out=None, ws=None):
     """Calculates surface wave velocity.
 
     length : array_like
             wave length
     depth : array_like
             water depth [meters]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -335,9 +644,14 @@ def swvel(length, depth):
 
     Modifications: Lindsay Pender 2005
     """
-    length, depth = map(np.asanyarray, (length, depth))
-    k = 2.0 * np.pi / length
-    return np.sqrt(gdef * np.tanh(k * depth) / k)
+    length, depth = map(_asarray, (length, depth))
+    b_vel = _out(out, (length, depth), ws, 'swvel')
+    b_k, = _work(1, (length, depth), ws, 'swvel')
+    k = np.divide(2.0 * np.pi, length, out=b_k)
+    # (gdef * tanh(k * depth) / k)**0.5
+    w = np.tanh(np.multiply(k, depth, out=b_vel), out=b_vel)
+    w = np.divide(np.multiply(w, gdef, out=b_vel), k, out=b_vel)
+    return _finish(np.sqrt(w, out=b_vel), out)
 
 
 if __name__ == '__main__':
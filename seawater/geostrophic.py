@@ -14,20 +14,28 @@
 
 from __future__ import division
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
 from .extras import dist, f
+from .backend import _kernel, get_backend, get_dtype_mode
+from .library import T68conv, _asarray, _finish, _out, _sqrt, _work
 from .library import atleast_2d
-from .eos80 import dens, dpth, g, pden
+from .eos80 import _adtg, _dens, _ptmp, dens, dpth, g, pden
 from .constants import db2Pascal, gdef
+from .ragged import Ragged, _cumsum
 
 __all__ = ['bfrq',
            'svan',
            'gpan',
-           'gvel']
+           'gvel',
+           'GpanAccumulator']
 
 
-def bfrq(s, t, p, lat=None):
+def bfrq(s, t, p, lat=None, out=None, ws=None,
+         outputs=('n2', 'q', 'p_ave')):
     """Calculates Brünt-Väisälä Frequency squared (N :sup:`2`) at the mid
     depths from the equation:
 
@@ -39,6 +47,9 @@ def bfrq(s, t, p, lat=None):
     .. math::
         q=f \frac{N^2}{g}
 
+    `s`, `t` and `p` can be `Ragged` profiles, the results are then Ragged
+    too, with one level less per profile.
+
     Parameters
     ----------
     s(p) : array_like
@@ -51,9 +62,20 @@ def bfrq(s, t, p, lat=None):
           latitude in decimal degrees north [-90..+90].
           Will grav instead of the default g = 9.8 m :sup:`2` s :sup:`-1`) and
           d(z) instead of d(p)
+    out : tuple of ndarray, optional
+          arrays in which to place the results, one per requested output.
+          A single array when `outputs` is a string.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
+    outputs : string or sequence of strings, optional
+              any of 'n2', 'q' and 'p_ave', only those are computed.
+              Default is ('n2', 'q', 'p_ave').
 
     Returns
     -------
+    One array per requested output and in the same order, a single array
+    when `outputs` is a string.
+
     n2 : array_like
            Brünt-Väisälä Frequency squared (M-1xN)  [rad s :sup:`-2`]
     q : array_like
@@ -88,38 +110,129 @@ def bfrq(s, t, p, lat=None):
                    06-04-19. Lindsay Pender, Corrected sign of PV.
     """
 
-    s, t, p = map(np.asanyarray, (s, t, p))
+    if isinstance(outputs, str):
+        out = None if out is None else (out,)
+        return bfrq(s, t, p, lat, out=out, ws=ws, outputs=(outputs,))[0]
+
+    for name in outputs:
+        if name not in ('n2', 'q', 'p_ave'):
+            raise NameError("Unrecognized output %r.  Try 'n2', 'q' or "
+                            "'p_ave'" % name)
+
+    if isinstance(p, Ragged):
+        return _bfrq_ragged(s, t, p, lat, out, ws, outputs)
+
+    s, t, p = map(_asarray, (s, t, p))
     s, t, p = np.broadcast_arrays(s, t, p)
     s, t, p = map(atleast_2d, (s, t, p))
 
+    # Values at the mid pressures have the shape of p[1:, ...].  Outputs
+    # that were not requested go into work arrays, or are not computed.
+    args = (s, t, p) if lat is None else (s, t, p, _asarray(lat))
+    args_mid = tuple(arg[1:, ...] for arg in args[:3]) + args[3:]
+    outs = dict(zip(outputs, (None,) * len(outputs) if out is None else out))
+    b_n2 = _out(outs.get('n2'), args_mid, ws, 'bfrq.n2')
+    b_q = _out(outs.get('q'), args_mid, ws, 'bfrq.q')
+    b_p_ave = _out(outs.get('p_ave'), args_mid[2:3], ws, 'bfrq.p_ave')
+    b_up, b_lo, b1, b2 = _work(4, args_mid, ws, 'bfrq.mid')
+
+    cor = None
     if lat is None:
-        z, cor, grav = p, np.NaN, np.ones(p.shape) * gdef
+        # Constant gravity, q is NaN without the latitude.
+        z, grav = p, gdef
+        if 'q' in outputs:
+            cor = np.NaN
     else:
-        lat = np.asanyarray(lat)
-        z = dpth(p, lat)
-        grav = g(lat, -z)  # -z because `grav` expects height as argument.
-        cor = f(lat)
-
-    p_ave = (p[0:-1, ...] + p[1:, ...]) / 2.
-
-    pden_up = pden(s[0:-1, ...], t[0:-1, ...], p[0:-1, ...], p_ave)
-    pden_lo = pden(s[1:, ...], t[1:, ...], p[1:, ...], p_ave)
-
-    mid_pden = (pden_up + pden_lo) / 2.
-    dif_pden = pden_up - pden_lo
+        lat = _asarray(lat)
+        b_z, b_grav = _work(2, args, ws, 'bfrq')
+        z = dpth(p, lat, out=b_z, ws=ws)
+        # -z because `grav` expects height as argument.
+        grav = g(lat, np.negative(z, out=b_grav), out=b_grav, ws=ws)
+        if 'q' in outputs:
+            b_cor, = _work(1, (lat,), ws, 'bfrq.lat')
+            cor = np.negative(f(lat, out=b_cor, ws=ws), out=b_cor)
+
+    res = _bfrq(s, t, p, z, grav, cor,
+                (b_n2, b_q, b_p_ave, b_up, b_lo, b1, b2), ws)
+    res = dict(zip(('n2', 'q', 'p_ave'), res))
+    return tuple(_finish(res[name], outs[name]) for name in outputs)
+
+
+def _bfrq(s, t, p, z, grav, cor=None, work=(None,) * 7, ws=None):
+    """N :sup:`2`, potential vorticity and mid pressure kernel for the
+    depth `z`, the gravity `grav` (a number when constant) and the negated
+    Coriolis factor `cor` at the pressures `p`.  The potential vorticity is
+    None when `cor` is None.  Writes into the 7 `work` arrays, the first
+    three hold the results."""
+
+    b_n2, b_q, b_p_ave, b_up, b_lo, b1, b2 = work
+    p_ave = np.add(p[0:-1, ...], p[1:, ...], out=b_p_ave)
+    p_ave = np.divide(p_ave, 2., out=b_p_ave)
+
+    if (_kernel('ptmp', (s, t, p, p_ave)) is None and
+            _kernel('dens', (s, t, p_ave)) is None):
+        pden_up, pden_lo = _pden_mid(s, t, p, p_ave, (b_up, b_lo), ws)
+    else:
+        pden_up = pden(s[0:-1, ...], t[0:-1, ...], p[0:-1, ...], p_ave,
+                       out=b_up, ws=ws)
+        pden_lo = pden(s[1:, ...], t[1:, ...], p[1:, ...], p_ave, out=b_lo,
+                       ws=ws)
 
-    mid_g = (grav[0:-1, ...] + grav[1:, ...]) / 2.
+    mid_pden = np.divide(np.add(pden_up, pden_lo, out=b1), 2., out=b1)
+    dif_pden = np.subtract(pden_up, pden_lo, out=b_up)
 
-    dif_z = np.diff(z, axis=0)
+    if np.isscalar(grav):
+        mid_g = grav
+    else:
+        mid_g = np.add(grav[0:-1, ...], grav[1:, ...], out=b2)
+        mid_g = np.divide(mid_g, 2., out=b2)
 
-    n2 = -mid_g * dif_pden / (dif_z * mid_pden)
+    dif_z = np.subtract(z[1:, ...], z[0:-1, ...], out=b_lo)
+    den = np.multiply(dif_z, mid_pden, out=b_lo)
 
-    q = -cor * dif_pden / (dif_z * mid_pden)
+    # -mid_g * dif_pden / (dif_z * mid_pden)
+    n2 = np.multiply(np.negative(mid_g, out=b_n2), dif_pden, out=b_n2)
+    n2 = np.divide(n2, den, out=b_n2)
 
+    # -cor * dif_pden / (dif_z * mid_pden), cor is already negated.
+    q = None
+    if cor is not None:
+        q = np.divide(np.multiply(cor, dif_pden, out=b_q), den, out=b_q)
     return n2, q, p_ave
 
 
-def svan(s, t, p=0):
+def _pden_mid(s, t, p, p_ave, out=(None, None), ws=None):
+    """Potential density of the upper and of the lower level of each layer
+    relative to the mid pressures `p_ave`, same as `pden` on each of them.
+    Every level is the lower level of a layer and the upper level of the
+    next one.  The first Runge-Kutta stage, the temperature in IPTS-68 and
+    the square root of the salinity only depend on the level and are
+    computed once for both."""
+
+    b_up, b_lo = out
+    args_mid = (s[1:, ...], t[1:, ...], p[1:, ...], p_ave)
+    b_s35, b_T68, b_adtg, b_s_sqrt, b1, b2 = _work(6, (s, t, p), ws,
+                                                   'bfrq.levels')
+    work = _work(9, args_mid, ws, 'bfrq.ptmp')
+    b_pr, = _work(1, (p_ave,), ws, 'bfrq.pr')
+
+    s35 = np.subtract(s, 35, out=b_s35)
+    T68 = np.multiply(t, 1.00024, out=b_T68)  # T68conv.
+    adtg0 = _adtg(s35, T68, p, b_adtg, b1, b2)
+    s_sqrt = _sqrt(s, out=b_s_sqrt)
+    pr = np.divide(p_ave, 10., out=b_pr)  # Convert from db to bars.
+
+    res = []
+    for k, b_pden in ((slice(0, -1), b_up), (slice(1, None), b_lo)):
+        first = (s35[k, ...], T68[k, ...], adtg0[k, ...])
+        pt = _ptmp(s[k, ...], t[k, ...], p[k, ...], p_ave, work, first)
+        pt = T68conv(pt, out=work[0])
+        res.append(_dens(s[k, ...], pt, pr, s_sqrt[k, ...],
+                         (b_pden,) + tuple(work[1:5])))
+    return res
+
+
+def svan(s, t, p=0, out=None, ws=None):
     """Specific Volume Anomaly calculated as
     svan = 1 / dens(s, t, p) - 1 / dens(35, 0, p).
 
@@ -133,6 +246,10 @@ def svan(s, t, p=0):
            temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db].
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -165,11 +282,69 @@ def svan(s, t, p=0):
                    99-06-25. Lindsay Pender, Fixed transpose of row vectors.
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
-    s, t, p = map(np.asanyarray, (s, t, p))
-    return 1 / dens(s, t, p) - 1 / dens(35, 0, p)
-
-
-def gpan(s, t, p):
+    s, t, p = map(_asarray, (s, t, p))
+    b_svan = _out(out, (s, t, p), ws, 'svan')
+    y = np.divide(1, dens(s, t, p, out=b_svan, ws=ws), out=b_svan)
+    # The reference term only depends on the pressure.
+    w = _svan_ref(p, ws)
+    return _finish(np.subtract(y, w, out=b_svan), out)
+
+
+# Reference specific volumes 1 / dens(35, 0, p) of the last pressure grids,
+# least recently used first.
+_ref_cache = OrderedDict()
+_ref_lock = threading.Lock()
+_ref_entries = 32  # Grids kept in the cache.
+_ref_levels = 2**16  # Larger grids are not cached.
+
+
+def _pressure_axis(p, ws=None):
+    """The part of `p` that broadcasts back to it: the broadcast (zero
+    stride) dimensions are dropped and, when all the columns hold the same
+    pressures, only the first one is kept."""
+    p = p[tuple(slice(0, 1) if stride == 0 else slice(None) for stride in
+                p.strides)]
+    if p.ndim > 1 and p.size > p.shape[0]:
+        first = p[(slice(None),) + (slice(0, 1),) * (p.ndim - 1)]
+        last = p[(slice(None),) + (slice(-1, None),) * (p.ndim - 1)]
+        # Cheap test on the last column before comparing them all.
+        if (last == first).all():
+            same = (None if ws is None else
+                    ws.get('svan.axis', 1, p.shape, bool)[0])
+            if np.equal(p, first, out=same).all():
+                return first
+    return p
+
+
+def _svan_ref(p, ws=None):
+    """1 / dens(35, 0, p), evaluated on the pressure axis only and taken
+    from the cache when the same pressure grid was seen before.  The result
+    broadcasts against `p` and must not be written into."""
+    if type(p) is not np.ndarray:
+        b_ref, = _work(1, (p,), ws, 'svan')
+        return np.divide(1, dens(35., 0., p, out=b_ref, ws=ws), out=b_ref)
+    p = _pressure_axis(p, ws)
+    if p.ndim == 0 or p.size > _ref_levels:
+        b_ref, = _work(1, (p,), ws, 'svan')
+        return np.divide(1, dens(35., 0., p, out=b_ref, ws=ws), out=b_ref)
+    # The dtype mode and the backend change the rounding of the result.
+    key = (get_dtype_mode(), get_backend(), p.dtype.str, p.shape,
+           p.tobytes())
+    with _ref_lock:
+        w = _ref_cache.pop(key, None)
+        if w is not None:
+            _ref_cache[key] = w  # Most recently used go to the end.
+            return w
+    w = np.divide(1, dens(35., 0., p))
+    w.flags.writeable = False
+    with _ref_lock:
+        _ref_cache[key] = w
+        while len(_ref_cache) > _ref_entries:
+            _ref_cache.popitem(last=False)
+    return w
+
+
+def gpan(s, t, p, out=None, ws=None):
     """Geopotential Anomaly calculated as the integral of svan from the
     the sea surface to the bottom. THUS RELATIVE TO SEA SURFACE.
 
@@ -177,6 +352,7 @@ def gpan(s, t, p):
     sea surface whereas P&P calculated relative to the deepest common depth.
     Note that older literature may use units of "dynamic decimeter" for above.
 
+    `s`, `t` and `p` can be `Ragged` profiles, the result is then Ragged too.
 
     Parameters
     ----------
@@ -186,6 +362,10 @@ def gpan(s, t, p):
            temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db].
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -216,24 +396,139 @@ def gpan(s, t, p):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p = map(np.asanyarray, (s, t, p))
+    if isinstance(p, Ragged):
+        return _gpan_ragged(s, t, p, out, ws)
+
+    s, t, p = map(_asarray, (s, t, p))
     s, t, p = np.broadcast_arrays(s, t, p)
     s, t, p = map(atleast_2d, (s, t, p))
 
-    svn = svan(s, t, p)
-
-    # NOTE: Assumes that pressure is the first dimension!
-    mean_svan = (svn[1:, ...] + svn[0:-1, ...]) / 2.
-    top = svn[0, ...] * p[0, ...] * db2Pascal
-    bottom = (mean_svan * np.diff(p, axis=0)) * db2Pascal
-    ga = np.concatenate((top[None, ...], bottom), axis=0)
-    return np.cumsum(ga, axis=0).squeeze()
+    b_gpan = _out(out, (s, t, p), ws, 'gpan')
+    b_svn, b_ga = _work(2, (s, t, p), ws, 'gpan')
+    ga = _gpan(svan(s, t, p, out=b_svn, ws=ws), p, (b_gpan, b_ga))
+    if out is None:
+        return np.squeeze(ga)
+    return _finish(ga if ga is out else ga.reshape(out.shape), out)
+
+
+def _gpan(svn, p, work=(None, None)):
+    """Integrates the specific volume anomaly `svn` from the surface.  Both
+    arrays must have pressure as the first dimension.  When the 2 `work`
+    arrays are given the result goes into the first one and is not
+    squeezed."""
+
+    b_gpan, b_ga = work
+    if b_gpan is None:
+        # NOTE: Assumes that pressure is the first dimension!
+        mean_svan = (svn[1:, ...] + svn[0:-1, ...]) / 2.
+        top = svn[0, ...] * p[0, ...] * db2Pascal
+        bottom = (mean_svan * np.diff(p, axis=0)) * db2Pascal
+        ga = np.concatenate((top[None, ...], bottom), axis=0)
+        return np.squeeze(np.cumsum(ga, axis=0))
+
+    # Same as above, with the top and bottom terms written into `b_ga`.
+    top, bottom = b_ga[0, ...], b_ga[1:, ...]
+    np.multiply(np.multiply(svn[0, ...], p[0, ...], out=top), db2Pascal,
+                out=top)
+    mean_svan = np.add(svn[1:, ...], svn[0:-1, ...], out=bottom)
+    mean_svan = np.divide(mean_svan, 2., out=bottom)
+    dp = np.subtract(p[1:, ...], p[0:-1, ...], out=b_gpan[1:, ...])
+    np.multiply(np.multiply(mean_svan, dp, out=bottom), db2Pascal,
+                out=bottom)
+    return np.cumsum(b_ga, axis=0, out=b_gpan)
+
+
+class GpanAccumulator(object):
+    """Geopotential anomaly of profiles that grow a few levels at a time,
+    e.g.: from profiling floats or gliders.
+
+    Only the specific volume anomaly, the pressure and the geopotential
+    anomaly of the deepest level are kept between calls, so appending `k`
+    levels costs O(k) instead of recomputing the whole column.  The result
+    is identical to `gpan` on the full profile.
 
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> acc = sw.GpanAccumulator()
+    >>> acc.append([0, 15], [15, 15], [0, 250])
+    array([  0.        ,  56.35465209])
+    >>> acc.append([30, 35], [15, 15], [500, 1000])
+    array([  84.67266947,  104.95799186])
+    >>> acc.levels
+    4
+    >>> acc.gpan
+    array([   0.        ,   56.35465209,   84.67266947,  104.95799186])
+    """
 
-def gvel(ga, lat, lon):
+    def __init__(self):
+        self._last = None  # svan, pressure and gpan of the deepest level.
+        self._chunks = []
+        self.levels = 0
+
+    def append(self, s, t, p, ws=None):
+        """Appends levels at the bottom of the profiles.
+
+        Parameters
+        ----------
+        s(p) : array_like
+               salinity [psu (PSS-78)]
+        t(p) : array_like
+               temperature [:math:`^\circ` C (ITS-90)]
+        p : array_like
+            pressure [db], deeper than the levels already appended.
+        ws : Workspace, optional
+             reusable work arrays for the temporary results.
+
+        Returns
+        -------
+        gpan : array_like
+               geopotential anomaly of the new levels, squeezed like `gpan`
+               [m :sup:`3` kg :sup:`-1`
+                Pa = m :sup:`2` s :sup:`-2` = J kg :sup:`-1`]
+        """
+
+        s, t, p = map(_asarray, (s, t, p))
+        s, t, p = np.broadcast_arrays(s, t, p)
+        s, t, p = map(atleast_2d, (s, t, p))
+        svn = svan(s, t, p, ws=ws)
+
+        # Same terms as `_gpan`, continuing from the deepest level.
+        if self._last is None:
+            head = svn[0:1, ...] * p[0:1, ...] * db2Pascal
+        else:
+            last_svn, last_p, head = self._last
+            if last_p.shape[1:] != p.shape[1:]:
+                raise ValueError("Expected levels of shape %r, got %r." %
+                                 (last_p.shape[1:], p.shape[1:]))
+            svn = np.concatenate((last_svn, svn), axis=0)
+            p = np.concatenate((last_p, p), axis=0)
+        mean_svan = (svn[1:, ...] + svn[0:-1, ...]) / 2.
+        bottom = (mean_svan * np.diff(p, axis=0)) * db2Pascal
+        ga = np.cumsum(np.concatenate((head, bottom), axis=0), axis=0)
+        if self._last is not None:
+            ga = ga[1:, ...]
+
+        self._last = (svn[-1:, ...], p[-1:, ...], ga[-1:, ...])
+        self._chunks.append(ga)
+        self.levels += ga.shape[0]
+        return np.squeeze(ga)
+
+    @property
+    def gpan(self):
+        """Geopotential anomaly of all the levels appended so far."""
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks, axis=0)]
+        return np.squeeze(self._chunks[0]) if self._chunks else None
+
+
+def gvel(ga, lat, lon, out=None, ws=None):
     """Calculates geostrophic velocity given the geopotential anomaly and
     position of each station.
 
+    `ga` can be `Ragged` profiles, the result is then Ragged too, over the
+    levels that each pair of adjacent stations have in common.
+
     Parameters
     ----------
     ga : array_like
@@ -242,6 +537,10 @@ def gvel(ga, lat, lon):
           latitude  of each station (+ve = N, -ve = S) [ -90.. +90]
     lon : array_like
           longitude of each station (+ve = E, -ve = W) [-180..+180]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -286,7 +585,102 @@ def gvel(ga, lat, lon):
     Modifications: 92-03-26. Phil Morgan.
     """
 
-    ga, lon, lat = map(np.asanyarray, (ga, lon, lat))
+    if isinstance(ga, Ragged):
+        return _gvel_ragged(ga, lat, lon, out)
+
+    ga, lon, lat = map(_asarray, (ga, lon, lat))
+    b_dist, b_angle, b_lf = _work(3, (lat[1:], lon[1:]), ws, 'gvel')
+    distm = dist(lat, lon, units='km', out=(b_dist, b_angle), ws=ws)[0]
+    distm = np.multiply(distm, 1e3, out=b_dist)
+    lat_mid = np.divide(np.add(lat[0:-1], lat[1:], out=b_angle), 2,
+                        out=b_angle)
+    lf = np.multiply(f(lat_mid, out=b_lf, ws=ws), distm, out=b_lf)
+
+    # -np.diff(ga, axis=1) / lf
+    b_vel = _out(out, (ga[:, 1:], lf), ws, 'gvel')
+    vel = np.subtract(ga[:, 1:], ga[:, 0:-1], out=b_vel)
+    vel = np.divide(np.negative(vel, out=b_vel), lf, out=b_vel)
+    return _finish(vel, out)
+
+
+def _layout(*args):
+    """Offsets shared by the Ragged `args`, numbers are broadcast."""
+    offsets = [arg.offsets for arg in args if isinstance(arg, Ragged)]
+    for other in offsets[1:]:
+        if not np.array_equal(other, offsets[0]):
+            raise ValueError("Ragged inputs with different offsets.")
+    values = [arg.values if isinstance(arg, Ragged) else _asarray(arg)
+              for arg in args]
+    return [offsets[0]] + values
+
+
+def _ragged(values, offsets, out):
+    """Ragged result, in `out` when given."""
+    if out is None:
+        return Ragged(values, offsets)
+    _finish(values, out.values)
+    return out
+
+
+def _gpan_ragged(s, t, p, out=None, ws=None):
+    """`gpan` for Ragged profiles, same terms as `_gpan`."""
+    offsets, s, t, p = _layout(s, t, p)
+    svn = svan(s, t, p, ws=ws)
+    layout = Ragged(svn, offsets)
+    up, lo, _ = layout._pairs()
+    top = offsets[:-1][layout.lengths > 0]
+
+    ga = np.empty(svn.shape, svn.dtype)
+    ga[top] = svn[top] * p[top] * db2Pascal
+    mean_svan = (svn[lo] + svn[up]) / 2.
+    ga[lo] = (mean_svan * (p[lo] - p[up])) * db2Pascal
+    return _ragged(_cumsum(ga, offsets), offsets, out)
+
+
+def _bfrq_ragged(s, t, p, lat, out, ws, outputs):
+    """`bfrq` for Ragged profiles.  The profiles are evaluated as a single
+    column, sharing the work of every level, and the layers across two
+    profiles are dropped."""
+    offsets, s, t, p = _layout(s, t, p)
+    layout = Ragged(p, offsets)
+    up, _, mid_offsets = layout._pairs()
+    s, t, p = [atleast_2d(x) for x in np.broadcast_arrays(s, t, p)]
+
+    cor = None
+    if lat is None:
+        z, grav = p, gdef
+        if 'q' in outputs:
+            cor = np.NaN
+    else:
+        # One latitude per profile, repeated for each of its levels.
+        lat = np.repeat(np.broadcast_to(_asarray(lat), (len(layout),)),
+                        layout.lengths)[:, None]
+        z = dpth(p, lat, ws=ws)
+        grav = g(lat, -z, ws=ws)
+        if 'q' in outputs:
+            cor = -f(lat[0:-1, ...], ws=ws)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        res = _bfrq(s, t, p, z, grav, cor, ws=ws)
+    res = dict(zip(('n2', 'q', 'p_ave'), res))
+    outs = (None,) * len(outputs) if out is None else out
+    return tuple(_ragged(res[name][up, 0], mid_offsets, o) for name, o in
+                 zip(outputs, outs))
+
+
+def _gvel_ragged(ga, lat, lon, out=None):
+    """`gvel` for Ragged profiles, over the levels that each pair of
+    adjacent stations have in common."""
+    lat, lon = map(_asarray, (lat, lon))
     distm = dist(lat, lon, units='km')[0] * 1e3
     lf = f((lat[0:-1] + lat[1:]) / 2) * distm
-    return -np.diff(ga, axis=1) / lf
+
+    lengths = np.minimum(ga.lengths[:-1], ga.lengths[1:])
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    pair = np.repeat(np.arange(lengths.size), lengths)
+    left = ga.offsets[pair] + np.arange(offsets[-1]) - offsets[pair]
+    right = left - ga.offsets[pair] + ga.offsets[pair + 1]
+
+    # -np.diff(ga, axis=1) / lf
+    vel = -(ga.values[right] - ga.values[left]) / lf[pair]
+    return _ragged(vel, offsets, out)
@@ -14,8 +14,12 @@
 
 from __future__ import division
 
+from collections import OrderedDict
+
 import numpy as np
 
+from .backend import _kernel, _preserve, _result_type
+
 
 __all__ = ['cndr',
            'salds',
@@ -25,7 +29,8 @@ __all__ = ['cndr',
            'sals',
            'smow',
            'T68conv',
-           'T90conv']
+           'T90conv',
+           'Workspace']
 
 
 # Constants.
@@ -37,7 +42,7 @@ e = [2.070e-5, -6.370e-10, 3.989e-15]
 k = 0.0162
 
 
-def cndr(s, t, p):
+def cndr(s, t, p, out=None):
     """Calculates conductivity ratio.
 
     Parameters
@@ -48,6 +53,8 @@ def cndr(s, t, p):
            temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db]
+    out : ndarray, optional
+          array in which to place the result.
 
     Returns
     -------
@@ -77,52 +84,97 @@ def cndr(s, t, p):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p = map(np.asanyarray, (s, t, p))
+    s, t, p = map(_asarray, (s, t, p))
+
+    kernel = _kernel('cndr', (s, t, p))
+    if kernel is not None:
+        y = kernel(s, t, p, out=_out(out, (s, t, p)))
+        return _finish(y, out)
 
     T68 = T68conv(t)
 
-    shape = s.shape
-    s, t = map(np.ravel, (s, t))
-    # Do a Newton-Raphson iteration for inverse interpolation of Rt from s.
-    Rx = []
-    for S, T in zip(s, t):
-        Rx_loop = np.sqrt(S / 35.0)  # first guess at Rx = sqrt(Rt).
-        SInc = sals(Rx_loop * Rx_loop, T)  # S Increment (guess) from Rx.
-        iloop = 0
-        while True:
-            # FIXME: I believe that T / 1.00024 isn't correct here.  But I'm
-            # reproducing seawater up to its bugs!
-            Rx_loop = Rx_loop + (S - SInc) / salds(Rx_loop, T / 1.00024 - 15)
-            SInc = sals(Rx_loop * Rx_loop, T)
-            iloop += 1
-            dels = abs(SInc - S)
-            if (dels > 1.0e-10) and (iloop < 100):
-                pass
-            else:
+    if _duck(s) or _duck(t):
+        Rx = _cndr_rx(s, t)
+    else:
+        s, t = np.broadcast_arrays(s, t, subok=True)
+        shape = s.shape
+        # The loop ran on the valid elements with plain scalar arithmetic,
+        # masked arithmetic rounds the powers differently.
+        invalid = np.ma.getmaskarray(s) | np.ma.getmaskarray(t)
+        S_all, T_all = [np.ma.getdata(x).ravel() for x in (s, t)]
+        if not _preserve():
+            # The scalar arithmetic of the original element-wise loop
+            # promoted everything to float64.
+            S_all, T_all = S_all.astype(np.float64), T_all.astype(np.float64)
+        # Do a Newton-Raphson iteration for inverse interpolation of Rt from
+        # s.  The whole array is iterated at once, but only the elements
+        # that have not converged yet are updated.  Each element goes
+        # through exactly the same sequence of operations as in the original
+        # element-wise loop.
+        Rx = np.sqrt(S_all / 35.0)  # first guess at Rx = sqrt(Rt).
+        SInc = sals(Rx * Rx, T_all)  # S Increment (guess) from Rx.
+        # FIXME: I believe that T / 1.00024 isn't correct here.  But I'm
+        # reproducing seawater up to its bugs!
+        delt = T_all / 1.00024 - 15
+        idx = np.flatnonzero(~invalid)
+        tol = 1.0e-10
+        if _preserve():
+            # Float32 never gets within 1e-10.
+            tol = max(tol, 100 * np.finfo(Rx.dtype).eps)
+        for iloop in range(100):
+            S, T, Rx_loop = S_all[idx], T_all[idx], Rx[idx]
+            Rx_loop = Rx_loop + (S - SInc[idx]) / salds(Rx_loop, delt[idx])
+            SInc_loop = sals(Rx_loop * Rx_loop, T)
+            Rx[idx] = Rx_loop
+            dels = np.abs(SInc_loop - S)
+            active = dels > tol  # NaNs are never active.
+            idx = idx[active]
+            if idx.size == 0:
                 break
+            SInc[idx] = SInc_loop[active]
 
-        Rx.append(Rx_loop)
-
-    Rx = np.array(Rx).reshape(shape)
+        Rx = Rx.reshape(shape)
 
     # Once Rt found, corresponding to each (s,t) evaluate r.
     # Eqn(4) p.8 UNESCO 1983.
     A = (d[2] + d[3] * T68)
-    B = 1 + d[0] * T68 + d[1] * T68 ** 2
-    C = p * (e[0] + e[1] * p + e[2] * p ** 2)
+    B = 1 + d[0] * T68 + d[1] * _square(T68)
+    C = p * (e[0] + e[1] * p + e[2] * _square(p))
 
     # Eqn(6) p.9 UNESCO 1983.
-    Rt = Rx ** 2
+    Rt = _square(Rx)
     rt = salrt(t)
     #Rtrt  = rt * Rt # NOTE: unused in the code, but present in the original
     D = B - A * rt * Rt
     E = rt * Rt * A * (B + C)
-    r = np.sqrt(np.abs(D ** 2 + 4 * E)) - D
-    r = 0.5 * r / A
+    r = np.sqrt(np.abs(_square(D) + 4 * E)) - D
+    r = np.divide(0.5 * r, A, out=out)
+    if np.ma.is_masked(s):
+        r = np.ma.MaskedArray(r, mask=np.ma.getmaskarray(r) |
+                              np.ma.getmaskarray(s))
     return r
 
 
-def salds(rtx, delt):
+def _cndr_rx(s, t, iterations=10):
+    """The Newton-Raphson iteration of `cndr` for duck arrays.  Converged
+    elements are frozen with `np.where` instead of being taken out of the
+    iteration, so the values are never inspected and the result stays lazy.
+    Elements converge in 3 or 4 iterations; the rare ones that never get
+    within 1e-10 stop after `iterations`, not 100, a round-off difference."""
+    Rx = np.sqrt(s / 35.0)
+    SInc = sals(Rx * Rx, t)
+    delt = t / 1.00024 - 15
+    active = True
+    for iloop in range(iterations):
+        Rx_loop = Rx + (s - SInc) / salds(Rx, delt)
+        SInc_loop = sals(Rx_loop * Rx_loop, t)
+        Rx = np.where(active, Rx_loop, Rx)
+        active = active & (np.abs(SInc_loop - s) > 1.0e-10)
+        SInc = np.where(active, SInc_loop, SInc)
+    return Rx
+
+
+def salds(rtx, delt, out=None, ws=None):
     """Calculates Salinity differential (:math:`\frac{dS}{d(\sqrt{Rt})}`) at
     constant temperature.
 
@@ -132,6 +184,10 @@ def salds(rtx, delt):
           :math:`\sqrt{rt}`
     delt : array_like
            t-15 [:math:`^\circ` C (IPTS-68)]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -158,19 +214,21 @@ def salds(rtx, delt):
     Modifications: 93-04-21. Phil Morgan.
     """
 
-    rtx, delt = map(np.asanyarray, (rtx, delt))
+    rtx, delt = map(_asarray, (rtx, delt))
 
-    ds = (a[1] +
-          (2 * a[2] + (3 * a[3] + (4 * a[4] + 5 * a[5] * rtx) * rtx) * rtx) *
-          rtx + (delt / (1 + k * delt)) *
-          (b[1] +
-           (2 * b[2] + (3 * b[3] + (4 * b[4] + 5 * b[5] * rtx) * rtx) * rtx) *
-           rtx))
+    b_ds = _out(out, (rtx, delt), ws, 'salds')
+    b1, b2 = _work(2, (rtx, delt), ws, 'salds')
+    ds = _horner(rtx, (a[1], 2 * a[2], 3 * a[3], 4 * a[4], 5 * a[5]), b_ds)
+    w = np.divide(delt, np.add(np.multiply(delt, k, out=b1), 1, out=b1),
+                  out=b1)
+    w = np.multiply(w, _horner(rtx, (b[1], 2 * b[2], 3 * b[3], 4 * b[4],
+                                     5 * b[5]), b2), out=b1)
+    ds = np.add(ds, w, out=b_ds)
 
-    return ds
+    return _finish(ds, out)
 
 
-def salrp(r, t, p):
+def salrp(r, t, p, out=None, ws=None):
     """Equation for Rp used in calculating salinity. UNESCO 1983 polynomial.
 
     .. math::
@@ -185,6 +243,10 @@ def salrp(r, t, p):
         temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -211,18 +273,36 @@ def salrp(r, t, p):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    r, t, p = map(np.asanyarray, (r, t, p))
+    r, t, p = map(_asarray, (r, t, p))
 
-    # Eqn(4) p.8 UNESCO.
-    T68 = T68conv(t)
-
-    rp = (1 + (p * (e[0] + e[1] * p + e[2] * p ** 2)) /
-          (1 + d[0] * T68 + d[1] * T68 ** 2 + (d[2] + d[3] * T68) * r))
+    b_rp = _out(out, (r, t, p), ws, 'salrp')
+    b_T68, b1, b2 = _work(3, (r, t, p), ws, 'salrp')
+    T68 = T68conv(t, out=b_T68)
+    return _finish(_salrp(r, T68, p, (b_rp, b1, b2)), out)
 
-    return rp
 
+def _salrp(r, T68, p, work=(None,) * 3):
+    """Rp kernel for temperature in IPTS-68.  Writes into the 3 `work`
+    arrays, the first one holds the result."""
 
-def salrt(t):
+    b_rp, b1, b2 = work
+    # Eqn(4) p.8 UNESCO.
+    # 1 + p * (e0 + e1 * p + e2 * p**2) /
+    #     (1 + d0 * T68 + d1 * T68**2 + (d2 + d3 * T68) * r)
+    w = np.add(np.multiply(p, e[1], out=b1), e[0], out=b1)
+    w = np.add(w, np.multiply(_square(p, out=b2), e[2], out=b2),
+               out=b1)
+    num = np.multiply(p, w, out=b1)
+    rp = np.add(np.multiply(T68, d[0], out=b_rp), 1, out=b_rp)
+    w = np.multiply(_square(T68, out=b2), d[1], out=b2)
+    rp = np.add(rp, w, out=b_rp)
+    w = np.add(np.multiply(T68, d[3], out=b2), d[2], out=b2)
+    rp = np.add(rp, np.multiply(w, r, out=b2), out=b_rp)
+    rp = np.divide(num, rp, out=b_rp)
+    return np.add(rp, 1, out=b_rp)
+
+
+def salrt(t, out=None, ws=None):
     """Equation for rt used in calculating salinity. UNESCO 1983 polynomial.
 
     .. math::
@@ -233,6 +313,10 @@ def salrt(t):
     ----------
       t : array_like
           temperature [:math:`^\circ` C (ITS-90)]
+      out : ndarray, optional
+            array in which to place the result.
+      ws : Workspace, optional
+           reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -258,13 +342,21 @@ def salrt(t):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    t = np.asanyarray(t)
-    T68 = T68conv(t)
+    t = _asarray(t)
+
+    b_rt = _out(out, (t,), ws, 'salrt')
+    b_T68, = _work(1, (t,), ws, 'salrt')
+    T68 = T68conv(t, out=b_T68)
+    return _finish(_salrt(T68, b_rt), out)
+
+
+def _salrt(T68, out=None):
+    """rt kernel for temperature in IPTS-68."""
     # Eqn (3) p.7 UNESCO.
-    return c[0] + (c[1] + (c[2] + (c[3] + c[4] * T68) * T68) * T68) * T68
+    return _horner(T68, c, out)
 
 
-def seck(s, t, p=0):
+def seck(s, t, p=0, out=None, ws=None):
     """Secant Bulk Modulus (K) of Sea Water using Equation of state 1980.
     UNESCO polynomial implementation.
 
@@ -276,6 +368,10 @@ def seck(s, t, p=0):
            temperature [:math:`^\circ` C (ITS-90)]
     p : array_like
         pressure [db].
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -309,42 +405,71 @@ def seck(s, t, p=0):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    s, t, p = map(np.asanyarray, (s, t, p))
+    s, t, p = map(_asarray, (s, t, p))
+
+    kernel = _kernel('seck', (s, t, p))
+    if kernel is not None:
+        y = kernel(s, t, p, out=_out(out, (s, t, p), ws, 'seck'))
+        return _finish(y, out)
 
+    b_K = _out(out, (s, t, p), ws, 'seck')
+    b_p, b_T68, b_s_sqrt, b1, b2, b3 = _work(6, (s, t, p), ws, 'seck')
     # Compute compression terms.
-    p = p / 10.0  # Convert from db to atmospheric pressure units.
-    T68 = T68conv(t)
+    p = np.divide(p, 10.0, out=b_p)  # Convert from db to atmospheric units.
+    T68 = T68conv(t, out=b_T68)
+    s_sqrt = _sqrt(s, out=b_s_sqrt)
+    return _finish(_seck(s, T68, p, s_sqrt, (b_K, b1, b2, b3)), out)
+
+
+def _seck(s, T68, p, s_sqrt, work=(None,) * 4):
+    """Secant bulk modulus kernel.  Takes temperature already in IPTS-68,
+    pressure in bars and the square root of the salinity so that callers
+    evaluating several properties at once can share them.  Writes into the
+    4 `work` arrays, the first one holds the result."""
+
+    b_K, b_A, b_B, b1 = work
 
     # Pure water terms of the secant bulk modulus at atmos pressure.
     # UNESCO Eqn 19 p 18.
     # h0 = -0.1194975
     h = [3.239908, 1.43713e-3, 1.16092e-4, -5.77905e-7]
-    AW = h[0] + (h[1] + (h[2] + h[3] * T68) * T68) * T68
 
     # k0 = 3.47718e-5
     k = [8.50935e-5, -6.12293e-6, 5.2787e-8]
-    BW = k[0] + (k[1] + k[2] * T68) * T68
 
     # e0 = -1930.06
     e = [19652.21, 148.4206, -2.327105, 1.360477e-2, -5.155288e-5]
-    KW = e[0] + (e[1] + (e[2] + (e[3] + e[4] * T68) * T68) * T68) * T68
 
     # Sea water terms of secant bulk modulus at atmos. pressure.
     j0 = 1.91075e-4
     i = [2.2838e-3, -1.0981e-5, -1.6078e-6]
-    A = AW + (i[0] + (i[1] + i[2] * T68) * T68 + j0 * s ** 0.5) * s
 
     m = [-9.9348e-7, 2.0816e-8, 9.1697e-10]
-    B = BW + (m[0] + (m[1] + m[2] * T68) * T68) * s  # Eqn 18.
 
     f = [54.6746, -0.603459, 1.09987e-2, -6.1670e-5]
     g = [7.944e-2, 1.6483e-2, -5.3009e-4]
-    K0 = (KW + (f[0] + (f[1] + (f[2] + f[3] * T68) * T68) * T68 +
-                (g[0] + (g[1] + g[2] * T68) * T68) * s ** 0.5) * s)  # Eqn 16.
-    return K0 + (A + B * p) * p  # Eqn 15.
 
+    # K0 = KW + (f + g * s**0.5) * s.  Eqn 16.
+    K0 = _horner(T68, e, b_K)
+    w = np.multiply(_horner(T68, g, b_A), s_sqrt, out=b_A)
+    w = np.multiply(np.add(_horner(T68, f, b1), w, out=b1), s, out=b1)
+    K0 = np.add(K0, w, out=b_K)
+
+    # A = AW + (i + j0 * s**0.5) * s.
+    w = np.add(_horner(T68, i, b1), np.multiply(s_sqrt, j0, out=b_B),
+               out=b1)
+    A = np.add(_horner(T68, h, b_A), np.multiply(w, s, out=b1), out=b_A)
+
+    # B = BW + m * s.  Eqn 18.
+    w = np.multiply(_horner(T68, m, b1), s, out=b1)
+    B = np.add(_horner(T68, k, b_B), w, out=b_B)
+
+    # K0 + (A + B * p) * p.  Eqn 15.
+    w = np.add(A, np.multiply(B, p, out=b_B), out=b_A)
+    return np.add(K0, np.multiply(w, p, out=b_A), out=b_K)
 
-def sals(rt, t):
+
+def sals(rt, t, out=None, ws=None):
     """Salinity of sea water as a function of Rt and T.
     UNESCO 1983 polynomial.
 
@@ -354,6 +479,10 @@ def sals(rt, t):
          :math:`rt(s,t) = \frac{C(s,t,0)}{C(35, t(\textrm{IPTS-68}), 0)}`
     t : array_like
         temperature [:math:`^\circ` C (ITS-90)]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -380,29 +509,43 @@ def sals(rt, t):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    rt, t = map(np.asanyarray, (rt, t))
+    rt, t = map(_asarray, (rt, t))
+
+    b_s = _out(out, (rt, t), ws, 'sals')
+    b_T68, b1, b2 = _work(3, (rt, t), ws, 'sals')
+    T68 = T68conv(t, out=b_T68)
+    return _finish(_sals(rt, T68, (b_s, b_T68, b1, b2)), out)
 
-    # Eqn (1) & (2) p6,7 UNESCO.
-    del_T68 = T68conv(t) - 15
 
-    Rtx = (rt) ** 0.5
-    del_S = ((del_T68 / (1 + k * del_T68)) *
-             (b[0] + (b[1] + (b[2] + (b[3] + (b[4] + b[5] * Rtx) *
-                                      Rtx) * Rtx) * Rtx) * Rtx))
-    s = a[0] + (a[1] + (a[2] + (a[3] + (a[4] + a[5] * Rtx) *
-                                Rtx) * Rtx) * Rtx) * Rtx
-    s += del_S
+def _sals(rt, T68, work=(None,) * 4):
+    """Salinity kernel for temperature in IPTS-68.  Writes into the 4 `work`
+    arrays, the first one holds the result.  The second one can be the one
+    holding `T68`."""
 
-    return s
+    b_s, b_del_T68, b1, b2 = work
+    # Eqn (1) & (2) p6,7 UNESCO.
+    del_T68 = np.subtract(T68, 15, out=b_del_T68)
+
+    Rtx = _sqrt(rt, out=b1)
+    # del_S = (del_T68 / (1 + k * del_T68)) * b.
+    w = np.add(np.multiply(del_T68, k, out=b2), 1, out=b2)
+    w = np.divide(del_T68, w, out=b2)
+    del_S = np.multiply(w, _horner(Rtx, b, b_del_T68), out=b2)
+    s = _horner(Rtx, a, b_s)
+    return np.add(s, del_S, out=b_s)
 
 
-def smow(t):
+def smow(t, out=None, ws=None):
     """Density of Standard Mean Ocean Water (Pure Water) using EOS 1980.
 
     Parameters
     ----------
     t : array_like
         temperature [:math:`^\circ` C (ITS-90)]
+    out : ndarray, optional
+          array in which to place the result.
+    ws : Workspace, optional
+         reusable work arrays for the temporary results.
 
     Returns
     -------
@@ -434,17 +577,22 @@ def smow(t):
                    03-12-12. Lindsay Pender, Converted to ITS-90.
     """
 
-    t = np.asanyarray(t)
+    t = _asarray(t)
+
+    b_dens = _out(out, (t,), ws, 'smow')
+    b_T68, = _work(1, (t,), ws, 'smow')
+    return _finish(_smow(T68conv(t, out=b_T68), b_dens), out)
 
+
+def _smow(T68, out=None):
+    """Pure water density kernel for temperature in IPTS-68."""
     a = (999.842594, 6.793952e-2, -9.095290e-3, 1.001685e-4, -1.120083e-6,
          6.536332e-9)
 
-    T68 = T68conv(t)
-    return (a[0] + (a[1] + (a[2] + (a[3] + (a[4] + a[5] * T68) * T68) * T68) *
-            T68) * T68)
+    return _horner(T68, a, out)
 
 
-def T68conv(T90):
+def T68conv(T90, out=None):
     """Convert ITS-90 temperature to IPTS-68
 
     :math:`T68  = T90 * 1.00024`
@@ -453,6 +601,8 @@ def T68conv(T90):
     ----------
     t : array_like
            temperature [:math:`^\circ` C (ITS-90)]
+    out : ndarray, optional
+          array in which to place the result.
 
     Returns
     -------
@@ -478,11 +628,11 @@ def T68conv(T90):
     ITS-90. WOCE Newsletter, No. 10, WOCE International Project Office,
     Southampton, United Kingdom, 10.
     """
-    T90 = np.asanyarray(T90)
-    return T90 * 1.00024
+    T90 = _asarray(T90)
+    return np.multiply(T90, 1.00024, out=out)
 
 
-def T90conv(t, t_type='T68'):
+def T90conv(t, t_type='T68', out=None):
     """Convert IPTS-68 or IPTS-48 to temperature to ITS-90.
 
     T48 apply to all data collected prior to 31/12/1967.
@@ -499,6 +649,8 @@ def T90conv(t, t_type='T68'):
            temperature [:math:`^\circ` C (IPTS-68) or (IPTS-48)]
     t_type : string, optional
             'T68' (default) or 'T48'
+    out : ndarray, optional
+          array in which to place the result.
 
     Returns
     -------
@@ -530,24 +682,198 @@ def T90conv(t, t_type='T68'):
     note, available from http://www.ices.dk/ocean/procedures/its.htm
     """
 
-    t = np.asanyarray(t)
+    t = _asarray(t)
 
     if t_type == 'T68':
-        T90 = t / 1.00024
+        T90 = np.divide(t, 1.00024, out=out)
     elif t_type == 'T48':
-        T90 = (t - 4.4e-6 * t * (100 - t)) / 1.00024
+        T90 = np.divide(t - 4.4e-6 * t * (100 - t), 1.00024, out=out)
     else:
         raise NameError("Unrecognized temperature type.  Try 'T68'' or 'T48'")
 
     return T90
 
 
+class Workspace(object):
+    """Reusable work arrays for the temporary results.
+
+    Passing the same workspace to repeated calls, together with an `out`
+    array for the result, avoids allocating new arrays once the workspace
+    has warmed up.  The work arrays are kept per function, shape and dtype
+    and never hold the returned results.  When `max_bytes` is set the least
+    recently used arrays are dropped once their total size goes above it,
+    e.g.: for calls with many different shapes.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+                upper bound for the size of the work arrays [bytes], default
+                unbounded.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> ws = sw.Workspace()
+    >>> s, t, p = np.array([35.]), np.array([10.]), np.array([1000.])
+    >>> rho = np.empty(1)
+    >>> sw.dens(s, t, p, out=rho, ws=ws)
+    array([ 1031.43006548])
+    >>> ws.nbytes > 0
+    True
+    >>> ws.clear()
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self._arrays = OrderedDict()
+        self._nbytes = 0
+
+    def get(self, key, n, shape, dtype):
+        """Returns `n` work arrays for `key` with `shape` and `dtype`."""
+        arrays = self._arrays.pop((key, shape, dtype), None)
+        if arrays is None or len(arrays) < n:
+            if arrays is not None:
+                self._nbytes -= sum(arr.nbytes for arr in arrays)
+            arrays = [np.empty(shape, dtype) for _ in range(n)]
+            self._nbytes += sum(arr.nbytes for arr in arrays)
+        # Most recently used go to the end.
+        self._arrays[(key, shape, dtype)] = arrays
+        self._evict()
+        return arrays[:n]
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        # Never drop the arrays that were just asked for.
+        while self._nbytes > self.max_bytes and len(self._arrays) > 1:
+            _, arrays = self._arrays.popitem(last=False)
+            self._nbytes -= sum(arr.nbytes for arr in arrays)
+
+    @property
+    def nbytes(self):
+        """Total size of the work arrays [bytes]."""
+        return self._nbytes
+
+    def clear(self):
+        """Release all the work arrays."""
+        self._arrays.clear()
+        self._nbytes = 0
+
+
+def _plain(args):
+    """True when all `args` are plain ndarrays."""
+    return not [arg for arg in args if type(arg) is not np.ndarray]
+
+
+def _buffered(args):
+    """True when the kernels may write into work arrays for `args`.  That
+    needs plain ndarrays and, in the 'promote' mode, no float32 or float16
+    arguments: those are left to the NumPy casting rules step by step, as in
+    the original expressions, where the float64 coefficients and scalars may
+    or may not promote them depending on the NumPy version."""
+    if not _plain(args):
+        return False
+    return _preserve() or not [arg for arg in args if arg.dtype.kind == 'f'
+                               and arg.dtype.itemsize < 8]
+
+
+def _duck(x):
+    """True for duck arrays, e.g.: dask arrays, that implement the NumPy
+    array function protocol without being ndarrays."""
+    return not isinstance(x, np.ndarray) and hasattr(x, '__array_function__')
+
+
+def _asarray(x):
+    """Same as np.asanyarray, but duck arrays are returned untouched.  Their
+    own `__array_ufunc__` and `__array_function__` then carry out the
+    computation, lazily for chunked arrays, instead of loading them whole in
+    memory."""
+    return x if _duck(x) else np.asanyarray(x)
+
+
+def _work(n, args, ws=None, key=None):
+    """Work arrays for the kernels.  Returns `n` arrays with the broadcast
+    shape and dtype of `args`, taken from the workspace `ws` when given, or
+    `n` Nones when `_buffered` is False.  The kernels write every step into
+    the work arrays and fall back to allocating a new array per step when
+    they are None, so ndarray subclasses keep their own arithmetic."""
+    if not _buffered(args):
+        return [None] * n
+    shape = np.broadcast(*args).shape
+    dtype = _result_type(args)
+    if ws is None:
+        return [np.empty(shape, dtype) for _ in range(n)]
+    return ws.get(key, n, shape, dtype)
+
+
+def _out(out, args, ws=None, key=None):
+    """Array where the kernels accumulate the result.  That is `out` itself
+    when it is safe to write into it before the end of the computation, a
+    new array or a work array otherwise.  Must be followed by `_finish`."""
+    if not _buffered(args):
+        return None
+    shape = np.broadcast(*args).shape
+    dtype = _result_type(args)
+    if out is not None:
+        if (out.shape == shape and out.dtype == dtype and
+                not [arg for arg in args if np.may_share_memory(out, arg)]):
+            return out
+        if ws is not None:
+            return ws.get(key + '.out', 1, shape, dtype)[0]
+    return np.empty(shape, dtype)
+
+
+def _sqrt(x, out=None):
+    """Square root into `out`.  Falls back to `x ** 0.5` without it, like the
+    original code, so ndarray subclasses keep their own power.  Duck arrays
+    get `np.sqrt`, which is what `** 0.5` does for ndarrays."""
+    if out is None and not _duck(x):
+        return x ** 0.5
+    return np.sqrt(x, out=out)
+
+
+def _square(x, out=None):
+    """Same as `_sqrt` for `x ** 2`."""
+    if out is None and not _duck(x):
+        return x ** 2
+    return np.multiply(x, x, out=out)
+
+
+def _finish(y, out):
+    """Copies the result into `out` when needed.  Otherwise unwraps 0-d
+    results, the same way NumPy arithmetic does."""
+    if out is not None:
+        if y is not out:
+            out[...] = y
+        return out
+    if type(y) is np.ndarray and y.ndim == 0:
+        return y[()]
+    return y
+
+
+def _horner(x, coefs, out=None):
+    """Evaluates coefs[0] + (coefs[1] + (... + coefs[-1] * x) * x) * x with
+    the same sequence of operations as the written out polynomial, writing
+    every step into `out` when given.  In the 'preserve' dtype mode the
+    coefficients are cast to the dtype of the result first."""
+    if _preserve():
+        dtype = out.dtype if out is not None else getattr(x, 'dtype', None)
+        if dtype is not None and dtype.kind == 'f':
+            coefs = [dtype.type(coef) for coef in coefs]
+    y = np.multiply(x, coefs[-1], out=out)
+    for coef in coefs[-2:0:-1]:
+        y = np.add(y, coef, out=out)
+        y = np.multiply(y, x, out=out)
+    return np.add(y, coefs[0], out=out)
+
+
 def atleast_2d(*arys):
     """Same as numpy atleast_2d, but with the single dimension last,
     instead of first."""
     res = []
     for ary in arys:
-        ary = np.asanyarray(ary)
+        ary = _asarray(ary)
         if len(ary.shape) == 0:
             result = ary.reshape(1, 1)
         elif len(ary.shape) == 1:
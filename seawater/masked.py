@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# masked.py
+#
+# purpose:  Evaluation on the valid cells only of masked or NaN filled grids.
+#
+# obs:  The valid cells are gathered into compact contiguous arrays, the
+# function runs on those and the results are scattered back into the grid
+# layout.  Masked arrays are taken apart into `.data` and `.mask`, so the
+# computation runs on plain ndarrays.
+#
+
+from __future__ import division
+
+import numpy as np
+
+from .stream import _whole
+
+__all__ = ['MaskIndex',
+           'run',
+           'wrap']
+
+
+class MaskIndex(object):
+    """Positions of the valid cells of a fixed mask, e.g.: the land mask of
+    a model grid, computed once and reused by `run` for every field on the
+    same grid.
+
+    Parameters
+    ----------
+    mask : array_like of bool
+           True for the cells that are not computed (land or missing), the
+           same convention as `numpy.ma`.
+    shape : tuple, optional
+            shape of the fields, when larger than the mask, e.g.: a 2D land
+            mask for (depth, lat, lon) fields.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> land = np.array([[True, False], [False, False]])
+    >>> index = sw.masked.MaskIndex(land)
+    >>> index.size
+    3
+    >>> s, t, p = np.full((2, 2), 35.), np.full((2, 2), 10.), 1000.
+    >>> sw.masked.run(sw.dens, (s, t, p), index=index)
+    array([[            nan,  1031.43006548],
+           [ 1031.43006548,  1031.43006548]])
+    """
+
+    def __init__(self, mask, shape=None):
+        mask = np.asarray(mask, dtype=bool)
+        if shape is not None:
+            mask = np.broadcast_to(mask, shape)
+        self.mask = mask
+        self.shape = mask.shape
+        self.flat = np.flatnonzero(~mask)
+        self.index = np.unravel_index(self.flat, mask.shape)
+
+    @property
+    def size(self):
+        """Number of valid cells."""
+        return self.flat.size
+
+    @classmethod
+    def from_args(cls, args, mask=None):
+        """Index of the cells where `mask` is False, none of the masked
+        arrays in `args` is masked and no input is NaN."""
+        shape = np.broadcast(*args).shape
+        valid = np.ones(shape, bool)
+        if mask is not None:
+            valid &= ~np.asarray(mask, dtype=bool)
+        for arg in args:
+            if isinstance(arg, np.ma.MaskedArray):
+                valid &= ~np.ma.getmaskarray(arg)
+            data = np.ma.getdata(arg)
+            if data.dtype.kind in 'fc':
+                valid &= ~np.isnan(data)
+        return cls(~valid)
+
+
+def _gather(arg, index):
+    """Valid cells of `arg` in a contiguous 1D array, numbers are passed
+    through."""
+    data = np.ma.getdata(arg)
+    if data.ndim == 0:
+        return data
+    if data.shape == index.shape and data.flags.c_contiguous:
+        return np.take(data.reshape(-1), index.flat)
+    return np.broadcast_to(data, index.shape)[index.index]
+
+
+def _grid_kwargs(kwargs, shape):
+    """The numeric array keyword arguments, which must broadcast to the
+    `shape` of the inputs."""
+    arrays = dict()
+    for key, value in kwargs.items():
+        arr = np.asanyarray(value)
+        if arr.ndim == 0 or arr.dtype.kind not in 'biufc':
+            continue
+        try:
+            np.broadcast_to(arr, shape)
+        except ValueError:
+            raise ValueError("%s of shape %r does not broadcast to the inputs "
+                             "of shape %r." % (key, arr.shape, shape))
+        arrays[key] = arr
+    return arrays
+
+
+def _scatter(res, index, out, fill_value):
+    """Puts the compact `res` back into the grid layout."""
+    if isinstance(res, tuple):
+        outs = (None,) * len(res) if out is None else out
+        return tuple(_scatter(r, index, o, fill_value) for r, o in
+                     zip(res, outs))
+    res = np.asanyarray(res)
+    if out is None:
+        out = np.empty(index.shape, res.dtype)
+    out[...] = fill_value
+    if out.flags.c_contiguous:
+        out.reshape(-1)[index.flat] = res
+    else:
+        out[index.index] = res
+    return out
+
+
+def _remask(res, mask):
+    if isinstance(res, tuple):
+        return tuple(_remask(r, mask) for r in res)
+    return np.ma.MaskedArray(res, mask=mask)
+
+
+def run(func, args, mask=None, index=None, out=None, fill_value=np.NaN,
+        **kwargs):
+    """Evaluates `func(*args, **kwargs)` on the valid cells only.
+
+    The valid cells are gathered into compact arrays, `func` runs on those
+    and the results are scattered back, with `fill_value` in the other
+    cells.  Masked arrays are split into `.data` and `.mask`, and give a
+    masked result.
+
+    Parameters
+    ----------
+    func : callable
+           any elementwise seawater function, e.g.: `dens`, `ptmp` or
+           `svel`.
+    args : tuple
+           positional arguments of `func`, arrays, masked arrays or
+           numbers.  Arrays are broadcast against each other.
+    mask : array_like of bool, optional
+           True for the cells that are not computed.  Cells masked in any
+           masked array of `args` or NaN in any input are not computed
+           either.
+    index : MaskIndex, optional
+            precomputed valid cells for the broadcast shape of `args`, used
+            instead of `mask`, the masks and the NaN check.
+    out : ndarray or tuple, optional
+          array(s) where the result is written, in the grid layout.
+    fill_value : number, optional
+                 value of the cells that are not computed, default NaN.
+    kwargs : optional
+             keyword arguments for `func`, e.g.: pr=1000 for `ptmp` or a
+             `Workspace` as ws, reused across calls for a fixed `index`.
+             Numeric arrays, e.g.: a reference pressure per cell, are
+             gathered like `args` and must broadcast to their shape.
+
+    Returns
+    -------
+    out : array_like or tuple
+          same shape as `func(*args, **kwargs)`, a masked array when any of
+          `args` is one.
+
+    Notes
+    -----
+    `bfrq`, `gpan`, `gvel` and `dist` work along the first axis and are not
+    supported.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> s = np.ma.masked_array([35., 35., 35.], mask=[False, True, False])
+    >>> c = sw.masked.run(sw.svel, (s, [10., 10., 10.], [0., 0., 1000.]))
+    >>> c.mask
+    array([False,  True, False], dtype=bool)
+    """
+    if func.__name__ in _whole:
+        raise ValueError("%s works along the first axis, it cannot be "
+                         "compacted." % func.__name__)
+    args = tuple(np.asanyarray(arg) for arg in args)
+    shape = np.broadcast(*args).shape
+    arrays = _grid_kwargs(kwargs, shape)
+    if index is None:
+        index = MaskIndex.from_args(args + tuple(arrays.values()), mask)
+    elif index.shape != shape:
+        raise ValueError("Index of shape %r for inputs of shape %r." %
+                         (index.shape, shape))
+
+    kwargs = dict(kwargs)
+    kwargs.update((key, _gather(arr, index)) for key, arr in arrays.items())
+    res = func(*[_gather(arg, index) for arg in args], **kwargs)
+    res = _scatter(res, index, out, fill_value)
+    if [arg for arg in args + tuple(arrays.values()) if
+            isinstance(arg, np.ma.MaskedArray)]:
+        # The index mask may be a read-only broadcast view.
+        return _remask(res, index.mask.copy())
+    return res
+
+
+def wrap(func, mask=None, index=None, fill_value=np.NaN):
+    """Same as `func`, evaluated on the valid cells only, see `run`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> dens = sw.masked.wrap(sw.dens)
+    >>> dens([35., np.NaN], [10., 10.], [0., 0.])
+    array([ 1026.95200048,             nan])
+    """
+
+    def compacted(*args, **kwargs):
+        return run(func, args, mask=mask, index=index,
+                   fill_value=fill_value, **kwargs)
+
+    compacted.__name__ = getattr(func, '__name__', 'compacted')
+    compacted.__doc__ = getattr(func, '__doc__', None)
+    return compacted
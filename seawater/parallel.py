@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# parallel.py
+#
+# purpose:  Multi-threaded evaluation of large arrays.
+#
+# obs:  NumPy releases the GIL inside the ufuncs, so the chunks of a large
+# array run concurrently on a pool of threads.
+#
+
+from __future__ import division
+
+import threading
+from multiprocessing import cpu_count
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # Python 2 without the futures backport.
+    ThreadPoolExecutor = None
+
+import numpy as np
+
+from .library import Workspace, _plain
+from .stream import _accepts, _chunks, _whole
+
+__all__ = ['run',
+           'wrap']
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(workers):
+    """Thread pool with `workers` threads, kept for the next calls."""
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ThreadPoolExecutor(max_workers=workers)
+        return _pools[workers]
+
+
+def _workspace(local):
+    """Workspace of the current thread in `local`, a `threading.local`."""
+    try:
+        return local.ws
+    except AttributeError:
+        local.ws = Workspace()
+        return local.ws
+
+
+def _view(out, index):
+    if isinstance(out, tuple):
+        return tuple(o[index] for o in out)
+    return out[index]
+
+
+def _concatenate(parts, plain):
+    if isinstance(parts[0], tuple):
+        return tuple(_concatenate(p, plain) for p in zip(*parts))
+    if plain:
+        return np.concatenate(parts)
+    return np.ma.concatenate(parts)
+
+
+def run(func, args, workers=None, chunksize=None, out=None, **kwargs):
+    """Evaluates `func(*args, **kwargs)` splitting the inputs along their
+    leading axis and running the pieces on a pool of threads.
+
+    Parameters
+    ----------
+    func : callable
+           any elementwise seawater function, e.g.: `dens`, `ptmp` or
+           `svel`.
+    args : tuple
+           positional arguments of `func`.  Arrays are split along the
+           leading axis of their broadcast shape, arrays with fewer
+           dimensions and scalars are broadcast.
+    workers : int, optional
+              number of threads.  Default is the number of CPUs.
+    chunksize : int, optional
+                number of elements per piece.  Default splits the leading
+                axis in `workers` pieces.
+    out : array_like or tuple, optional
+          array(s) where the result is written, see `func`.
+    kwargs : optional
+             keyword arguments for `func`, e.g.: pr=1000 for `ptmp`.
+
+    Returns
+    -------
+    out : array_like or tuple
+          same values, shape and dtype as `func(*args, **kwargs)`.
+
+    Notes
+    -----
+    Each thread gets its own `Workspace` for the call.  Inputs with fewer
+    than two rows and Python without `concurrent.futures` (Python 2 without
+    the `futures` backport) fall back to a single call.  `bfrq`, `gpan`,
+    `gvel` and `dist` work along the first axis and are not supported.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> s, t, p = [35.] * 4, [10., 15., 20., 25.], [0., 1000., 2000., 3000.]
+    >>> sw.parallel.run(sw.dens, (s, t, p), workers=2)
+    array([ 1026.95200048,  1030.36469385,  1033.32340292,  1035.89858428])
+    """
+    if func.__name__ in _whole:
+        raise ValueError("%s works along the first axis, it cannot be "
+                         "split." % func.__name__)
+    args = tuple(np.asanyarray(arg) for arg in args)
+    if out is not None:
+        kwargs['out'] = out
+    shape = np.broadcast(*args).shape
+    workers = workers or cpu_count()
+    if (ThreadPoolExecutor is None or workers < 2 or len(shape) == 0 or
+            shape[0] < 2):
+        return func(*args, **kwargs)
+
+    rowsize = int(np.prod(shape[1:]))
+    if chunksize is None:
+        chunksize = -(-shape[0] // workers) * rowsize
+    chunksize = max(chunksize, rowsize)
+    use_ws = _accepts(func, 'ws') and 'ws' not in kwargs
+    # Released with the call.
+    local = threading.local()
+
+    def call(index, chunk):
+        kw = dict(kwargs)
+        if use_ws:
+            kw['ws'] = _workspace(local)
+        if out is not None:
+            kw['out'] = _view(out, index)
+        return func(*chunk, **kw)
+
+    futures = [_pool(workers).submit(call, index, chunk) for index, chunk in
+               _chunks(args, chunksize)]
+    parts = [future.result() for future in futures]  # In order.
+    if out is not None:
+        return out
+    if len(parts) == 1:
+        return parts[0]
+    return _concatenate(parts, _plain(args))
+
+
+def wrap(func, workers=None, chunksize=None):
+    """Multi-threaded version of `func`, with the same call signature, see
+    `run`.
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> ptmp = sw.parallel.wrap(sw.ptmp, workers=4)
+    >>> ptmp([35.] * 4, [10., 15., 20., 25.], [0., 1000., 2000., 3000.],
+    ...      pr=0)
+    array([ 10.        ,  14.84490133,  19.61793385,  24.32888709])
+    """
+    def parallel(*args, **kwargs):
+        return run(func, args, workers=workers, chunksize=chunksize,
+                   **kwargs)
+    parallel.__name__ = func.__name__
+    parallel.__doc__ = ("Multi-threaded version of `%s`, see "
+                        "`seawater.parallel.run`." % func.__name__)
+    return parallel
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#
+# profiling.py
+#
+# purpose:  Opt-in call counters and timers for the public functions.
+#
+# obs:  Setting the SEAWATER_PROFILE environment variable to anything but
+# '' or '0' enables the counters when seawater is imported.
+#
+
+from __future__ import division
+
+import functools
+import inspect
+import sys
+import threading
+from timeit import default_timer
+
+import numpy as np
+
+from . import ctd, eos80, extras, geostrophic, library
+
+__all__ = ['disable',
+           'enable',
+           'enabled',
+           'report',
+           'reset',
+           'stats']
+
+
+_modules = (eos80, extras, geostrophic, library, ctd)
+_originals = {}
+_stats = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _public():
+    """Public functions of the package, by name.  Classes, e.g.:
+    `Workspace`, are left alone so `isinstance` keeps working."""
+    package = sys.modules[__name__.rsplit('.', 1)[0]]
+    return dict((name, obj) for name, obj in vars(package).items() if
+                not name.startswith('_') and inspect.isfunction(obj) and
+                getattr(obj, '__module__', None) in
+                [module.__name__ for module in _modules])
+
+
+def _nbytes(res):
+    if isinstance(res, tuple):
+        return sum(_nbytes(r) for r in res)
+    return getattr(res, 'nbytes', 0)
+
+
+def _record(name, elapsed, elements, nbytes):
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = dict(calls=0, total=0., max=0.,
+                                        elements=0, nbytes=0)
+        entry['calls'] += 1
+        entry['total'] += elapsed
+        entry['max'] = max(entry['max'], elapsed)
+        entry['elements'] += elements
+        entry['nbytes'] += nbytes
+
+
+def _instrument(func):
+    """`func` recording its calls.  Calls made from inside another
+    instrumented function, e.g.: `dens` called by `pden`, are not recorded,
+    so the times add up to the time spent in seawater."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, 'busy', False):
+            return func(*args, **kwargs)
+        _local.busy = True
+        try:
+            start = default_timer()
+            res = func(*args, **kwargs)
+            elapsed = default_timer() - start
+        finally:
+            _local.busy = False
+        elements = max([np.size(arg) for arg in args] or [0])
+        _record(name, elapsed, elements, _nbytes(res))
+        return res
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def enable():
+    """Starts recording, per public function, the number of calls, the
+    total and maximum wall time, the number of input elements and the size
+    of the results.
+
+    The public functions are replaced by instrumented ones in the
+    `seawater` namespace and in the modules that define them, names
+    imported from seawater before `enable` keep the plain functions.  The
+    instrumentation costs a few microseconds per call, and nothing at all
+    once disabled, see benchmarks/bench_profiling.py.
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> sw.profiling.enable()
+    >>> rho = sw.dens([35., 35.], [10., 20.], [0., 1000.])
+    >>> pt = sw.ptmp([35., 35.], [10., 20.], [0., 1000.])
+    >>> stats = sw.profiling.stats()
+    >>> stats['dens']['calls'], stats['dens']['elements']
+    (1, 2)
+    >>> sorted(stats)
+    ['dens', 'ptmp']
+    >>> sw.profiling.disable()
+    >>> sw.profiling.reset()
+    """
+    if _originals:
+        return
+    package = sys.modules[__name__.rsplit('.', 1)[0]]
+    originals = _public()
+    wrappers = dict((name, _instrument(func)) for name, func in
+                    originals.items())
+    for module in _modules + (package,):
+        for name, func in originals.items():
+            if getattr(module, name, None) is func:
+                setattr(module, name, wrappers[name])
+    _originals.update(originals)
+
+
+def disable():
+    """Stops recording and restores the plain functions.  The statistics
+    are kept, see `reset`."""
+    if not _originals:
+        return
+    package = sys.modules[__name__.rsplit('.', 1)[0]]
+    for module in _modules + (package,):
+        for name, func in _originals.items():
+            if getattr(getattr(module, name, None), '__wrapped__',
+                       None) is func:
+                setattr(module, name, func)
+    _originals.clear()
+
+
+def enabled():
+    """True when recording."""
+    return bool(_originals)
+
+
+def reset():
+    """Clears the statistics."""
+    with _lock:
+        _stats.clear()
+
+
+def stats():
+    """Statistics recorded so far.
+
+    Returns
+    -------
+    stats : dict
+            for each function called, a dict with the number of `calls`,
+            the `total` and `max` wall time [s], the number of input
+            `elements` (the size of the largest argument, summed over the
+            calls) and `nbytes`, the size of the results [bytes].
+    """
+    with _lock:
+        return dict((name, dict(entry)) for name, entry in _stats.items())
+
+
+def report():
+    """The statistics as a table, by decreasing total time."""
+    lines = ['%10s %8s %11s %11s %11s %12s %10s' %
+             ('function', 'calls', 'total [s]', 'mean [s]', 'max [s]',
+              'elements', 'MB out')]
+    entries = sorted(stats().items(), key=lambda item: -item[1]['total'])
+    for name, entry in entries:
+        lines.append('%10s %8d %11.6f %11.6f %11.6f %12d %10.1f' %
+                     (name, entry['calls'], entry['total'],
+                      entry['total'] / entry['calls'], entry['max'],
+                      entry['elements'], entry['nbytes'] / 2. ** 20))
+    return '\n'.join(lines)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# ragged.py
+#
+# purpose:  Variable length profiles packed without padding.
+#
+# obs:
+#
+
+from __future__ import division
+
+import numpy as np
+
+__all__ = ['Ragged']
+
+
+class Ragged(object):
+    """Collection of profiles of different lengths, packed one after the
+    other in a flat `values` array.  Profile `i` is
+    ``values[offsets[i]:offsets[i + 1]]``, surface first.
+
+    `gpan`, `bfrq` and `gvel` accept Ragged inputs and return Ragged
+    results.  The vertical operations (`diff`, `mid` and `cumsum`) never
+    cross the profile boundaries.  Element-wise functions work on `values`
+    directly, see `like`.
+
+    Parameters
+    ----------
+    values : array_like
+             values of all the profiles, one after the other.
+    offsets : array_like
+              start of each profile in `values`, followed by the total
+              length.
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> s = sw.Ragged.from_profiles([[35, 35, 35], [35, 35]])
+    >>> t = s.like([15., 10., 5., 15., 10.])
+    >>> p = s.like([0., 500., 1000., 0., 500.])
+    >>> s.lengths
+    array([3, 2])
+    >>> sw.gpan(s, t, p)[1]
+    array([ 0.        ,  8.05825445])
+    """
+
+    def __init__(self, values, offsets):
+        self.values = np.asanyarray(values)
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        if (self.offsets.ndim != 1 or self.offsets.size == 0 or
+                self.offsets[0] != 0 or
+                self.offsets[-1] != self.values.shape[0] or
+                (np.diff(self.offsets) < 0).any()):
+            raise ValueError("offsets must increase from 0 to the length "
+                             "of values.")
+
+    @classmethod
+    def from_profiles(cls, profiles):
+        """Packs a sequence of 1D profiles."""
+        profiles = [np.asanyarray(profile) for profile in profiles]
+        lengths = [profile.shape[0] for profile in profiles]
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        values = (np.concatenate(profiles) if profiles else np.empty(0))
+        return cls(values, offsets)
+
+    @classmethod
+    def from_padded(cls, padded):
+        """Packs the columns of a (levels x stations) array padded at the
+        bottom with NaN, e.g.: the inputs of `gpan`."""
+        padded = np.asanyarray(padded)
+        lengths = (~np.isnan(padded)).sum(axis=0)
+        return cls.from_profiles([padded[:n, k] for k, n in
+                                  enumerate(lengths)])
+
+    def to_padded(self, fill_value=np.NaN):
+        """Unpacks into a (levels x stations) array, padded at the bottom
+        with `fill_value`."""
+        depth = self.lengths.max() if len(self) else 0
+        padded = np.empty((depth, len(self)),
+                          np.result_type(self.values, fill_value))
+        padded[...] = fill_value
+        padded[self.levels, self.profile] = self.values
+        return padded
+
+    def like(self, values):
+        """`values` with the same layout as this collection."""
+        return Ragged(values, self.offsets)
+
+    @property
+    def lengths(self):
+        """Number of levels of each profile."""
+        return np.diff(self.offsets)
+
+    @property
+    def profile(self):
+        """Index of the profile of every value."""
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    @property
+    def levels(self):
+        """Index of every value in its profile, 0 at the surface."""
+        return np.arange(self.values.shape[0]) - self.offsets[self.profile]
+
+    def __len__(self):
+        return self.offsets.size - 1
+
+    def __getitem__(self, i):
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def __repr__(self):
+        return 'Ragged(%r, %r)' % (self.values, self.offsets)
+
+    def _pairs(self):
+        """Indices of the upper and lower value of every pair of adjacent
+        levels inside the profiles, and the offsets of the pairs."""
+        lengths = np.maximum(self.lengths - 1, 0)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        lo = np.ones(self.values.shape[0], bool)
+        lo[self.offsets[:-1][self.lengths > 0]] = False
+        lo = np.flatnonzero(lo)
+        return lo - 1, lo, offsets
+
+    def diff(self):
+        """Differences between adjacent levels, one level less per
+        profile."""
+        up, lo, offsets = self._pairs()
+        return Ragged(self.values[lo] - self.values[up], offsets)
+
+    def mid(self):
+        """Averages of adjacent levels, one level less per profile."""
+        up, lo, offsets = self._pairs()
+        return Ragged((self.values[up] + self.values[lo]) / 2., offsets)
+
+    def cumsum(self):
+        """Cumulative sum from the surface of each profile.  The terms are
+        added in the same order as `np.cumsum` on the padded array."""
+        return self.like(_cumsum(self.values, self.offsets))
+
+
+def _cumsum(values, offsets):
+    """Cumulative sum along the first axis restarting at the `offsets`.  One
+    vectorized step per level, over the profiles that are that deep."""
+    res = np.array(values, copy=True)
+    # Deepest profiles first, those deeper than `k` are then the first ones.
+    lengths = np.diff(offsets)
+    order = np.argsort(-lengths, kind='mergesort')
+    starts, lengths = offsets[:-1][order], lengths[order]
+    for k in range(1, lengths[0] if lengths.size else 0):
+        n = np.searchsorted(-lengths, -k, side='left')
+        idx = starts[:n] + k
+        res[idx] = res[idx - 1] + res[idx]
+    return res
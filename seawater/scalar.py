@@ -0,0 +1,532 @@
+# -*- coding: utf-8 -*-
+#
+# scalar.py
+#
+# purpose:  Pure Python versions of the routines for single values.
+#
+# obs:  Every function takes and returns Python floats and uses only the
+# math module, so this module works without NumPy.  The operations are
+# carried in the same order as in the array code: the polynomials give the
+# same bits and the functions built on exp, log, tanh or cos agree to
+# round-off.  Meant for callers that evaluate one scan at a time, where the
+# per call overhead of the array code dominates.
+#
+
+"""Pure Python versions of the EOS-80, library and extras routines for single
+values.
+
+Examples
+--------
+>>> from seawater import scalar
+>>> scalar.dens(35., 10., 1000.)
+1031.430065478789
+>>> scalar.ptmp(35., 10., 1000.)
+9.879275514304565
+"""
+
+from __future__ import division
+
+import math
+
+from .constants import DEG2NM, NM2KM, OMEGA, Kelvin, deg2rad, earth_radius
+from .constants import gdef, rad2deg
+
+__all__ = ['adtg',
+           'alpha',
+           'aonb',
+           'beta',
+           'cndr',
+           'cp',
+           'dens0',
+           'dens',
+           'dist',
+           'dpth',
+           'f',
+           'fp',
+           'g',
+           'pden',
+           'pres',
+           'ptmp',
+           'salds',
+           'salrp',
+           'salrt',
+           'sals',
+           'salt',
+           'satAr',
+           'satN2',
+           'satO2',
+           'seck',
+           'smow',
+           'svan',
+           'svel',
+           'swvel',
+           'temp',
+           'T68conv',
+           'T90conv']
+
+
+nan = float('nan')
+
+# Same constants as in library.py.
+_a = (0.0080, -0.1692, 25.3851, 14.0941, -7.0261, 2.7081)
+_b = (0.0005, -0.0056, -0.0066, -0.0375, 0.0636, -0.0144)
+_c = (0.6766097, 2.00564e-2, 1.104259e-4, -6.9698e-7, 1.0031e-9)
+_d = (3.426e-2, 4.464e-4, 4.215e-1, -3.107e-3)
+_e = (2.070e-5, -6.370e-10, 3.989e-15)
+_k = 0.0162
+
+# Coefficients that are derived, reversed or grouped in the array code.
+_a_ds = (_a[1], 2 * _a[2], 3 * _a[3], 4 * _a[4], 5 * _a[5])
+_b_ds = (_b[1], 2 * _b[2], 3 * _b[3], 4 * _b[4], 5 * _b[5])
+_smow = (999.842594, 6.793952e-2, -9.095290e-3, 1.001685e-4, -1.120083e-6,
+         6.536332e-9)
+
+
+def _horner(x, coefs):
+    """coefs[0] + (coefs[1] + (... + coefs[-1] * x) * x) * x, in the order
+    of `library._horner`."""
+    y = x * coefs[-1]
+    for coef in coefs[-2:0:-1]:
+        y = (y + coef) * x
+    return y + coefs[0]
+
+
+def _sqrt(x):
+    """Square root, NaN for negative numbers like NumPy."""
+    return math.sqrt(x) if x >= 0 else nan
+
+
+def _log(x):
+    """Natural logarithm, NaN or -inf like NumPy."""
+    if x > 0:
+        return math.log(x)
+    return -float('inf') if x == 0 else nan
+
+
+# library.
+def T68conv(T90):
+    """Scalar `seawater.library.T68conv`."""
+    return T90 * 1.00024
+
+
+def T90conv(t, t_type='T68'):
+    """Scalar `seawater.library.T90conv`."""
+    if t_type == 'T68':
+        return t / 1.00024
+    elif t_type == 'T48':
+        return (t - 4.4e-6 * t * (100 - t)) / 1.00024
+    raise NameError("Unrecognized temperature type.  Try 'T68'' or 'T48'")
+
+
+def salds(rtx, delt):
+    """Scalar `seawater.salds`."""
+    ds = _horner(rtx, _a_ds)
+    w = delt / (delt * _k + 1)
+    return ds + w * _horner(rtx, _b_ds)
+
+
+def _salrp(r, T68, p):
+    w = (p * _e[1] + _e[0]) + (p * p) * _e[2]
+    rp = (T68 * _d[0] + 1) + (T68 * T68) * _d[1]
+    rp = rp + (T68 * _d[3] + _d[2]) * r
+    return p * w / rp + 1
+
+
+def salrp(r, t, p):
+    """Scalar `seawater.salrp`."""
+    return _salrp(r, t * 1.00024, p)
+
+
+def salrt(t):
+    """Scalar `seawater.salrt`."""
+    return _horner(t * 1.00024, _c)
+
+
+def _sals(rt, T68):
+    del_T68 = T68 - 15
+    Rtx = _sqrt(rt)
+    w = del_T68 / (del_T68 * _k + 1)
+    return _horner(Rtx, _a) + w * _horner(Rtx, _b)
+
+
+def sals(rt, t):
+    """Scalar `seawater.sals`."""
+    return _sals(rt, t * 1.00024)
+
+
+def smow(t):
+    """Scalar `seawater.smow`."""
+    return _horner(t * 1.00024, _smow)
+
+
+_seck_h = (3.239908, 1.43713e-3, 1.16092e-4, -5.77905e-7)
+_seck_k = (8.50935e-5, -6.12293e-6, 5.2787e-8)
+_seck_e = (19652.21, 148.4206, -2.327105, 1.360477e-2, -5.155288e-5)
+_seck_i = (2.2838e-3, -1.0981e-5, -1.6078e-6)
+_seck_m = (-9.9348e-7, 2.0816e-8, 9.1697e-10)
+_seck_f = (54.6746, -0.603459, 1.09987e-2, -6.1670e-5)
+_seck_g = (7.944e-2, 1.6483e-2, -5.3009e-4)
+
+
+def _seck(s, T68, p, s_sqrt):
+    """Secant bulk modulus for temperature in IPTS-68 and pressure in
+    bars."""
+    K0 = _horner(T68, _seck_e) + (_horner(T68, _seck_f) +
+                                  _horner(T68, _seck_g) * s_sqrt) * s
+    A = _horner(T68, _seck_h) + (_horner(T68, _seck_i) +
+                                 s_sqrt * 1.91075e-4) * s
+    B = _horner(T68, _seck_k) + _horner(T68, _seck_m) * s
+    return K0 + (A + B * p) * p
+
+
+def seck(s, t, p=0):
+    """Scalar `seawater.seck`."""
+    return _seck(s, t * 1.00024, p / 10.0, _sqrt(s))
+
+
+def cndr(s, t, p):
+    """Scalar `seawater.cndr`."""
+    T68 = t * 1.00024
+    # Newton-Raphson iteration for inverse interpolation of Rt from s.
+    Rx = _sqrt(s / 35.0)
+    SInc = _sals(Rx * Rx, T68)
+    delt = t / 1.00024 - 15
+    for iloop in range(100):
+        Rx = Rx + (s - SInc) / salds(Rx, delt)
+        SInc_loop = _sals(Rx * Rx, T68)
+        if not abs(SInc_loop - s) > 1.0e-10:
+            break
+        SInc = SInc_loop
+
+    # Eqn(4) p.8 UNESCO 1983.
+    A = _d[2] + _d[3] * T68
+    B = (1 + _d[0] * T68) + _d[1] * (T68 * T68)
+    C = p * ((_e[0] + _e[1] * p) + _e[2] * (p * p))
+
+    # Eqn(6) p.9 UNESCO 1983.
+    Rt = Rx * Rx
+    rt = _horner(T68, _c)
+    D = B - A * rt * Rt
+    E = rt * Rt * A * (B + C)
+    r = _sqrt(abs(D * D + 4 * E)) - D
+    return 0.5 * r / A
+
+
+# eos80.
+_adtg_a = (3.5803e-5, 8.5258e-6, -6.836e-8, 6.6228e-10)
+_adtg_b = (1.8932e-6, -4.2393e-8)
+_adtg_c = (1.8741e-8, -6.7795e-10, 8.733e-12, -5.4481e-14)
+_adtg_d = (-1.1351e-10, 2.7759e-12)
+_adtg_e = (-4.6206e-13, 1.8676e-14, -2.1687e-16)
+
+
+def _adtg(s35, T68, p):
+    y = _horner(T68, _adtg_a) + _horner(T68, _adtg_b) * s35
+    y = y + (_horner(T68, _adtg_c) + _horner(T68, _adtg_d) * s35) * p
+    return y + _horner(T68, _adtg_e) * p * p
+
+
+def adtg(s, t, p):
+    """Scalar `seawater.adtg`."""
+    return _adtg(s - 35, t * 1.00024, p)
+
+
+# Theta2 and Theta3 coefficients of the Runge-Kutta integration.
+_stages = ((1 - 1 / 2 ** 0.5, 2 - 2 ** 0.5, -2 + 3 / 2 ** 0.5),
+           (1 + 1 / 2 ** 0.5, 2 + 2 ** 0.5, -2 - 3 / 2 ** 0.5))
+
+
+def ptmp(s, t, p, pr=0):
+    """Scalar `seawater.ptmp`."""
+    del_P = pr - p
+    s35 = s - 35
+
+    # Theta1.
+    T68 = t * 1.00024
+    del_th = _adtg(s35, T68, p) * del_P
+    th = del_th * 0.5 + T68
+    q = del_th
+
+    # Theta2 and Theta3.
+    p_mid = del_P * 0.5 + p
+    for a, b, c in _stages:
+        T68 = th / 1.00024 * 1.00024
+        del_th = _adtg(s35, T68, p_mid) * del_P
+        th = th + (del_th - q) * a
+        q = q * c + del_th * b
+
+    # Theta4.
+    T68 = th / 1.00024 * 1.00024
+    del_th = _adtg(s35, T68, p + del_P) * del_P
+    th = th + (del_th - q * 2) / 6
+    return th / 1.00024
+
+
+def temp(s, pt, p, pr=0):
+    """Scalar `seawater.temp`."""
+    return ptmp(s, pt, pr, p)
+
+
+_aonb_c1 = (0.665157e-1, 0.170907e-1, -0.203814e-3, 0.298357e-5,
+            -0.255019e-7)
+_aonb_c2 = (0.378110e-2, -0.846960e-4)
+_aonb_c2a = (0.0, -0.164759e-6, -0.251520e-11)
+_aonb_c4 = (0.380374e-4, -0.933746e-6, 0.791325e-8)
+
+
+def aonb(s, t, p, pt=False):
+    """Scalar `seawater.aonb`."""
+    if not pt:
+        t = ptmp(s, t, p, 0)
+    t = t * 1.00024
+    sm35 = s - 35.0
+    w = sm35 * (_horner(t, _aonb_c2) + _horner(p, _aonb_c2a))
+    y = _horner(t, _aonb_c1) + w
+    y = y + (sm35 * sm35) * -0.678662e-5
+    y = y + p * _horner(t, _aonb_c4)
+    y = y + (p * p) * 0.512857e-12 * (t * t)
+    return y + math.pow(p, 3) * -0.302285e-13
+
+
+_beta_c1 = (0.785567e-3, -0.301985e-5, 0.555579e-7, -0.415613e-9)
+_beta_c2 = (-0.356603e-6, 0.788212e-8)
+_beta_c3 = (0.0, 0.408195e-10, -0.602281e-15)
+_beta_c5 = (-0.121555e-7, 0.192867e-9, -0.213127e-11)
+_beta_c6 = (0.176621e-12, -0.175379e-14)
+
+
+def beta(s, t, p, pt=False):
+    """Scalar `seawater.beta`."""
+    if not pt:
+        t = ptmp(s, t, p, 0)
+    t = t * 1.00024
+    sm35 = s - 35
+    w = sm35 * (_horner(t, _beta_c2) + _horner(p, _beta_c3))
+    y = _horner(t, _beta_c1) + w
+    y = y + (sm35 * sm35) * 0.515032e-8
+    y = y + p * _horner(t, _beta_c5)
+    y = y + (p * p) * _horner(t, _beta_c6)
+    return y + math.pow(p, 3) * 0.121551e-17
+
+
+def alpha(s, t, p, pt=False):
+    """Scalar `seawater.alpha`."""
+    if not pt:
+        t = ptmp(s, t, p, 0)
+    return aonb(s, t, p, True) * beta(s, t, p, True)
+
+
+_cp_a = (-7.64357, 0.1072763, -1.38385e-3)
+_cp_b = (0.1770383, -4.07718e-3, 5.148e-5)
+_cp_c = (4217.4, -3.720283, 0.1412855, -2.654387e-3, 2.093236e-5)
+_cp_a0 = (-4.9592e-1, 1.45747e-2, -3.13885e-4, 2.0357e-6, 1.7168e-8)
+_cp_b0 = (2.4931e-4, -1.08645e-5, 2.87533e-7, -4.0027e-9, 2.2956e-11)
+_cp_c0 = (-5.422e-8, 2.6380e-9, -6.5637e-11, 6.136e-13)
+_cp_d = (4.9247e-3, -1.28315e-4, 9.802e-7, 2.5941e-8, -2.9179e-10)
+_cp_e = (-1.2331e-4, -1.517e-6, 3.122e-8)
+_cp_f = (-2.9558e-6, 1.17054e-7, -2.3905e-9, 1.8448e-11)
+_cp_h = (5.540e-10, -1.7682e-11, 3.513e-13)
+
+
+def cp(s, t, p):
+    """Scalar `seawater.cp`."""
+    p = p / 10.
+    T68 = t * 1.00024
+    s_sqrt = _sqrt(s)
+
+    # Eqn. 26 p.32.
+    T68_2 = T68 * T68
+    y = _horner(T68, _cp_c)
+    y = y + ((T68 * _cp_a[1] + _cp_a[0]) + T68_2 * _cp_a[2]) * s
+    y = y + ((T68 * _cp_b[1] + _cp_b[0]) + T68_2 * _cp_b[2]) * s * s_sqrt
+
+    # Eqn. 28 p.33.
+    y = y + ((_horner(T68, _cp_c0) * p + _horner(T68, _cp_b0)) * p +
+             _horner(T68, _cp_a0)) * p
+
+    # Eqn 29 p.34.
+    S3_2 = s * s_sqrt
+    w = (_horner(T68, _cp_d) * s + _horner(T68, _cp_e) * S3_2) * p
+    w = w + (_horner(T68, _cp_f) * s + S3_2 * 9.971e-8) * (p * p)
+    w = w + (_horner(T68, _cp_h) * s + T68 * -1.4300e-12 * S3_2) * math.pow(
+        p, 3)
+    return y + w
+
+
+_dens0_b = (8.24493e-1, -4.0899e-3, 7.6438e-5, -8.2467e-7, 5.3875e-9)
+_dens0_c = (-5.72466e-3, 1.0227e-4, -1.6546e-6)
+
+
+def _dens0(s, T68, s_sqrt):
+    y = _horner(T68, _smow) + _horner(T68, _dens0_b) * s
+    return y + _horner(T68, _dens0_c) * s * s_sqrt + s * s * 4.8314e-4
+
+
+def dens0(s, t):
+    """Scalar `seawater.dens0`."""
+    return _dens0(s, t * 1.00024, _sqrt(s))
+
+
+def dens(s, t, p):
+    """Scalar `seawater.dens`."""
+    T68, p, s_sqrt = t * 1.00024, p / 10., _sqrt(s)
+    return _dens0(s, T68, s_sqrt) / (1 - p / _seck(s, T68, p, s_sqrt))
+
+
+def pden(s, t, p, pr=0):
+    """Scalar `seawater.pden`."""
+    return dens(s, ptmp(s, t, p, pr), pr)
+
+
+def svan(s, t, p=0):
+    """Scalar `seawater.svan`."""
+    return 1 / dens(s, t, p) - 1 / dens(35., 0., p)
+
+
+_svel_c0 = (5.03711, -5.80852e-2, 3.3420e-4, -1.47800e-6, 3.1464e-9)
+_svel_c1 = (0.153563, 6.8982e-4, -8.1788e-6, 1.3621e-7, -6.1185e-10)
+_svel_c2 = (3.1260e-5, -1.7107e-6, 2.5974e-8, -2.5335e-10, 1.0405e-12)
+_svel_c3 = (-9.7729e-9, 3.8504e-10, -2.3643e-12)
+_svel_a0 = (-1.262e-2, 7.164e-5, 2.006e-6, -3.21e-8)
+_svel_a1 = (9.4742e-5, -1.2580e-5, -6.4885e-8, 1.0507e-8, -2.0122e-10)
+_svel_a2 = (-3.9064e-7, 9.1041e-9, -1.6002e-10, 7.988e-12)
+_svel_a3 = (1.100e-10, 6.649e-12, -3.389e-13)
+
+
+def svel(s, t, p):
+    """Scalar `seawater.svel`."""
+    p = p / 10
+    T68 = t * 1.00024
+
+    # Eqn 34 p.46.
+    w = ((_horner(T68, _svel_c3) * p + _horner(T68, _svel_c2)) * p +
+         _horner(T68, _svel_c1)) * p
+    Cw = (w + _horner(T68, _svel_c0) * T68) + 1402.388
+
+    # Eqn. 35. p.47
+    w = ((_horner(T68, _svel_a3) * p + _horner(T68, _svel_a2)) * p +
+         _horner(T68, _svel_a1)) * p
+    A = (w + _horner(T68, _svel_a0) * T68) + 1.389
+
+    # Eqn 36 p.47.
+    B = (T68 * -4.42e-5 + -1.922e-2) + (T68 * 1.7945e-7 + 7.3637e-5) * p
+
+    # Eqn 37 p.47.
+    D = p * -7.9836e-6 + 1.727e-3
+
+    # Eqn 33 p.46.
+    return Cw + A * s + B * s * _sqrt(s) + D * (s * s)
+
+
+_dpth_c = (9.72659, -2.2512e-5, 2.279e-10, -1.82e-15)
+
+
+def dpth(p, lat):
+    """Scalar `seawater.dpth`."""
+    X = math.sin(abs(lat) * deg2rad)
+    X = X * X
+    bot_line = ((X * 2.36e-5 + 5.2788e-3) * X + 1.0) * 9.780318
+    bot_line = bot_line + p * (2.184e-6 * 0.5)
+    return _horner(p, _dpth_c) * p / bot_line
+
+
+def fp(s, p):
+    """Scalar `seawater.fp`."""
+    y = s * -0.0575 + s * 1.710523e-3 * _sqrt(s)
+    y = y + (s * s) * -2.154996e-4 + p * -7.53e-4
+    return y / 1.00024
+
+
+def g(lat, z=0):
+    """Scalar `seawater.g`."""
+    X = math.sin(abs(lat) * deg2rad)
+    sin2 = X * X
+    grav = ((sin2 * 2.36e-5 + 5.2788e-3) * sin2 + 1.0) * 9.780318
+    w = z / earth_radius + 1
+    return grav / (w * w)
+
+
+def pres(depth, lat):
+    """Scalar `seawater.pres`."""
+    X = math.sin(abs(lat * deg2rad))
+    C1 = 1 - ((X * X) * 5.25e-3 + 5.92e-3)
+    return (C1 - _sqrt(C1 * C1 - depth * 8.84e-6)) / 4.42e-6
+
+
+def salt(r, t, p):
+    """Scalar `seawater.salt`."""
+    T68 = t * 1.00024
+    rt = _horner(T68, _c)
+    rt = r / (_salrp(r, T68, p) * rt)
+    return _sals(rt, T68)
+
+
+# extras.
+def dist(lat, lon, units='km'):
+    """Scalar `seawater.dist`.  `lat` and `lon` are sequences of positions,
+    or a single value for all of them, and the distances and angles between
+    consecutive positions are returned as two lists."""
+    if not hasattr(lat, '__len__'):
+        lat = [lat] * len(lon)
+    elif not hasattr(lon, '__len__'):
+        lon = [lon] * len(lat)
+
+    dists, angles = [], []
+    for lat0, lon0, lat1, lon1 in zip(lat[:-1], lon[:-1], lat[1:], lon[1:]):
+        dlon = lon1 - lon0
+        if abs(dlon) > 180:
+            dlon = -math.copysign(1, dlon) * (360 - abs(dlon))
+        w = (abs(lat1 * deg2rad) + abs(lat0 * deg2rad)) / 2
+        dep = math.cos(w) * dlon
+        dlat = lat1 - lat0
+        d = _sqrt(dlat * dlat + dep * dep) * DEG2NM
+        if units == 'km':
+            d = d * NM2KM
+        dists.append(d)
+        # Same sign of zero as np.angle(dep + dlat * 1j).
+        angles.append(math.atan2(dlat + 0., dep + (dlat * 0 - 0.)) * rad2deg)
+    return dists, angles
+
+
+def f(lat):
+    """Scalar `seawater.f`."""
+    return math.sin(lat * deg2rad) * (2 * OMEGA)
+
+
+def _sat(s, t, a, b):
+    """Eqn (4) of Weiss 1970 for the gas with constants `a` and `b`."""
+    t = t * 1.00024 + Kelvin
+    x = t / 100
+    lnC = (100 / t) * a[1] + a[0]
+    lnC = lnC + _log(x) * a[2] + x * a[3]
+    lnC = lnC + s * ((x * b[1] + b[0]) + (x * x) * b[2])
+    return math.exp(lnC)
+
+
+def satAr(s, t):
+    """Scalar `seawater.satAr`."""
+    return _sat(s, t, (-173.5146, 245.4510, 141.8222, -21.8020),
+                (-0.034474, 0.014934, -0.0017729))
+
+
+def satN2(s, t):
+    """Scalar `seawater.satN2`."""
+    return _sat(s, t, (-172.4965, 248.4262, 143.0738, -21.7120),
+                (-0.049781, 0.025018, -0.0034861))
+
+
+def satO2(s, t):
+    """Scalar `seawater.satO2`."""
+    return _sat(s, t, (-173.4292, 249.6339, 143.3483, -21.8492),
+                (-0.033096, 0.014259, -0.0017000))
+
+
+def swvel(length, depth):
+    """Scalar `seawater.swvel`."""
+    k = 2.0 * math.pi / length
+    return _sqrt(math.tanh(k * depth) * gdef / k)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
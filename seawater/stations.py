@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#
+# stations.py
+#
+# purpose:  Nearest station search on the sphere.
+#
+# obs:  Uses the SciPy KD-tree when available, and a brute force search by
+# blocks otherwise.
+#
+
+from __future__ import division
+
+import numpy as np
+
+from .constants import DEG2NM, NM2KM, deg2rad
+from .extras import _dist
+from .ragged import Ragged
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # Brute force search.
+    cKDTree = None
+
+__all__ = ['StationIndex']
+
+
+# The plane sailing distance of `dist` is never shorter than 0.83 times the
+# great circle distance of the search (at 61S, 61N and 180 degrees apart),
+# and within 1% of it below 3000 km.  The radius search looks that much
+# further and keeps the stations inside the radius in plane sailing distance.
+_margin = 1.25
+
+
+def _xyz(lat, lon):
+    """Positions on the unit sphere, in the last dimension."""
+    lat = np.multiply(lat, deg2rad)
+    lon = np.multiply(lon, deg2rad)
+    coslat = np.cos(lat)
+    return np.stack((coslat * np.cos(lon), coslat * np.sin(lon),
+                     np.sin(lat)), axis=-1)
+
+
+def _pack(found):
+    """Ragged station indices of each query."""
+    if not len(found):
+        return Ragged(np.empty(0, np.intp), [0])
+    return Ragged.from_profiles([np.asarray(f, np.intp) for f in found])
+
+
+def _chord(r, units):
+    """Chord on the unit sphere of the great circle distance `r`."""
+    angle = np.divide(r, NM2KM) if units == 'km' else np.asarray(r, float)
+    angle = np.minimum(angle / DEG2NM * deg2rad, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+class StationIndex(object):
+    """Index of station positions for nearest station queries, e.g.: to
+    match model grid cells or ship positions to hydrographic stations.
+
+    The stations are placed on the unit sphere and searched along great
+    circles with a KD-tree (`scipy.spatial.cKDTree`), or by brute force
+    when SciPy is not available.  The distances returned are the "Plane
+    Sailing" ones of `dist`, from the query position to the station.
+
+    Parameters
+    ----------
+    lat : array_like
+          decimal degrees (+ve N, -ve S) [- 90.. +90] of the stations.
+    lon : array_like
+          decimal degrees (+ve E, -ve W) [-180..+180] of the stations.
+    brute : bool, optional
+            use the brute force search even when SciPy is available.
+            Default is False.
+    block : int, optional
+            number of station-query pairs compared at once by the brute
+            force search.  Default is 2**22.
+
+    Examples
+    --------
+    >>> import seawater as sw
+    >>> index = sw.StationIndex([41, 40, 40], [35, 35, 36])
+    >>> index.query(40.2, 35.9)
+    (23.793967478260377, 2)
+    >>> index.query([40.2, 41], [35.9, 35], k=2)[1]
+    array([[2, 1],
+           [0, 1]])
+    """
+
+    def __init__(self, lat, lon, brute=False, block=2 ** 22):
+        lat, lon = np.broadcast_arrays(*map(np.asarray, (lat, lon)))
+        self.lat, self.lon = lat.ravel(), lon.ravel()
+        self.block = block
+        self._xyz = _xyz(self.lat, self.lon)
+        brute = brute or cKDTree is None
+        self._tree = None if brute else cKDTree(self._xyz)
+
+    def __len__(self):
+        return self.lat.size
+
+    def _rows(self):
+        """Number of queries compared at once by the brute force search."""
+        return max(1, self.block // max(len(self), 1))
+
+    def _nearest(self, xyz, k, workers):
+        """Indices of the `k` nearest stations along great circles."""
+        if self._tree is not None:
+            idx = self._tree.query(xyz, k, workers=workers)[1]
+            return idx.reshape(xyz.shape[0], k)
+        idx = np.empty((xyz.shape[0], k), np.intp)
+        rows = self._rows()
+        for i0 in range(0, xyz.shape[0], rows):
+            # The largest cosines are the nearest stations.
+            cos = np.dot(xyz[i0:i0 + rows], self._xyz.T)
+            np.negative(cos, out=cos)
+            row = np.arange(cos.shape[0])[:, None]
+            if k < cos.shape[1]:
+                part = np.argpartition(cos, k - 1, axis=1)[:, :k]
+            else:
+                part = np.broadcast_to(np.arange(k), cos.shape)
+            order = np.argsort(cos[row, part], axis=1, kind='mergesort')
+            idx[i0:i0 + rows] = part[row, order]
+        return idx
+
+    def _within(self, xyz, chord, workers):
+        """Indices of the stations within `chord` of each query, Ragged."""
+        if self._tree is not None:
+            return _pack(self._tree.query_ball_point(xyz, chord,
+                                                     workers=workers))
+        found = []
+        rows = self._rows()
+        cos = 1 - chord ** 2 / 2
+        for i0 in range(0, xyz.shape[0], rows):
+            near = np.dot(xyz[i0:i0 + rows], self._xyz.T)
+            found.extend(np.flatnonzero(row) for row in
+                         near >= cos[i0:i0 + rows, None])
+        return _pack(found)
+
+    def query(self, lat, lon, k=1, units='km', workers=1):
+        """The `k` nearest stations of each query position.
+
+        Parameters
+        ----------
+        lat : array_like
+              decimal degrees (+ve N, -ve S) [- 90.. +90]
+        lon : array_like
+              decimal degrees (+ve E, -ve W) [-180..+180]
+        k : int, optional
+            number of stations, default 1.
+        units : string, optional
+                default kilometers
+        workers : int, optional
+                  threads used by the KD-tree, -1 for all the processors.
+                  Default is 1.
+
+        Returns
+        -------
+        dist : array_like
+               distance from the query position to the stations in units,
+               nearest first.
+        index : array_like
+                index of the stations.
+
+        Both have the broadcast shape of `lat` and `lon`, with a last
+        dimension of length `k` when `k` is larger than 1.  The stations are
+        the `k` nearest along great circles, sorted by plane sailing
+        distance.
+        """
+        if not 1 <= k <= len(self):
+            raise ValueError("k must be between 1 and the number of "
+                             "stations, %d." % len(self))
+        lat, lon = np.broadcast_arrays(*map(np.asarray, (lat, lon)))
+        shape = lat.shape
+        lat, lon = lat.reshape(-1, 1), lon.reshape(-1, 1)
+
+        idx = self._nearest(_xyz(lat[:, 0], lon[:, 0]), k, workers)
+        dist = _dist(lat, lon, self.lat[idx], self.lon[idx], units)[0]
+        row = np.arange(dist.shape[0])[:, None]
+        order = np.argsort(dist, axis=1, kind='mergesort')
+        dist, idx = dist[row, order], idx[row, order]
+        if k == 1:
+            return dist.reshape(shape)[()], idx.reshape(shape)[()]
+        return dist.reshape(shape + (k,)), idx.reshape(shape + (k,))
+
+    def query_radius(self, lat, lon, r, units='km', workers=1):
+        """All the stations within the distance `r` of each query position.
+
+        Parameters
+        ----------
+        lat : array_like
+              decimal degrees (+ve N, -ve S) [- 90.. +90]
+        lon : array_like
+              decimal degrees (+ve E, -ve W) [-180..+180]
+        r : number or array_like
+            radius in units, per query position or the same for all.
+        units : string, optional
+                default kilometers
+        workers : int, optional
+                  threads used by the KD-tree, -1 for all the processors.
+                  Default is 1.
+
+        Returns
+        -------
+        dist : Ragged
+               distance from each query position to its stations in units,
+               nearest first.  One profile per query position, in the
+               flattened broadcast order of `lat` and `lon`.
+        index : Ragged
+                index of the stations.
+
+        Examples
+        --------
+        >>> import seawater as sw
+        >>> index = sw.StationIndex([41, 40, 40], [35, 35, 36])
+        >>> dist, idx = index.query_radius([40.2, 41], [35.9, 35], 100)
+        >>> idx.lengths
+        array([2, 1])
+        >>> idx[0]
+        array([2, 1])
+        """
+        lat, lon, r = np.broadcast_arrays(*map(np.asarray, (lat, lon, r)))
+        lat, lon, r = lat.ravel(), lon.ravel(), r.ravel()
+
+        found = self._within(_xyz(lat, lon), _chord(r * _margin, units),
+                             workers)
+        query = found.profile
+        dist = _dist(lat[query], lon[query], self.lat[found.values],
+                     self.lon[found.values], units)[0]
+        # Nearest first within each query, then drop those outside `r`.
+        order = np.lexsort((dist, query))
+        dist, idx, query = dist[order], found.values[order], query[order]
+        keep = dist <= r[query]
+        offsets = np.concatenate(([0], np.cumsum(
+            np.bincount(query[keep], minlength=lat.size))))
+        return Ragged(dist[keep], offsets), Ragged(idx[keep], offsets)
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+#
+# stream.py
+#
+# purpose:  Streaming evaluation over iterators of data blocks.
+#
+# obs:
+#
+
+from __future__ import division
+
+from threading import Event, Thread
+
+try:
+    from queue import Full, Queue
+except ImportError:  # Python 2.
+    from Queue import Full, Queue
+
+import numpy as np
+
+from .library import Workspace, _plain
+
+try:
+    string_types = basestring
+except NameError:  # Python 3.
+    string_types = str
+
+__all__ = ['evaluate',
+           'out_of_core',
+           'wrap']
+
+
+# Functions that integrate or difference along the first axis, their blocks
+# are never split.
+_whole = ('bfrq', 'dist', 'dist_matrix', 'gpan', 'gvel')
+
+
+def _accepts(func, name):
+    func = getattr(func, '__wrapped__', func)  # Profiled functions.
+    code = func.__code__
+    return name in code.co_varnames[:code.co_argcount]
+
+
+def _chunks(args, chunksize):
+    """Splits `args` along the leading axis of their broadcast shape in
+    pieces of at most `chunksize` elements (at least one row each).  Arrays
+    with fewer dimensions, or a leading dimension of one, are broadcast and
+    passed whole."""
+    shape = np.broadcast(*args).shape
+    if chunksize is None or not shape or np.prod(shape) <= chunksize:
+        yield Ellipsis, args
+        return
+    rows = max(1, chunksize // int(np.prod(shape[1:])))
+    for start in range(0, shape[0], rows):
+        index = slice(start, start + rows)
+        yield index, tuple(arg[index] if np.ndim(arg) == len(shape) and
+                           np.shape(arg)[0] == shape[0] else arg
+                           for arg in args)
+
+
+def _empty(res, shape):
+    if isinstance(res, tuple):
+        return tuple(_empty(r, shape) for r in res)
+    return np.empty(shape + res.shape[1:], res.dtype)
+
+
+def _store(out, index, res):
+    if isinstance(out, tuple):
+        for o, r in zip(out, res):
+            _store(o, index, r)
+    else:
+        out[index] = res
+
+
+def _concatenate(parts):
+    if isinstance(parts[0], tuple):
+        return tuple(_concatenate(p) for p in zip(*parts))
+    return np.ma.concatenate(parts)
+
+
+def evaluate(func, blocks, chunksize=65536, ws=None, **kwargs):
+    """Evaluates `func` over an iterable of input blocks, yielding one output
+    block per input block.
+
+    Parameters
+    ----------
+    func : callable
+           any seawater function, e.g.: `salt`, `ptmp`, `pden` or `svel`.
+    blocks : iterable
+             iterator or generator of input blocks.  Each block is a tuple
+             with the positional arguments of `func`, e.g.: (s, t, p) for
+             `pden`, or a single array for single argument functions.
+    chunksize : int, optional
+                maximum number of elements given to `func` at once.  Larger
+                blocks are split along their leading axis and the temporary
+                arrays, kept in `ws`, are sized by `chunksize`.  Default is
+                65536, None evaluates each block in a single call.
+    ws : Workspace, optional
+         workspace reused across the calls.  A new one is used when not
+         given.
+    kwargs : optional
+             keyword arguments for `func`, e.g.: pr=1000 for `ptmp`.
+
+    Returns
+    -------
+    out : generator
+          output blocks, tuples for functions with several outputs.
+
+    Notes
+    -----
+    Only one input block is held at a time, so memory use is bounded by the
+    block, its output block and about a dozen `chunksize` work arrays.
+    Blocks for `bfrq`, `gpan`, `gvel` and `dist`, which work along the
+    first axis, are never split: each block must hold whole profiles (or
+    the whole station track).
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> blocks = ((np.array([35., 35.]), np.array([10., 20.]), p)
+    ...           for p in (np.array([0., 1000.]), np.array([2000., 3000.])))
+    >>> for pt in sw.stream.evaluate(sw.ptmp, blocks):
+    ...     print(pt)
+    [ 10.          19.81229125]
+    [  9.74732077  19.41729117]
+    """
+    if ws is None and _accepts(func, 'ws'):
+        ws = Workspace()
+    if ws is not None:
+        kwargs['ws'] = ws
+    if func.__name__ in _whole:
+        chunksize = None
+    for args in blocks:
+        if not isinstance(args, tuple):
+            args = (args,)
+        args = tuple(np.asanyarray(arg) for arg in args)
+        if not _plain(args):
+            # Subclasses, e.g.: masked arrays, keep their own results.
+            parts = [func(*chunk, **kwargs) for _, chunk in
+                     _chunks(args, chunksize)]
+            yield parts[0] if len(parts) == 1 else _concatenate(parts)
+            continue
+        out = None
+        shape = np.broadcast(*args).shape
+        for index, chunk in _chunks(args, chunksize):
+            if out is None:
+                res = func(*chunk, **kwargs)
+                if index is Ellipsis:
+                    break
+                out = _empty(res, shape[:1])
+                _store(out, index, res)
+            elif isinstance(out, tuple):
+                func(*chunk, out=tuple(o[index] for o in out), **kwargs)
+            else:
+                func(*chunk, out=out[index], **kwargs)
+        yield res if out is None else out
+
+
+def wrap(func, chunksize=65536, **kwargs):
+    """Turns `func` into a function of an iterable of input blocks that
+    yields the output blocks, see `evaluate`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> salt = sw.stream.wrap(sw.salt)
+    >>> blocks = [(np.array([1., 1.2]), np.array([15., 20.]),
+    ...            np.array([0., 0.]))]
+    >>> for s in salt(blocks):
+    ...     print(s)
+    [ 34.99677011  37.95278734]
+    """
+    def streamed(blocks, ws=None):
+        return evaluate(func, blocks, chunksize=chunksize, ws=ws, **kwargs)
+    streamed.__name__ = func.__name__
+    streamed.__doc__ = ("Streaming version of `%s`, see "
+                        "`seawater.stream.evaluate`." % func.__name__)
+    return streamed
+
+
+def _prefetch(iterable, timeout=0.1):
+    """Iterates over `iterable` in a background thread, one item ahead of
+    the consumer, so the next block is read while the current one is being
+    computed.  The thread stops when the consumer stops early, checking
+    every `timeout` seconds while it waits to hand over an item."""
+    queue, done, stop = Queue(maxsize=1), object(), Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=timeout)
+                return True
+            except Full:
+                pass
+        return False
+
+    def worker():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as err:
+            put((None, err))
+            return
+        put((done, None))
+
+    thread = Thread(target=worker)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            item, err = queue.get()
+            if err is not None:
+                raise err
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _read(args, chunksize):
+    """Chunks of `args` read into memory."""
+    for index, chunk in _chunks(args, chunksize):
+        yield index, tuple(np.array(arg) if isinstance(arg, np.memmap) else
+                           arg for arg in chunk)
+
+
+def _open(output, shape, res):
+    if isinstance(res, tuple):
+        if not isinstance(output, tuple) or len(output) != len(res):
+            raise ValueError("%d outputs expected." % len(res))
+        return tuple(_open(o, shape, r) for o, r in zip(output, res))
+    if isinstance(output, string_types):
+        return np.lib.format.open_memmap(output, mode='w+', dtype=res.dtype,
+                                         shape=shape)
+    if output.shape != shape:
+        raise ValueError("Output shape %s, expected %s." %
+                         (output.shape, shape))
+    return output
+
+
+def _view(buf, rows):
+    if isinstance(buf, tuple):
+        return tuple(b[:rows] for b in buf)
+    return buf[:rows]
+
+
+def _flush(out):
+    if isinstance(out, tuple):
+        for o in out:
+            _flush(o)
+    elif isinstance(out, np.memmap):
+        out.flush()
+
+
+def out_of_core(func, inputs, output, chunksize=2 ** 20, progress=None,
+                prefetch=True, **kwargs):
+    """Evaluates `func` over arrays larger than memory, block by block,
+    writing the results straight into a memory-mapped output.
+
+    Parameters
+    ----------
+    func : callable
+           any elementwise eos80, library or extras function, e.g.: `pden`.
+    inputs : tuple
+             positional arguments of `func`.  Either paths of .npy files,
+             opened as read-only memory maps, `np.memmap` or ndarrays, or
+             scalars.
+    output : string, array_like or tuple
+             path of the .npy file to create, or an existing (memory-mapped)
+             array with the broadcast shape of the inputs.  A tuple of them
+             for functions with several outputs, e.g.: `state`.
+    chunksize : int, optional
+                number of elements read and computed at once, the memory use
+                is a few times `chunksize` float64 values.  Default is 2**20.
+                Blocks are made of whole rows of the leading axis.
+    progress : callable, optional
+               called as progress(done, total) with the number of elements
+               written so far after each block.
+    prefetch : bool, optional
+               read the next block in a background thread while the current
+               one is computed.  Default is True.
+    kwargs : optional
+             keyword arguments for `func`, e.g.: pr=1000 for `pden`.
+
+    Returns
+    -------
+    out : array_like or tuple
+          the output memory map(s), flushed to disk.
+
+    Notes
+    -----
+    `bfrq`, `gpan`, `gvel` and `dist` work along the first axis and are not
+    supported.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> import numpy as np
+    >>> import seawater as sw
+    >>> path = tempfile.mkdtemp()
+    >>> s, t, p = [os.path.join(path, name) for name in 'stp']
+    >>> np.save(s, np.full((4, 3), 35.))
+    >>> np.save(t, np.linspace(25, 2, 12).reshape(4, 3))
+    >>> np.save(p, np.linspace(0, 5500, 4)[:, None] * np.ones((4, 3)))
+    >>> out = os.path.join(path, 'pden.npy')
+    >>> res = sw.stream.out_of_core(sw.pden, (s + '.npy', t + '.npy',
+    ...                             p + '.npy'), out, chunksize=6)
+    >>> np.load(out, mmap_mode='r')[-1]
+    memmap([ 1027.6133842 ,  1027.83732332,  1028.01155395])
+    """
+    if func.__name__ in _whole:
+        raise ValueError("%s works along the first axis, it cannot be "
+                         "evaluated out-of-core." % func.__name__)
+    args = tuple(np.load(arg, mmap_mode='r') if
+                 isinstance(arg, string_types) else np.asanyarray(arg)
+                 for arg in inputs)
+    shape = np.broadcast(*args).shape
+    total = int(np.prod(shape))
+    if _accepts(func, 'ws'):
+        kwargs['ws'] = Workspace()
+
+    chunks = _read(args, chunksize)
+    if prefetch:
+        chunks = _prefetch(chunks)
+    out = buf = None
+    done = 0
+    try:
+        for index, chunk in chunks:
+            if buf is None:
+                # The first block gives the number of outputs and their
+                # dtype.
+                buf = func(*chunk, **kwargs)
+                out = _open(output, shape, buf)
+                res = buf
+            else:
+                rows = np.broadcast(*chunk).shape[0]
+                res = func(*chunk, out=_view(buf, rows), **kwargs)
+            _store(out, index, res)
+            done += int(np.prod(np.broadcast(*chunk).shape))
+            if progress is not None:
+                progress(done, total)
+    finally:
+        # Stops the prefetching thread when `func` or `progress` fail.
+        chunks.close()
+    _flush(out)
+    return out
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# test_backends.py
+#
+# purpose:  Test the backends against the default NumPy one.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import sys
+import unittest
+import warnings
+
+import numpy as np
+import seawater as sw
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+def _cases(n):
+    rng = np.random.RandomState(1983)
+    s = rng.uniform(0, 42, n)
+    t = rng.uniform(-2, 40, n)
+    p = rng.uniform(0, 10000, n)
+    return dict(adtg=(sw.adtg, (s, t, p)),
+                alpha=(sw.alpha, (s, t, p)),
+                aonb=(sw.aonb, (s, t, p)),
+                beta=(sw.beta, (s, t, p)),
+                cndr=(sw.cndr, (s[s > 2], t[s > 2], p[s > 2])),
+                cp=(sw.cp, (s, t, p)),
+                dens0=(sw.dens0, (s, t)),
+                dens=(sw.dens, (s, t, p)),
+                pden=(sw.pden, (s, t, p, 1000.)),
+                ptmp=(sw.ptmp, (s, t, p, 1000.)),
+                seck=(sw.seck, (s, t, p)),
+                svan=(sw.svan, (s, t, p)),
+                svel=(sw.svel, (s, t, p)),
+                temp=(sw.temp, (s, t, p, 1000.)))
+
+
+class Backend(unittest.TestCase):
+    def tearDown(self):
+        sw.set_backend('numpy')
+
+    def test_default(self):
+        self.assertEqual(sw.get_backend(), 'numpy')
+
+    def test_unknown(self):
+        self.assertRaises(NameError, sw.set_backend, 'fortran')
+        self.assertEqual(sw.get_backend(), 'numpy')
+
+    def test_fallback(self):
+        for name in ('numba', 'numexpr'):
+            module = sys.modules.get(name)
+            sys.modules[name] = None  # Fails the import.
+            sys.modules.pop('seawater._%s' % name, None)
+            try:
+                with warnings.catch_warnings(record=True) as w:
+                    warnings.simplefilter('always')
+                    self.assertEqual(sw.set_backend(name), 'numpy')
+                self.assertEqual(len(w), 1)
+            finally:
+                if module is None:
+                    del sys.modules[name]
+                else:
+                    sys.modules[name] = module
+            self.assertEqual(sw.get_backend(), 'numpy')
+            s, t, p = _cases(10)['dens'][1]
+            self.assertEqual(sw.dens(s, t, p).shape, (10,))
+
+
+class _BackendCases(object):
+    backend = None
+
+    def setUp(self):
+        self.cases = _cases(1000)
+        self.assertEqual(sw.set_backend(self.backend), self.backend)
+
+    def tearDown(self):
+        sw.set_backend('numpy')
+
+    def expected(self, func, args, **kw):
+        sw.set_backend('numpy')
+        try:
+            return func(*args, **kw)
+        finally:
+            sw.set_backend(self.backend)
+
+    def test_equivalence(self):
+        for name, (func, args) in sorted(self.cases.items()):
+            # svan is the difference of two specific volumes of ~1e-3.
+            atol = 1e-17 if name == 'svan' else 0
+            np.testing.assert_allclose(func(*args), self.expected(func, args),
+                                       rtol=1e-14, atol=atol, err_msg=name)
+
+    def test_broadcast_and_scalars(self):
+        s, t, p = self.cases['dens'][1]
+        for args in ((s, t, 1000.), (35., 20., p), (35., 20., 1000.)):
+            res = sw.dens(*args)
+            np.testing.assert_allclose(res, self.expected(sw.dens, args),
+                                       rtol=1e-14, atol=0)
+        self.assertTrue(np.isscalar(sw.dens(35., 20., 1000.)))
+        self.assertTrue(np.isscalar(sw.cndr(35., 20., 1000.)))
+        self.assertEqual(sw.ptmp(s[:10].reshape(2, 5), 20., 0.).shape, (2, 5))
+
+    def test_out(self):
+        s, t, p = self.cases['svel'][1]
+        out = np.empty_like(s)
+        self.assertTrue(sw.svel(s, t, p, out=out) is out)
+        np.testing.assert_allclose(out, self.expected(sw.svel, (s, t, p)),
+                                   rtol=1e-14, atol=0)
+        expected = sw.dens(s, t, p)
+        self.assertTrue(sw.dens(s, t, p, out=s) is s)
+        np.testing.assert_array_equal(s, expected)
+
+    def test_numpy_fallback(self):
+        # Masked and float32 inputs are left to NumPy.
+        s, t, p = self.cases['dens'][1]
+        mask = s > 40
+        sm = np.ma.masked_array(s, mask)
+        res = sw.dens(sm, t, p)
+        self.assertTrue(isinstance(res, np.ma.MaskedArray))
+        np.testing.assert_array_equal(res.mask, mask)
+        args = [x.astype(np.float32) for x in (s, t, p)]
+        self.assertEqual(sw.dens(*args).dtype,
+                         self.expected(sw.dens, args).dtype)
+
+    def test_integers(self):
+        args = (np.arange(30, 36), 10, 0)
+        for func in (sw.dens, sw.svel, sw.cp, sw.seck, sw.ptmp):
+            np.testing.assert_allclose(func(*args), self.expected(func, args),
+                                       rtol=1e-14, atol=0)
+
+
+@unittest.skipIf(numba is None, "numba is not installed")
+class NumbaBackend(_BackendCases, unittest.TestCase):
+    backend = 'numba'
+
+
+@unittest.skipIf(numexpr is None, "numexpr is not installed")
+class NumexprBackend(_BackendCases, unittest.TestCase):
+    backend = 'numexpr'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# test_bfrq.py
+#
+# purpose:  Test the N2 kernel of bfrq against pden on each layer.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+
+
+class Bfrq(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        self.p = np.linspace(0, 5000, 40)[:, None] * np.ones((1, 5))
+        self.t = 2 + 20 * np.exp(-self.p / 700.) + rng.normal(0, 0.1,
+                                                             self.p.shape)
+        self.s = 34.7 + np.exp(-self.p / 400.) + rng.normal(0, 0.01,
+                                                           self.p.shape)
+        self.lat = rng.uniform(-60, 60, 5)
+
+    def test_pden(self):
+        s, t, p = self.s, self.t, self.p
+        n2, q, p_ave = sw.bfrq(s, t, p)
+        pden_up = sw.pden(s[:-1], t[:-1], p[:-1], p_ave)
+        pden_lo = sw.pden(s[1:], t[1:], p[1:], p_ave)
+        expected = (-9.8 * (pden_up - pden_lo) /
+                    ((p[1:] - p[:-1]) * ((pden_up + pden_lo) / 2.)))
+        np.testing.assert_array_equal(n2, expected)
+        self.assertTrue(np.isnan(q).all())
+
+    def test_outputs(self):
+        for lat in (None, self.lat):
+            expected = sw.bfrq(self.s, self.t, self.p, lat)
+            for outputs in (('n2',), ('p_ave', 'n2'), ('q', 'n2', 'p_ave')):
+                res = sw.bfrq(self.s, self.t, self.p, lat, outputs=outputs)
+                self.assertEqual(len(res), len(outputs))
+                for name, value in zip(outputs, res):
+                    k = ('n2', 'q', 'p_ave').index(name)
+                    np.testing.assert_array_equal(value, expected[k])
+            np.testing.assert_array_equal(
+                sw.bfrq(self.s, self.t, self.p, lat, outputs='n2'),
+                expected[0])
+
+    def test_unknown_output(self):
+        self.assertRaises(NameError, sw.bfrq, self.s, self.t, self.p,
+                          outputs=('n2', 'pv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
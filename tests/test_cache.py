@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+# test_cache.py
+#
+# purpose:  Test the cached SeawaterState against the functions.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+
+
+class CachedState(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        self.s = 34 + rng.uniform(0, 2, (20, 4))
+        self.t = np.linspace(25, 2, 20)[:, None] + rng.normal(0, 0.1, (20, 4))
+        self.p = np.linspace(0, 4000, 20)[:, None]
+        self.lat = [-22., -21.5, -21., -20.5]
+        self.state = sw.SeawaterState(self.s, self.t, self.p, lat=self.lat)
+
+    def test_values(self):
+        s, t, p, lat = self.s, self.t, self.p, self.lat
+        expected = dict(ptmp0=sw.ptmp(s, t, p, 0),
+                        alpha=sw.alpha(s, t, p),
+                        beta=sw.beta(s, t, p),
+                        dens=sw.dens(s, t, p),
+                        pden0=sw.pden(s, t, p),
+                        svan=sw.svan(s, t, p),
+                        gpan=sw.gpan(s, t, p),
+                        n2=sw.bfrq(s, t, p, lat)[0],
+                        svel=sw.svel(s, t, p),
+                        depth=sw.dpth(p, lat))
+        for name, value in expected.items():
+            np.testing.assert_array_equal(getattr(self.state, name), value)
+
+    def test_reuse(self):
+        self.state.alpha
+        for name in ('ptmp0', 'aonb', 'beta', 'alpha'):
+            self.assertTrue(name in self.state.cached())
+        ptmp0 = self.state.ptmp0
+        self.assertTrue(self.state.beta is self.state.beta)
+        self.assertTrue(self.state.ptmp0 is ptmp0)
+
+    def test_eviction(self):
+        max_bytes = 2.5 * self.s.nbytes
+        state = sw.SeawaterState(self.s, self.t, self.p, max_bytes=max_bytes)
+        svan = state.svan
+        self.assertTrue(state.nbytes <= max_bytes)
+        self.assertTrue('svan' in state.cached())
+        state.svel
+        state.cp
+        self.assertFalse('svan' in state.cached())
+        np.testing.assert_array_equal(state.svan, svan)
+
+    def test_clear(self):
+        self.state.gpan
+        self.state.clear()
+        self.assertEqual(self.state.nbytes, 0)
+        self.assertEqual(self.state.cached(), [])
+
+    def test_lat(self):
+        state = sw.SeawaterState(self.s, self.t, self.p)
+        self.assertRaises(ValueError, getattr, state, 'depth')
+
+
+if __name__ == '__main__':
+    unittest.main()
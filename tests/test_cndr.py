@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# test_cndr.py
+#
+# purpose:  Test the vectorized cndr against the element-wise loop results.
+#
+# obs:  The expected values come from the element-wise loop of seawater
+# 3.3.1.
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+
+
+class Cndr(unittest.TestCase):
+    def setUp(self):
+        self.s = np.array([35., 20., 38.])
+        self.t = np.array([10., 25., 2.])
+        self.p = np.array([0., 1000., 0.])
+
+    def test_float64(self):
+        np.testing.assert_array_equal(
+            sw.cndr(self.s, self.t, self.p),
+            [0.8875822851264322, 0.7540632248091803, 0.7723804499288939])
+
+    def test_float32(self):
+        # The loop promoted float32 to float64.
+        r = sw.cndr(*[x.astype(np.float32) for x in (self.s, self.t,
+                                                       self.p)])
+        self.assertEqual(r.dtype, np.float64)
+        np.testing.assert_array_equal(
+            r, [0.8875822959389004, 0.7540631927339027, 0.7723804137001509])
+
+    def test_masked(self):
+        mask = [False, True, False]
+        for k in range(3):
+            args = [self.s, self.t, self.p]
+            args[k] = np.ma.masked_array(args[k], mask=mask)
+            r = sw.cndr(*args)
+            self.assertIsInstance(r, np.ma.MaskedArray)
+            np.testing.assert_array_equal(r.mask, mask)
+            np.testing.assert_array_equal(
+                r.compressed(), [0.8875822851264322, 0.7723804499288939])
+
+    def test_masked_same_as_loop(self):
+        # Masked arithmetic rounds the powers differently, the iteration
+        # runs on the valid data to give the loop results exactly.
+        rng = np.random.RandomState(4)
+        n = 8
+        s, t, p = (rng.uniform(20, 40, n), rng.uniform(-2, 30, n),
+                   rng.uniform(0, 5000, n))
+        mask = np.zeros(n, bool)
+        mask[[1, 4]] = True
+        r = sw.cndr(s, np.ma.masked_array(t, mask=mask), p)
+        np.testing.assert_array_equal(r.mask, mask)
+        np.testing.assert_array_equal(
+            r.compressed(), [0.8921727796306542, 1.3222567820441344,
+                             0.79458760816595, 1.0025983666499483,
+                             0.8690667401904811, 0.6619766415182922])
+        expected = sw.cndr(s, t, p)
+        for k in (0, 2):
+            args = [s, t, p]
+            args[k] = np.ma.masked_array(args[k], mask=mask)
+            r = sw.cndr(*args)
+            np.testing.assert_array_equal(r.mask, mask)
+            np.testing.assert_array_equal(r.data[~mask], expected[~mask])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# test_ctd.py
+#
+# purpose:  Test the CTD conversion pipeline against the individual
+#           functions.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater.constants import c3515
+
+
+def _casts(levels, stations, seed=1983):
+    rng = np.random.RandomState(seed)
+    p = np.linspace(0, 5000, levels)[:, None] * np.ones((1, stations))
+    t = 2 + 20 * np.exp(-p / 700.) + rng.normal(0, 0.1, p.shape)
+    s = 34.7 + np.exp(-p / 400.) + rng.normal(0, 0.01, p.shape)
+    lat = rng.uniform(-60, 60, stations)
+    return sw.cndr(s, t, p) * c3515, t, p, lat
+
+
+def _chain(c, t, p, lat):
+    """The same products from the individual functions."""
+    s = sw.salt(c / c3515, t, p)
+    n2, q, p_ave = sw.bfrq(s, t, p, lat)
+    return (s, sw.ptmp(s, t, p), sw.pden(s, t, p) - 1000, sw.svel(s, t, p),
+            sw.dpth(p, lat), np.squeeze(n2), np.squeeze(p_ave))
+
+
+class ProcessCast(unittest.TestCase):
+    def setUp(self):
+        self.c, self.t, self.p, self.lat = _casts(50, 4)
+
+    def assert_same(self, res, expected):
+        self.assertEqual(len(res), len(expected))
+        for x, y in zip(res, expected):
+            np.testing.assert_array_equal(x, y)
+
+    def test_section(self):
+        res = sw.process_cast(self.c, self.t, self.p, self.lat)
+        self.assert_same(res, _chain(self.c, self.t, self.p, self.lat))
+
+    def test_ratio(self):
+        res = sw.process_cast(self.c / c3515, self.t, self.p, self.lat,
+                              ratio=True)
+        self.assert_same(res, _chain(self.c, self.t, self.p, self.lat))
+
+    def test_single_cast(self):
+        c, t, p = self.c[:, 0], self.t[:, 0], self.p[:, 0]
+        res = sw.process_cast(c, t, p, self.lat[0])
+        self.assertEqual(res[0].shape, c.shape)
+        self.assertEqual(res[5].shape, (c.size - 1,))
+        self.assert_same(res, _chain(c, t, p, self.lat[0]))
+
+    def test_out_and_workspace(self):
+        expected = _chain(self.c, self.t, self.p, self.lat)
+        out = tuple(np.empty_like(x) for x in expected)
+        ws = sw.Workspace()
+        for _ in range(2):
+            res = sw.process_cast(self.c, self.t, self.p, self.lat, out=out,
+                                  ws=ws)
+            for x, y in zip(res, out):
+                self.assertTrue(x is y)
+            self.assert_same(res, expected)
+
+    def test_process_casts(self):
+        casts = [tuple(x[:n, k] for x in (self.c, self.t, self.p)) +
+                 (self.lat[k],) for n, k in ((50, 0), (20, 1), (50, 2))]
+        results = list(sw.process_casts(casts))
+        self.assertEqual(len(results), 3)
+        for res, cast in zip(results, casts):
+            self.assert_same(res, _chain(*cast))
+
+    def test_process_casts_memory(self):
+        # Only the work arrays of the current cast length are kept.
+        casts = [tuple(x[:n, 0] for x in (self.c, self.t, self.p)) +
+                 (self.lat[0],) for n in range(10, self.c.shape[0], 5)]
+        ws = sw.Workspace()
+        sw.process_cast(*casts[-1], ws=ws)
+        limit = ws.nbytes
+        for res in sw.process_casts(casts, ws=ws):
+            self.assertTrue(0 < ws.nbytes <= limit)
+
+
+if __name__ == '__main__':
+    unittest.main()
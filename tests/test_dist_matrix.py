@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# test_dist_matrix.py
+#
+# purpose:  Test the all-pairs distances against `dist`.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import seawater as sw
+
+
+class DistMatrix(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        n = 40
+        self.lat = rng.uniform(-80, 80, n)
+        self.lon = rng.uniform(-180, 180, n)
+        self.lat[3], self.lon[5] = self.lat[2], self.lon[4] + 360
+
+    def test_dist(self):
+        for units in ('km', 'nm'):
+            d, a = sw.dist_matrix(self.lat, self.lon, units=units, block=100)
+            for i in range(self.lat.size):
+                lat = np.repeat(self.lat[i], 2 * self.lat.size)
+                lon = np.repeat(self.lon[i], 2 * self.lon.size)
+                # Pairs (i, j) are the even segments of the track.
+                lat[1::2], lon[1::2] = self.lat, self.lon
+                expected = sw.dist(lat, lon, units=units)
+                np.testing.assert_array_equal(d[i], expected[0][::2])
+                np.testing.assert_array_equal(a[i], expected[1][::2])
+            np.testing.assert_array_equal(d, d.T)
+
+    def test_upper(self):
+        d, a = sw.dist_matrix(self.lat, self.lon)
+        i, j = np.triu_indices(self.lat.size, 1)
+        for block in (1, 7, 100, 2 ** 20):
+            du, au = sw.dist_matrix(self.lat, self.lon, upper=True,
+                                    block=block)
+            np.testing.assert_array_equal(du, d[i, j])
+            np.testing.assert_array_equal(au, a[i, j])
+
+    def test_out(self):
+        path = tempfile.mkdtemp()
+        try:
+            out = tuple(os.path.join(path, name) for name in
+                        ('dist.npy', 'angle.npy'))
+            res = sw.dist_matrix(self.lat, self.lon, upper=True, out=out,
+                                 block=50, ws=sw.Workspace())
+            self.assertIsInstance(res[0], np.memmap)
+            expected = sw.dist_matrix(self.lat, self.lon, upper=True)
+            for name, e in zip(out, expected):
+                np.testing.assert_array_equal(np.load(name), e)
+            del res
+        finally:
+            shutil.rmtree(path)
+        out = np.empty((40, 40)), np.empty((40, 40))
+        self.assertIs(sw.dist_matrix(self.lat, self.lon, out=out)[0],
+                      out[0])
+        self.assertRaises(ValueError, sw.dist_matrix, self.lat, self.lon,
+                          upper=True, out=out)
+
+    def test_broadcast(self):
+        d, a = sw.dist_matrix(35, np.arange(30, 40))
+        np.testing.assert_array_equal(np.diag(d, 1),
+                                      sw.dist(35, np.arange(30, 40))[0])
+        self.assertEqual(sw.dist_matrix([], [], upper=True)[0].shape, (0,))
+        self.assertEqual(sw.dist_matrix([1.], [2.], upper=True)[0].shape,
+                         (0,))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+# test_dtype.py
+#
+# purpose:  Test the float32 preserving dtype mode.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater.library import T68conv, T90conv
+
+
+class PreserveDtype(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        n = 100
+        s = rng.uniform(30, 40, n)
+        t = rng.uniform(-2, 30, n)
+        p = rng.uniform(0, 6000, n)
+        self.args = dict(s=s, t=t, p=p, r=sw.cndr(s, t, p),
+                         lat=rng.uniform(-80, 80, n),
+                         lon=rng.uniform(-180, 180, n))
+        sw.set_dtype_mode('preserve')
+
+    def tearDown(self):
+        sw.set_dtype_mode('promote')
+
+    def cases(self, dtype):
+        s, t, p, r, lat, lon = [self.args[k].astype(dtype) for k in
+                                ('s', 't', 'p', 'r', 'lat', 'lon')]
+        S, T, P = [np.tile(x[:10, None], (1, 3)) for x in (s, t, p)]
+        P = np.sort(P, axis=0)
+        return ((sw.adtg, (s, t, p)), (sw.alpha, (s, t, p)),
+                (sw.aonb, (s, t, p)), (sw.beta, (s, t, p)),
+                (sw.cndr, (s, t, p)), (sw.cp, (s, t, p)),
+                (sw.dens0, (s, t)), (sw.dens, (s, t, p)),
+                (sw.dpth, (p, lat)), (sw.fp, (s, p)), (sw.g, (lat,)),
+                (sw.g, (lat, 0)), (sw.pden, (s, t, p)),
+                (sw.pden, (s, t, p, 1000)), (sw.pres, (p, lat)),
+                (sw.ptmp, (s, t, p)), (sw.salt, (r, t, p)),
+                (sw.svel, (s, t, p)), (sw.temp, (s, t, p)),
+                (sw.salds, (r, t)), (sw.salrp, (r, t, p)),
+                (sw.salrt, (t,)), (sw.seck, (s, t, p)), (sw.sals, (r, t)),
+                (sw.smow, (t,)), (T68conv, (t,)), (T90conv, (t,)),
+                (sw.f, (lat,)), (sw.satAr, (s, t)), (sw.satN2, (s, t)),
+                (sw.satO2, (s, t)), (sw.swvel, (p, p / 2)),
+                (sw.svan, (s, t, p)), (sw.state, (s, t, p)),
+                (sw.dist, (lat, lon)), (sw.gpan, (S, T, P)),
+                (sw.bfrq, (S, T, P)))
+
+    def test_float32(self):
+        for (func, args), (_, args64) in zip(self.cases(np.float32),
+                                             self.cases(np.float64)):
+            res = func(*args)
+            if not isinstance(res, tuple):
+                res = (res,)
+            sw.set_dtype_mode('promote')
+            expected = func(*args64)
+            sw.set_dtype_mode('preserve')
+            if not isinstance(expected, tuple):
+                expected = (expected,)
+            for x, y in zip(res, expected):
+                self.assertEqual(np.asarray(x).dtype, np.float32,
+                                 msg=func.__name__)
+                if func is sw.bfrq:
+                    continue  # Differences of float32 densities.
+                # Inputs rounded to float32 on top of the computation.
+                scale = np.nanmax(np.abs(y))
+                np.testing.assert_allclose(x, y, rtol=0, atol=1e-4 * scale,
+                                           err_msg=func.__name__)
+
+    def test_float64_unchanged(self):
+        for func, args in self.cases(np.float64):
+            res = func(*args)
+            sw.set_dtype_mode('promote')
+            expected = func(*args)
+            sw.set_dtype_mode('preserve')
+            if not isinstance(res, tuple):
+                res, expected = (res,), (expected,)
+            for x, y in zip(res, expected):
+                self.assertEqual(np.asarray(x).dtype, np.float64)
+                np.testing.assert_array_equal(x, y, err_msg=func.__name__)
+
+    def test_integers(self):
+        self.assertEqual(sw.aonb([35], [10], [4000]).dtype, np.float64)
+        self.assertEqual(sw.dens(35, 10, 1000).dtype, np.float64)
+
+    def test_mixed(self):
+        s, t = self.args['s'], self.args['t']
+        self.assertEqual(sw.dens0(s.astype(np.float32), t).dtype,
+                         np.float64)
+        self.assertEqual(sw.dens0(s.astype(np.float32), 10.).dtype,
+                         np.float32)
+
+    def test_cndr_tolerance(self):
+        s, t, p = [self.args[k][:10] for k in ('s', 't', 'p')]
+        sw.set_dtype_mode('promote')
+        expected = sw.cndr(s, t, p)
+        res = sw.cndr(*[x.astype(np.float32) for x in (s, t, p)])
+        sw.set_dtype_mode('preserve')
+        # Iterated to 1e-10 in float64, as the float64 input.
+        self.assertEqual(res.dtype, np.float64)
+        np.testing.assert_allclose(res, expected, rtol=1e-6)
+
+    def test_mode(self):
+        self.assertEqual(sw.get_dtype_mode(), 'preserve')
+        self.assertRaises(NameError, sw.set_dtype_mode, 'float16')
+        self.assertEqual(sw.set_dtype_mode('promote'), 'promote')
+        self.assertEqual(sw.get_dtype_mode(), 'promote')
+
+
+class PromoteDtype(unittest.TestCase):
+    def setUp(self):
+        self.s = np.array([35., 30., 38.], np.float32)
+        self.t = np.array([10., 2., 25.], np.float32)
+        self.p = np.array([0., 1000., 4000.], np.float32)
+
+    def test_float32(self):
+        # Same values and dtypes as the original expressions.
+        s, t, p = self.s, self.t, self.p
+        cases = [(sw.alpha, np.float64, [0.000167161012154287,
+                                         9.074803287334485e-05,
+                                         0.00033879054629682077]),
+                 (sw.aonb, np.float64, [0.21980299055576324,
+                                        0.11786810728776952,
+                                        0.4795348505443831]),
+                 (sw.beta, np.float32, [0.0007605038117617369,
+                                        0.000769911683164537,
+                                        0.0007064982783049345]),
+                 (sw.svan, np.float32, [1.0933727025985718e-06,
+                                        3.908935468643904e-06,
+                                        3.874010872095823e-06])]
+        for func, dtype, expected in cases:
+            res = func(s, t, p)
+            self.assertEqual(res.dtype, dtype, msg=func.__name__)
+            np.testing.assert_array_equal(res, expected,
+                                          err_msg=func.__name__)
+
+    def test_gpan_float32(self):
+        res = sw.gpan(self.s[:, None], self.t[:, None], self.p[:, None])
+        self.assertEqual(res.dtype, np.float32)
+        np.testing.assert_array_equal(res, [0.0, 25.01154136657715,
+                                            141.7557373046875])
+
+    def test_out(self):
+        s, t, p = self.s, self.t, self.p
+        out, ws = np.empty(3), sw.Workspace()
+        res = sw.alpha(s, t, p, out=out, ws=ws)
+        self.assertIs(res, out)
+        np.testing.assert_array_equal(res, sw.alpha(s, t, p))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# test_duck.py
+#
+# purpose:  Test that duck arrays are not converted to ndarrays.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater.library import T68conv, T90conv
+
+NDArrayOperatorsMixin = getattr(np.lib.mixins, 'NDArrayOperatorsMixin', None)
+
+
+def _dummy(x):
+    """Placeholder with the shape and dtype of `x`, used to work out the
+    shape and dtype of a result without computing it."""
+    if isinstance(x, LazyArray):
+        return np.ones(x.shape, x.dtype)
+    if isinstance(x, (list, tuple)):
+        return type(x)(_dummy(v) for v in x)
+    if isinstance(x, dict):
+        return dict((k, _dummy(v)) for k, v in x.items())
+    return x
+
+
+def _compute(x):
+    if isinstance(x, LazyArray):
+        return x.compute()
+    if isinstance(x, (list, tuple)):
+        return type(x)(_compute(v) for v in x)
+    if isinstance(x, dict):
+        return dict((k, _compute(v)) for k, v in x.items())
+    return x
+
+
+def _defer(func, args, kwargs):
+    """Lazy result of `func(*args, **kwargs)`, one LazyArray per output."""
+    with np.errstate(all='ignore'):
+        meta = func(*_dummy(args), **_dummy(kwargs))
+
+    def thunk():
+        LazyArray.evaluations += 1
+        return func(*_compute(args), **_compute(kwargs))
+
+    if isinstance(meta, (list, tuple)):
+        whole = LazyArray(thunk, (), object)
+        return type(meta)(LazyArray(lambda k=k: whole.compute()[k], m.shape,
+                                    m.dtype) for k, m in enumerate(meta))
+    meta = np.asarray(meta)
+    return LazyArray(thunk, meta.shape, meta.dtype)
+
+
+class LazyArray(NDArrayOperatorsMixin or object):
+    """Minimal lazy duck array.  Operations build a deferred computation
+    that only runs on `compute()`, converting it to an ndarray is an
+    error."""
+    evaluations = 0
+
+    def __init__(self, thunk, shape, dtype):
+        self._thunk = thunk
+        self._value = None
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+
+    @classmethod
+    def from_array(cls, values):
+        values = np.asarray(values)
+        return cls(lambda: values, values.shape, values.dtype)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def compute(self):
+        if self._value is None:
+            self._value = self._thunk()
+        return self._value
+
+    def __array__(self, dtype=None, copy=None):
+        raise AssertionError("LazyArray converted to ndarray.")
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if kwargs.get('out') is not None:
+            return NotImplemented
+        return _defer(getattr(ufunc, method), inputs, kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        return _defer(func, args, kwargs)
+
+    def __getitem__(self, key):
+        return _defer(lambda x: x[key], (self,), {})
+
+    def reshape(self, *shape):
+        return _defer(lambda x: x.reshape(*shape), (self,), {})
+
+    def astype(self, dtype):
+        return _defer(lambda x: x.astype(dtype), (self,), {})
+
+
+def _lazy(*arrays):
+    return [LazyArray.from_array(x) for x in arrays]
+
+
+@unittest.skipIf(NDArrayOperatorsMixin is None or
+                 not hasattr(np.ndarray, '__array_function__'),
+                 "NumPy without the array function protocol")
+class DuckArrays(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        n = 50
+        self.s = rng.uniform(30, 37, n)
+        self.t = rng.uniform(-1, 30, n)
+        self.p = rng.uniform(0, 6000, n)
+        self.r = rng.uniform(0.5, 1.5, n)
+        self.lat = rng.uniform(-80, 80, n)
+        self.lon = rng.uniform(-180, 180, n)
+        LazyArray.evaluations = 0
+
+    def check(self, func, args, **kw):
+        expected = func(*args, **kw)
+        res = func(*_lazy(*args), **kw)
+        self.assertEqual(LazyArray.evaluations, 0, msg=func.__name__)
+        if not isinstance(expected, tuple):
+            res, expected = (res,), (expected,)
+        for x, y in zip(res, expected):
+            self.assertTrue(isinstance(x, LazyArray), msg=func.__name__)
+            self.assertEqual(x.shape, np.shape(y), msg=func.__name__)
+            np.testing.assert_array_equal(x.compute(), y,
+                                          err_msg=func.__name__)
+        LazyArray.evaluations = 0
+
+    def test_elementwise(self):
+        s, t, p, r, lat = self.s, self.t, self.p, self.r, self.lat
+        for func, args in ((sw.adtg, (s, t, p)),
+                           (sw.alpha, (s, t, p)),
+                           (sw.aonb, (s, t, p)),
+                           (sw.beta, (s, t, p)),
+                           (sw.cndr, (s, t, p)),
+                           (sw.cp, (s, t, p)),
+                           (sw.dens0, (s, t)),
+                           (sw.dens, (s, t, p)),
+                           (sw.dpth, (p, lat)),
+                           (sw.fp, (s, p)),
+                           (sw.g, (lat, -p)),
+                           (sw.pden, (s, t, p, 1000.)),
+                           (sw.pres, (p, lat)),
+                           (sw.ptmp, (s, t, p, 1000.)),
+                           (sw.salt, (r, t, p)),
+                           (sw.svel, (s, t, p)),
+                           (sw.temp, (s, t, p, 1000.)),
+                           (sw.salds, (r ** 0.5, t - 15)),
+                           (sw.salrp, (r, t, p)),
+                           (sw.salrt, (t,)),
+                           (sw.seck, (s, t, p)),
+                           (sw.sals, (r, t)),
+                           (sw.smow, (t,)),
+                           (T68conv, (t,)),
+                           (T90conv, (t,)),
+                           (sw.f, (lat,)),
+                           (sw.satAr, (s, t)),
+                           (sw.satN2, (s, t)),
+                           (sw.satO2, (s, t)),
+                           (sw.swvel, (p, p / 2)),
+                           (sw.svan, (s, t, p)),
+                           (sw.state, (s, t, p))):
+            self.check(func, args)
+        self.check(sw.alpha, (s, sw.ptmp(s, t, p), p), pt=True)
+        self.check(sw.dens, (s, 20., p))
+
+    def test_dist(self):
+        # Crosses the date line.
+        self.check(sw.dist, (self.lat, self.lon))
+        self.check(sw.dist, (self.lat, self.lon), units='nm')
+
+    def test_profiles(self):
+        rng = np.random.RandomState(1983)
+        s = 34 + rng.uniform(0, 2, (20, 4))
+        t = np.linspace(25, 2, 20)[:, None] + rng.normal(0, 0.1, (20, 4))
+        p = np.linspace(0, 4000, 20)[:, None] * np.ones((1, 4))
+        lat, lon = np.array([-22., -21.5, -21., -20.5]), np.zeros(4)
+        self.check(sw.gpan, (s, t, p))
+        self.check(sw.bfrq, (s, t, p))
+        self.check(sw.bfrq, (s, t, p, lat))
+        self.check(sw.gvel, (sw.gpan(s, t, p), lat, lon))
+
+    def test_no_conversion(self):
+        s, = _lazy(self.s)
+        self.assertRaises(AssertionError, np.asarray, s)
+
+
+if __name__ == '__main__':
+    unittest.main()
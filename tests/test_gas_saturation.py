@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# test_gas_saturation.py
+#
+# purpose:  Test the fused gas saturation against satO2, satN2 and satAr.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater.extras import _molar_volume
+
+
+class GasSaturation(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        shape = (20, 30)
+        self.s = rng.uniform(20, 40, shape)
+        self.t = rng.uniform(-2, 35, shape)
+        self.p = rng.uniform(0, 5000, shape)
+        self.o2 = rng.uniform(1, 9, shape)
+        self.sat = dict(O2=sw.satO2, N2=sw.satN2, Ar=sw.satAr)
+
+    def test_ml_l(self):
+        for gases in (('O2', 'N2', 'Ar'), ('Ar', 'O2'), ('N2',)):
+            res = sw.gas_saturation(self.s, self.t, gases)
+            self.assertEqual(len(res), len(gases))
+            for gas, r in zip(gases, res):
+                np.testing.assert_array_equal(r, self.sat[gas](self.s,
+                                                               self.t))
+        np.testing.assert_array_equal(sw.gas_saturation(self.s, self.t, 'Ar'),
+                                      sw.satAr(self.s, self.t))
+        self.assertRaises(NameError, sw.gas_saturation, self.s, self.t,
+                          'CO2')
+        self.assertRaises(NameError, sw.gas_saturation, self.s, self.t,
+                          units='mg/l')
+
+    def test_umol_kg(self):
+        dens = sw.dens(self.s, self.t, self.p)
+        res = sw.gas_saturation(self.s, self.t, p=self.p, units='umol/kg')
+        for gas, r in zip(('O2', 'N2', 'Ar'), res):
+            expected = (self.sat[gas](self.s, self.t) * 1e6 /
+                        (_molar_volume[gas] * dens))
+            np.testing.assert_allclose(r, expected, rtol=1e-14)
+
+    def test_o2(self):
+        sat = sw.satO2(self.s, self.t)
+        for gases in ('O2', ('N2',), ()):
+            res = sw.gas_saturation(self.s, self.t, gases, o2=self.o2)
+            percent, aou = res[-2:]
+            np.testing.assert_array_equal(percent, self.o2 * 100 / sat)
+            np.testing.assert_array_equal(aou, sat - self.o2)
+        # AOU and the saturation are zero and 100% at saturation.
+        o2 = sw.gas_saturation(self.s, self.t, (), p=self.p,
+                               units='umol/kg', o2=0)[1]
+        percent, aou = sw.gas_saturation(self.s, self.t, (), p=self.p,
+                                         units='umol/kg', o2=o2)
+        np.testing.assert_allclose(percent, 100, rtol=1e-14)
+        np.testing.assert_array_equal(aou, 0)
+
+    def test_out(self):
+        ws = sw.Workspace()
+        out = tuple(np.empty(self.s.shape) for _ in range(4))
+        res = sw.gas_saturation(self.s, self.t, ('O2', 'Ar'), o2=self.o2,
+                                out=out, ws=ws)
+        for r, o in zip(res, out):
+            self.assertIs(r, o)
+        np.testing.assert_array_equal(out[1], sw.satAr(self.s, self.t))
+        self.assertRaises(ValueError, sw.gas_saturation, self.s, self.t,
+                          ('O2', 'Ar'), out=out)
+        self.assertEqual(np.ndim(sw.gas_saturation(35, 10, 'O2')), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# test_incremental.py
+#
+# purpose:  Test the incremental geopotential anomaly against `gpan`.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+
+
+class GpanAccumulator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        self.p = np.linspace(5, 2000, 60)[:, None] * np.ones((1, 3))
+        self.t = 2 + 20 * np.exp(-self.p / 700.) + rng.normal(0, 0.1,
+                                                             self.p.shape)
+        self.s = 34.7 + np.exp(-self.p / 400.)
+
+    def append_all(self, acc, s, t, p, sizes):
+        """Appends the levels in pieces of `sizes` and checks each piece
+        against `gpan` on the full profile."""
+        expected = sw.gpan(s, t, p)
+        start = 0
+        for size in sizes:
+            end = start + size
+            res = acc.append(s[start:end], t[start:end], p[start:end])
+            np.testing.assert_array_equal(res,
+                                          np.squeeze(expected[start:end]))
+            start = end
+
+    def test_matches_gpan(self):
+        s, t, p = self.s, self.t, self.p
+        expected = sw.gpan(s, t, p)
+        for sizes in ((60,), (1,) * 60, (7, 1, 20, 2, 30)):
+            acc = sw.GpanAccumulator()
+            self.append_all(acc, s, t, p, sizes)
+            np.testing.assert_array_equal(acc.gpan, expected)
+            self.assertEqual(acc.levels, 60)
+
+    def test_single_profile(self):
+        s, t, p = self.s[:, 0], self.t[:, 0], self.p[:, 0]
+        acc = sw.GpanAccumulator()
+        self.append_all(acc, s, t, p, (10, 25, 25))
+        np.testing.assert_array_equal(acc.gpan, sw.gpan(s, t, p))
+
+    def test_empty(self):
+        self.assertTrue(sw.GpanAccumulator().gpan is None)
+
+    def test_station_mismatch(self):
+        acc = sw.GpanAccumulator()
+        acc.append(self.s[:5], self.t[:5], self.p[:5])
+        self.assertRaises(ValueError, acc.append, self.s[5:10, :2],
+                          self.t[5:10, :2], self.p[5:10, :2])
+
+
+if __name__ == '__main__':
+    unittest.main()
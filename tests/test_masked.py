@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# test_masked.py
+#
+# purpose:  Test the evaluation on the valid cells only against the full grid.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+
+
+class MaskedGrid(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        shape = (8, 5, 6)
+        self.land = rng.uniform(0, 1, shape[1:]) < 0.3
+        p = np.linspace(0, 4000, shape[0])[:, None, None] * np.ones(shape)
+        t = 2 + 20 * np.exp(-p / 700.) + rng.normal(0, 0.1, shape)
+        s = 34.7 + np.exp(-p / 400.) + rng.normal(0, 0.01, shape)
+        s[:, self.land] = t[:, self.land] = np.NaN
+        self.s, self.t, self.p = s, t, p
+        self.index = sw.masked.MaskIndex(self.land, shape=shape)
+
+    def assert_valid(self, res, expected, mask):
+        np.testing.assert_array_equal(res[~mask], expected[~mask])
+        self.assertTrue(np.isnan(res[mask]).all())
+
+    def test_nan(self):
+        for func in (sw.dens, sw.svel, sw.ptmp):
+            with np.errstate(invalid='ignore'):
+                expected = func(self.s, self.t, self.p)
+            res = sw.masked.run(func, (self.s, self.t, self.p))
+            self.assert_valid(res, expected, self.index.mask)
+
+    def test_index(self):
+        ws = sw.Workspace()
+        for pr in (0, 1000):
+            with np.errstate(invalid='ignore'):
+                expected = sw.pden(self.s, self.t, self.p, pr)
+            res = sw.masked.run(sw.pden, (self.s, self.t, self.p, pr),
+                                index=self.index, ws=ws)
+            self.assert_valid(res, expected, self.index.mask)
+        self.assertRaises(ValueError, sw.masked.run, sw.dens,
+                          (self.s[0], self.t[0], self.p[0]),
+                          index=self.index)
+
+    def test_mask(self):
+        s = np.where(np.isnan(self.s), 35, self.s)
+        mask = np.zeros(self.s.shape, bool)
+        mask[:, self.land] = True
+        out = np.empty(s.shape)
+        res = sw.masked.run(sw.dens0, (s, 10.), mask=self.land, out=out,
+                            fill_value=0)
+        self.assertIs(res, out)
+        np.testing.assert_array_equal(res[~mask], sw.dens0(s, 10.)[~mask])
+        self.assertTrue((res[mask] == 0).all())
+
+    def test_masked_array(self):
+        s = np.ma.masked_invalid(self.s)
+        t = np.ma.masked_invalid(self.t)
+        res = sw.masked.run(sw.svel, (s, t, self.p))
+        self.assertIsInstance(res, np.ma.MaskedArray)
+        np.testing.assert_array_equal(res.mask, self.index.mask)
+        np.testing.assert_array_equal(res.compressed(),
+                                      sw.svel(s, t, self.p).compressed())
+
+    def test_array_kwargs(self):
+        pr = np.linspace(0, 1000, self.s.shape[-1]) * np.ones(self.s.shape)
+        pr[0, 0, 0] = np.NaN
+        with np.errstate(invalid='ignore'):
+            expected = sw.ptmp(self.s, self.t, self.p, pr=pr)
+        mask = self.index.mask | np.isnan(pr)
+        res = sw.masked.run(sw.ptmp, (self.s, self.t, self.p), pr=pr)
+        self.assert_valid(res, expected, mask)
+        res = sw.masked.run(sw.ptmp, (self.s, self.t, self.p),
+                            index=self.index, pr=pr[0])
+        self.assert_valid(res, sw.ptmp(self.s, self.t, self.p, pr=pr[0]),
+                          self.index.mask | np.isnan(pr[0]))
+        self.assertRaises(ValueError, sw.masked.run, sw.ptmp,
+                          (self.s, self.t, self.p), pr=pr[:, :2])
+
+    def test_remask_with_index(self):
+        s = np.ma.masked_invalid(self.s)
+        res = sw.masked.run(sw.dens, (s, self.t, self.p), index=self.index)
+        np.testing.assert_array_equal(res.mask, self.index.mask)
+        # The result owns its mask, the index is untouched.
+        cell = np.unravel_index(self.index.flat[0], res.shape)
+        res[cell] = np.ma.masked
+        self.assertTrue(res.mask[cell])
+        self.assertFalse(self.index.mask[cell])
+
+    def test_tuple(self):
+        def state(s, t, p):
+            return sw.dens(s, t, p), sw.svel(s, t, p)
+
+        lat = np.linspace(-40, -30, self.s.shape[-1])
+        lat[0] = np.NaN
+        with np.errstate(invalid='ignore'):
+            expected = state(self.s, self.t, self.p)
+            z = sw.dpth(self.p, lat)
+        res = sw.masked.wrap(state)(self.s, self.t, self.p)
+        for r, e in zip(res, expected):
+            self.assert_valid(r, e, self.index.mask)
+        mask = np.broadcast_to(np.isnan(lat), z.shape)
+        self.assert_valid(sw.masked.wrap(sw.dpth)(self.p, lat), z, mask)
+
+    def test_whole(self):
+        self.assertRaises(ValueError, sw.masked.run, sw.bfrq,
+                          (self.s, self.t, self.p))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# test_parallel.py
+#
+# purpose:  Test the multi-threaded evaluation.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import gc
+import threading
+import unittest
+import weakref
+
+import numpy as np
+import seawater as sw
+
+
+class Parallel(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        shape = (1001, 3)
+        self.s = rng.uniform(30, 37, shape)
+        self.t = rng.uniform(-1, 30, shape)
+        self.p = rng.uniform(0, 6000, shape)
+
+    def test_same_results(self):
+        s, t, p = self.s, self.t, self.p
+        for func, args, kw in ((sw.dens, (s, t, p), {}),
+                               (sw.ptmp, (s, t, p), dict(pr=1000.)),
+                               (sw.svel, (s, t, p), {}),
+                               (sw.cndr, (s, t, p), {}),
+                               (sw.dpth, (p, np.array([-30., 0., 30.])), {}),
+                               (sw.state, (s, t, p), {})):
+            expected = func(*args, **kw)
+            if not isinstance(expected, tuple):
+                expected = (expected,)
+            for workers, chunksize in ((4, None), (3, 100), (2, 1), (1, None)):
+                res = sw.parallel.run(func, args, workers=workers,
+                                      chunksize=chunksize, **kw)
+                if not isinstance(res, tuple):
+                    res = (res,)
+                for x, y in zip(res, expected):
+                    self.assertEqual(x.dtype, y.dtype)
+                    np.testing.assert_array_equal(x, y, err_msg=func.__name__)
+
+    def test_out_and_dtype(self):
+        s, t, p = [x.astype(np.float32) for x in (self.s, self.t, self.p)]
+        expected = sw.dens(s, t, p)
+        out = np.empty_like(expected)
+        dens = sw.parallel.wrap(sw.dens, workers=4, chunksize=256)
+        self.assertTrue(dens(s, t, p, out=out) is out)
+        np.testing.assert_array_equal(out, expected)
+        self.assertEqual(dens(s, t, p).dtype, expected.dtype)
+
+    def test_small_and_masked(self):
+        self.assertEqual(sw.parallel.run(sw.dens, (35., 20., 1000.)),
+                         sw.dens(35., 20., 1000.))
+        s = np.ma.masked_greater(self.s, 36)
+        res = sw.parallel.run(sw.dens, (s, self.t, self.p), workers=4)
+        expected = sw.dens(s, self.t, self.p)
+        np.testing.assert_array_equal(res.mask, expected.mask)
+        np.testing.assert_array_equal(res.compressed(), expected.compressed())
+
+    def test_workspaces_released(self):
+        refs = []
+
+        def dens(s, t, p, out=None, ws=None):
+            refs.append(weakref.ref(ws))
+            return sw.dens(s, t, p, out=out, ws=ws)
+
+        sw.parallel.run(dens, (self.s, self.t, self.p), workers=4,
+                        chunksize=300)
+        self.assertTrue(refs)
+        gc.collect()
+        self.assertFalse([ref for ref in refs if ref() is not None])
+
+    def test_one_pool_per_size(self):
+        pools = []
+
+        def get():
+            pools.append(sw.parallel._pool(7))
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(map(id, pools))), 1)
+
+    def test_profiles(self):
+        self.assertRaises(ValueError, sw.parallel.run, sw.gpan,
+                          (self.s, self.t, self.p))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# test_profiling.py
+#
+# purpose:  Test the call counters and timers.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater import eos80, geostrophic, profiling
+
+
+class Profiling(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        shape = (200, 3)
+        self.s = rng.uniform(30, 37, shape)
+        self.t = rng.uniform(-1, 30, shape)
+        self.p = np.sort(rng.uniform(0, 6000, shape), axis=0)
+        profiling.reset()
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_enable_disable(self):
+        dens, pden = sw.dens, eos80.dens
+        profiling.enable()
+        self.assertTrue(profiling.enabled())
+        self.assertFalse(sw.dens is dens)
+        self.assertTrue(sw.dens.__wrapped__ is dens)
+        self.assertTrue(geostrophic.dens is sw.dens)
+        self.assertEqual(sw.dens.__name__, 'dens')
+        profiling.disable()
+        self.assertFalse(profiling.enabled())
+        self.assertTrue(sw.dens is dens)
+        self.assertTrue(eos80.dens is pden)
+        self.assertTrue(geostrophic.dens is dens)
+        sw.dens(self.s, self.t, self.p)
+        self.assertEqual(profiling.stats(), {})
+
+    def test_classes_untouched(self):
+        workspace, accumulator = sw.Workspace, sw.GpanAccumulator
+        profiling.enable()
+        self.assertTrue(sw.Workspace is workspace)
+        self.assertTrue(sw.GpanAccumulator is accumulator)
+        ws = sw.Workspace()
+        self.assertTrue(isinstance(ws, sw.Workspace))
+        sw.dens(self.s, self.t, self.p, ws=ws)
+        self.assertTrue(isinstance(ws, sw.Workspace))
+        self.assertFalse([name for name in profiling.stats() if
+                          name[0].isupper()])
+
+    def test_counters(self):
+        s, t, p = self.s, self.t, self.p
+        expected = sw.dens(s, t, p), sw.state(s, t, p)
+        profiling.enable()
+        res = sw.dens(s, t, p), sw.dens(s[0], t[0], p[0]), sw.state(s, t, p)
+        np.testing.assert_array_equal(res[0], expected[0])
+        for x, y in zip(res[2], expected[1]):
+            np.testing.assert_array_equal(x, y)
+        sw.pden(s, t, p, pr=1000)
+        stats = profiling.stats()
+        # `pden` calls `ptmp` and `dens`, only the outer call is recorded.
+        self.assertEqual(sorted(stats), ['dens', 'pden', 'state'])
+        self.assertEqual(stats['dens']['calls'], 2)
+        self.assertEqual(stats['dens']['elements'], s.size + 3)
+        self.assertEqual(stats['dens']['nbytes'], 8 * (s.size + 3))
+        self.assertEqual(stats['state']['nbytes'],
+                         sum(x.nbytes for x in res[2]))
+        for entry in stats.values():
+            self.assertTrue(0 < entry['max'] <= entry['total'])
+        report = profiling.report().splitlines()
+        self.assertEqual(len(report), 4)
+        profiling.reset()
+        self.assertEqual(profiling.stats(), {})
+
+    def test_parallel_and_stream(self):
+        s, t, p = self.s, self.t, self.p
+        expected = sw.dens(s, t, p)
+        profiling.enable()
+        res = sw.parallel.run(sw.dens, (s, t, p), workers=3, chunksize=120)
+        np.testing.assert_array_equal(res, expected)
+        self.assertEqual(profiling.stats()['dens']['calls'], 5)
+        profiling.reset()
+        blocks = [(s[:100], t[:100], p[:100]), (s[100:], t[100:], p[100:])]
+        res = np.concatenate(list(sw.stream.evaluate(sw.dens, blocks)))
+        np.testing.assert_array_equal(res, expected)
+        self.assertEqual(profiling.stats()['dens']['calls'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
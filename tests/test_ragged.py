@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# test_ragged.py
+#
+# purpose:  Test the Ragged profiles against NaN padded arrays.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+
+
+class RaggedProfiles(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        self.lengths = [30, 1, 0, 45, 12, 45]
+        shape = (max(self.lengths), len(self.lengths))
+        p = np.linspace(0, 4000, shape[0])[:, None] * np.ones(shape)
+        t = 2 + 20 * np.exp(-p / 700.) + rng.normal(0, 0.1, shape)
+        s = 34.7 + np.exp(-p / 400.) + rng.normal(0, 0.01, shape)
+        for k, n in enumerate(self.lengths):
+            s[n:, k] = t[n:, k] = p[n:, k] = np.NaN
+        self.padded = s, t, p
+        self.ragged = [sw.Ragged.from_padded(x) for x in (s, t, p)]
+        self.lat = rng.uniform(-40, -30, shape[1])
+        self.lon = np.linspace(-40, -30, shape[1])
+
+    def assert_padded(self, ragged, padded):
+        res = ragged.to_padded()
+        np.testing.assert_array_equal(res, padded[:res.shape[0]])
+        self.assertTrue(np.isnan(padded[res.shape[0]:]).all())
+
+    def test_layout(self):
+        s = self.ragged[0]
+        np.testing.assert_array_equal(s.lengths, self.lengths)
+        np.testing.assert_array_equal(s[3], self.padded[0][:45, 3])
+        np.testing.assert_array_equal(s.to_padded(), self.padded[0])
+        self.assertRaises(ValueError, sw.Ragged, [1., 2.], [0, 3])
+
+    def test_vertical_operations(self):
+        p = sw.Ragged.from_profiles([[0., 10., 30.], [5.], [0., 20.]])
+        np.testing.assert_array_equal(p.diff().values, [10., 20., 20.])
+        np.testing.assert_array_equal(p.diff().lengths, [2, 0, 1])
+        np.testing.assert_array_equal(p.mid().values, [5., 20., 10.])
+        np.testing.assert_array_equal(p.cumsum().values,
+                                      [0., 10., 40., 5., 0., 20.])
+
+    def test_gpan(self):
+        with np.errstate(invalid='ignore'):
+            expected = sw.gpan(*self.padded)
+        self.assert_padded(sw.gpan(*self.ragged), expected)
+
+    def test_bfrq(self):
+        for lat in (None, self.lat):
+            with np.errstate(invalid='ignore'):
+                expected = sw.bfrq(*self.padded, lat=lat)
+            res = sw.bfrq(*self.ragged, lat=lat)
+            for x, y in zip(res, expected):
+                np.testing.assert_array_equal(x.lengths,
+                                              np.maximum(self.ragged[0]
+                                                         .lengths - 1, 0))
+                self.assert_padded(x, y)
+
+    def test_gvel(self):
+        with np.errstate(invalid='ignore'):
+            ga = sw.gpan(*self.padded)
+            expected = sw.gvel(ga, self.lat, self.lon)
+        res = sw.gvel(sw.gpan(*self.ragged), self.lat, self.lon)
+        lengths = np.minimum(self.lengths[:-1], self.lengths[1:])
+        np.testing.assert_array_equal(res.lengths, lengths)
+        self.assert_padded(res, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# test_scalar.py
+#
+# purpose:  Test the pure Python scalar routines against the array ones.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater import scalar
+from seawater.library import T68conv, T90conv
+
+
+class Scalar(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        n = 200
+        self.s = rng.uniform(0, 42, n)
+        self.t = rng.uniform(-2, 40, n)
+        self.p = rng.uniform(0, 10000, n)
+        self.r = sw.cndr(self.s, self.t, self.p)
+        self.lat = rng.uniform(-90, 90, n)
+        self.lon = rng.uniform(-180, 180, n)
+
+    def check(self, name, args, rtol=0, atol=0, **kw):
+        func = getattr(scalar, name)
+        array = dict(T68conv=T68conv, T90conv=T90conv).get(name)
+        array = array or getattr(sw, name)
+        expected = array(*args, **kw)
+        res = [func(*[float(x) for x in xs], **kw) for xs in zip(*args)]
+        self.assertTrue(all(type(x) is float for x in res), msg=name)
+        np.testing.assert_allclose(res, expected, rtol=rtol, atol=atol,
+                                   err_msg=name)
+
+    def test_elementwise(self):
+        s, t, p, r, lat = self.s, self.t, self.p, self.r, self.lat
+        for name, args in (('adtg', (s, t, p)),
+                           ('alpha', (s, t, p)),
+                           ('aonb', (s, t, p)),
+                           ('beta', (s, t, p)),
+                           ('cp', (s, t, p)),
+                           ('dens0', (s, t)),
+                           ('dens', (s, t, p)),
+                           ('dpth', (p, lat)),
+                           ('fp', (s, p)),
+                           ('g', (lat, -p)),
+                           ('pden', (s, t, p, p / 2)),
+                           ('pres', (p, lat)),
+                           ('ptmp', (s, t, p, p / 2)),
+                           ('salt', (r, t, p)),
+                           ('svel', (s, t, p)),
+                           ('svan', (s, t, p)),
+                           ('temp', (s, t, p, p / 2)),
+                           ('salds', (r ** 0.5, t - 15)),
+                           ('salrp', (r, t, p)),
+                           ('salrt', (t,)),
+                           ('seck', (s, t, p)),
+                           ('sals', (r, t)),
+                           ('smow', (t,)),
+                           ('T68conv', (t,)),
+                           ('T90conv', (t,)),
+                           ('f', (lat,))):
+            self.check(name, args)
+        # NumPy's vectorized exp, log and tanh round differently from the
+        # math module.
+        for name, args in (('satAr', (s, t)),
+                           ('satN2', (s, t)),
+                           ('satO2', (s, t)),
+                           ('swvel', (p + 1, p))):
+            self.check(name, args, rtol=1e-13)
+        self.check('T90conv', (t,), t_type='T48')
+        self.check('alpha', (s, t, p), pt=True)
+
+    def test_cndr(self):
+        # The Newton-Raphson iteration stops at the same point, but the
+        # scalar and vectorized steps may round differently.
+        s, t, p = self.s[self.s > 2], self.t[self.s > 2], self.p[self.s > 2]
+        self.check('cndr', (s, t, p), rtol=1e-14)
+
+    def test_dist(self):
+        lat, lon = list(self.lat[:20]), list(self.lon[:20])
+        for units in ('km', 'nm'):
+            expected = sw.dist(lat, lon, units=units)
+            res = scalar.dist(lat, lon, units=units)
+            np.testing.assert_allclose(res, expected, rtol=1e-13)
+        np.testing.assert_allclose(scalar.dist(10., lon), sw.dist(10., lon),
+                                   rtol=1e-13)
+
+    def test_nan(self):
+        self.assertTrue(np.isnan(scalar.dens(np.nan, 10., 0.)))
+        self.assertTrue(np.isnan(scalar.svel(-1., 10., 0.)))
+        self.assertTrue(np.isnan(scalar.cndr(np.nan, 10., 0.)))
+
+    def test_without_numpy(self):
+        code = ("import sys; sys.modules['numpy'] = None; "
+                "import seawater, seawater.scalar as s; "
+                "assert not hasattr(seawater, 'dens'); "
+                "print(repr(s.dens(35., 10., 1000.)))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        res = subprocess.check_output([sys.executable, '-c', code], env=env)
+        self.assertEqual(float(res), sw.dens(35., 10., 1000.))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# test_state.py
+#
+# purpose:  Test the one-pass `state` against the individual functions.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+
+
+class OnePassState(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        self.s = rng.uniform(0, 42, (50, 3))
+        self.t = rng.uniform(-2, 35, (50, 3))
+        self.p = np.linspace(0, 10000, 50)[:, None]
+        self.pr = 1000.
+        self.outputs = ('dens0', 'seck', 'dens', 'sigma', 'svan', 'pden')
+
+    def expected(self, name):
+        s, t, p, pr = self.s, self.t, self.p, self.pr
+        return dict(dens0=lambda: sw.dens0(s, t),
+                    seck=lambda: sw.seck(s, t, p),
+                    dens=lambda: sw.dens(s, t, p),
+                    sigma=lambda: sw.dens(s, t, p) - 1000,
+                    svan=lambda: sw.svan(s, t, p),
+                    pden=lambda: sw.pden(s, t, p, pr))[name]()
+
+    def test_all_outputs(self):
+        res = sw.state(self.s, self.t, self.p, outputs=self.outputs,
+                       pr=self.pr)
+        for name, value in zip(self.outputs, res):
+            np.testing.assert_array_equal(value, self.expected(name))
+
+    def test_single_output(self):
+        for name in self.outputs:
+            value = sw.state(self.s, self.t, self.p, outputs=name, pr=self.pr)
+            np.testing.assert_array_equal(value, self.expected(name))
+
+    def test_pressure_broadcast(self):
+        # Pressure with more dimensions than salinity and temperature.
+        s, t = self.s[:, :1, None], self.t[:, :1, None]
+        p = self.p.reshape(1, 1, -1)
+        res = sw.state(s, t, p, outputs=('dens0', 'dens', 'svan'))
+        for value, expected in zip(res, (sw.dens0(s, t), sw.dens(s, t, p),
+                                         sw.svan(s, t, p))):
+            np.testing.assert_array_equal(value, expected)
+
+    def test_unknown_output(self):
+        self.assertRaises(NameError, sw.state, self.s, self.t, self.p,
+                          outputs=('dens', 'rho'))
+
+
+if __name__ == '__main__':
+    unittest.main()
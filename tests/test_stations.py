@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# test_stations.py
+#
+# purpose:  Test the nearest station search against `dist`.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater import stations
+
+
+def positions(n, rng):
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    return lat, lon
+
+
+class StationIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        self.lat, self.lon = positions(500, rng)
+        self.qlat, self.qlon = positions(60, rng)
+        self.index = sw.StationIndex(self.lat, self.lon, brute=True,
+                                     block=1000)
+
+    def distances(self, q, units='km'):
+        """Distances from query `q` to all the stations with `dist`."""
+        lat = np.repeat(self.qlat[q], 2 * self.lat.size)
+        lon = np.repeat(self.qlon[q], 2 * self.lon.size)
+        lat[1::2], lon[1::2] = self.lat, self.lon
+        return sw.dist(lat, lon, units=units)[0][::2]
+
+    def test_query(self):
+        for units in ('km', 'nm'):
+            dist, idx = self.index.query(self.qlat, self.qlon, k=3,
+                                         units=units)
+            self.assertEqual(idx.shape, (60, 3))
+            for q in range(self.qlat.size):
+                expected = self.distances(q, units)
+                np.testing.assert_array_equal(dist[q], expected[idx[q]])
+                np.testing.assert_array_equal(dist[q],
+                                              np.sort(expected)[:3])
+
+    def test_shapes(self):
+        dist, idx = self.index.query(self.qlat.reshape(6, 10),
+                                     self.qlon.reshape(6, 10))
+        self.assertEqual(dist.shape, (6, 10))
+        np.testing.assert_array_equal(
+            idx.ravel(), self.index.query(self.qlat, self.qlon, k=2)[1][:, 0])
+        dist, idx = self.index.query(self.lat[7], self.lon[7])
+        self.assertEqual((dist, idx), (0, 7))
+        self.assertRaises(ValueError, self.index.query, 0, 0, k=0)
+        self.assertRaises(ValueError, self.index.query, 0, 0, k=501)
+
+    def test_query_radius(self):
+        r = np.linspace(100, 3000, self.qlat.size)
+        dist, idx = self.index.query_radius(self.qlat, self.qlon, r)
+        self.assertEqual(len(idx), self.qlat.size)
+        for q in range(self.qlat.size):
+            expected = self.distances(q)
+            inside = np.flatnonzero(expected <= r[q])
+            self.assertEqual(set(idx[q]), set(inside))
+            np.testing.assert_array_equal(dist[q], np.sort(expected[inside]))
+        dist, idx = self.index.query_radius([], [], 100)
+        self.assertEqual(len(idx), 0)
+
+    @unittest.skipIf(stations.cKDTree is None, "SciPy is not available")
+    def test_tree(self):
+        tree = sw.StationIndex(self.lat, self.lon)
+        for x, y in zip(tree.query(self.qlat, self.qlon, k=5),
+                        self.index.query(self.qlat, self.qlon, k=5)):
+            np.testing.assert_array_equal(x, y)
+        for x, y in zip(tree.query_radius(self.qlat, self.qlon, 1500),
+                        self.index.query_radius(self.qlat, self.qlon, 1500)):
+            np.testing.assert_array_equal(x.values, y.values)
+            np.testing.assert_array_equal(x.offsets, y.offsets)
+
+
+if __name__ == '__main__':
+    unittest.main()
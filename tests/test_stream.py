@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+#
+# test_stream.py
+#
+# purpose:  Test the streaming evaluation over blocks.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater.library import T68conv
+
+
+def _blocks(arrays, size):
+    n = len(arrays[0])
+    for start in range(0, n, size):
+        yield tuple(x[start:start + size] for x in arrays)
+
+
+class Stream(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(1983)
+        n = 1000
+        self.s = rng.uniform(30, 37, n)
+        self.t = rng.uniform(-1, 30, n)
+        self.p = rng.uniform(0, 6000, n)
+        self.r = rng.uniform(0.5, 1.5, n)
+
+    def check(self, func, arrays, chunksize, size=300, **kw):
+        expected = func(*arrays, **kw)
+        res = list(sw.stream.evaluate(func, _blocks(arrays, size),
+                                      chunksize=chunksize, **kw))
+        self.assertEqual(len(res), -(-len(arrays[0]) // size))
+        if isinstance(expected, tuple):
+            for k, x in enumerate(expected):
+                np.testing.assert_array_equal(
+                    np.concatenate([r[k] for r in res]), x)
+        else:
+            np.testing.assert_array_equal(np.concatenate(res), expected)
+
+    def test_functions(self):
+        s, t, p, r = self.s, self.t, self.p, self.r
+        for chunksize in (None, 64, 300, 65536):
+            self.check(sw.salt, (r, t, p), chunksize)
+            self.check(sw.ptmp, (s, t, p), chunksize, pr=1000.)
+            self.check(sw.pden, (s, t, p), chunksize)
+            self.check(sw.svel, (s, t, p), chunksize)
+            self.check(sw.smow, (t,), chunksize)
+            self.check(sw.state, (s, t, p), chunksize)
+
+    def test_two_dimensional_blocks(self):
+        s, t, p = [x.reshape(100, 10) for x in (self.s, self.t, self.p)]
+        blocks = [(s[:50], t[:50], p[:50]), (s[50:], t[50:], p[50:])]
+        res = list(sw.stream.evaluate(sw.dens, blocks, chunksize=25))
+        np.testing.assert_array_equal(np.concatenate(res), sw.dens(s, t, p))
+        # Scalar and broadcast arguments.
+        lat = np.linspace(-30, 30, 10)
+        res = sw.stream.evaluate(sw.dpth, [(p, lat), (1000., lat)],
+                                 chunksize=7)
+        np.testing.assert_array_equal(next(res), sw.dpth(p, lat))
+        np.testing.assert_array_equal(next(res), sw.dpth(1000., lat))
+
+    def test_single_array_blocks(self):
+        res = list(sw.stream.evaluate(T68conv, iter([self.t]),
+                                      chunksize=100))
+        np.testing.assert_array_equal(res[0], T68conv(self.t))
+
+    def test_lazy(self):
+        consumed = []
+
+        def blocks():
+            for block in _blocks((self.s, self.t, self.p), 100):
+                consumed.append(len(block[0]))
+                yield block
+
+        stream = sw.stream.wrap(sw.svel, chunksize=32)(blocks())
+        self.assertEqual(consumed, [])
+        next(stream)
+        self.assertEqual(consumed, [100])
+        self.assertEqual(len(list(stream)), 9)
+
+    def test_workspace_is_bounded(self):
+        ws = sw.Workspace()
+        chunksize = 64
+        blocks = _blocks((self.s, self.t, self.p), 500)
+        for _ in sw.stream.evaluate(sw.pden, blocks, chunksize=chunksize,
+                                    ws=ws):
+            pass
+        self.assertTrue(0 < ws.nbytes <= 30 * 8 * chunksize)
+
+    def test_masked(self):
+        s = np.ma.masked_greater(self.s, 36)
+        blocks = _blocks((s, self.t, self.p), 300)
+        res = list(sw.stream.evaluate(sw.dens, blocks, chunksize=64))
+        expected = sw.dens(s, self.t, self.p)
+        res = np.ma.concatenate(res)
+        np.testing.assert_array_equal(res.mask, expected.mask)
+        np.testing.assert_array_equal(res.compressed(), expected.compressed())
+
+    def test_profiles_are_not_split(self):
+        s = 34 + np.linspace(0, 1, 40).reshape(20, 2)
+        t = np.linspace(25, 2, 20)[:, None] * np.ones((1, 2))
+        p = np.linspace(0, 4000, 20)[:, None] * np.ones((1, 2))
+        res = list(sw.stream.evaluate(sw.gpan, [(s, t, p)], chunksize=4))
+        np.testing.assert_array_equal(res[0], sw.gpan(s, t, p))
+
+
+class OutOfCore(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        rng = np.random.RandomState(1983)
+        shape = (50, 7, 3)
+        self.s = rng.uniform(30, 37, shape)
+        self.t = rng.uniform(-1, 30, shape)
+        self.p = np.linspace(0, 5500, shape[0])[:, None, None] * np.ones(shape)
+        self.files = []
+        for name in 'stp':
+            fname = os.path.join(self.path, name + '.npy')
+            np.save(fname, getattr(self, name))
+            self.files.append(fname)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_paths(self):
+        calls = []
+        output = os.path.join(self.path, 'pden.npy')
+        res = sw.stream.out_of_core(sw.pden, self.files, output,
+                                    chunksize=50, progress=lambda *a:
+                                    calls.append(a), pr=1000.)
+        self.assertTrue(isinstance(res, np.memmap))
+        expected = sw.pden(self.s, self.t, self.p, 1000.)
+        np.testing.assert_array_equal(np.load(output), expected)
+        total = self.s.size
+        self.assertEqual(calls[-1], (total, total))
+        self.assertEqual(len(calls), -(-50 // 2))  # 2 rows of 21 per block.
+
+    def test_memmaps_and_broadcast(self):
+        s = np.load(self.files[0], mmap_mode='r')
+        out = np.memmap(os.path.join(self.path, 'svel.dat'), mode='w+',
+                        dtype=np.float64, shape=s.shape)
+        for prefetch in (True, False):
+            res = sw.stream.out_of_core(sw.svel, (s, 10., self.files[2]), out,
+                                        chunksize=100, prefetch=prefetch)
+            self.assertTrue(res is out)
+            np.testing.assert_array_equal(out, sw.svel(self.s, 10., self.p))
+        lat = np.linspace(-30, 30, 3)
+        res = sw.stream.out_of_core(sw.dpth, (self.files[2], lat),
+                                    os.path.join(self.path, 'dpth.npy'),
+                                    chunksize=10)
+        np.testing.assert_array_equal(res, sw.dpth(self.p, lat))
+
+    def test_several_outputs(self):
+        names = [os.path.join(self.path, name + '.npy') for name in
+                 ('dens', 'svan')]
+        res = sw.stream.out_of_core(sw.state, self.files, tuple(names),
+                                    chunksize=64, outputs=('dens', 'svan'))
+        for fname, x, y in zip(names, res, sw.state(self.s, self.t, self.p,
+                                                    ('dens', 'svan'))):
+            np.testing.assert_array_equal(x, y)
+            np.testing.assert_array_equal(np.load(fname), y)
+        self.assertRaises(ValueError, sw.stream.out_of_core, sw.state,
+                          self.files, names[0], outputs=('dens', 'svan'))
+
+    def test_errors(self):
+        output = os.path.join(self.path, 'gpan.npy')
+        self.assertRaises(ValueError, sw.stream.out_of_core, sw.gpan,
+                          self.files, output)
+        self.assertRaises(ValueError, sw.stream.out_of_core, sw.dens,
+                          self.files, np.empty(3))
+
+        def failing():
+            yield
+            raise IOError("Disk error.")
+
+        self.assertRaises(IOError, list, sw.stream._prefetch(failing()))
+
+    def test_prefetch_stops(self):
+        threads = []
+
+        def source():
+            threads.append(threading.current_thread())
+            for k in range(100):
+                yield k
+
+        chunks = sw.stream._prefetch(source(), timeout=0.01)
+        self.assertEqual(next(chunks), 0)
+        chunks.close()
+        threads[0].join(5)
+        self.assertFalse(threads[0].is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
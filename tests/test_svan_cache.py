@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# test_svan_cache.py
+#
+# purpose:  Test the cached reference specific volume of `svan`.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+import numpy as np
+import seawater as sw
+from seawater import geostrophic
+
+
+def svan(s, t, p):
+    """The original `svan`, without the cache."""
+    return 1 / sw.dens(s, t, p) - 1 / sw.dens(35., 0., p)
+
+
+class SvanCache(unittest.TestCase):
+    def setUp(self):
+        geostrophic._ref_cache.clear()
+        rng = np.random.RandomState(1983)
+        shape = (50, 12)
+        self.p = np.linspace(0, 4000, shape[0])[:, None] * np.ones(shape)
+        self.t = 2 + 20 * np.exp(-self.p / 700.) + rng.normal(0, 0.1, shape)
+        self.s = 34.7 + np.exp(-self.p / 400.) + rng.normal(0, 0.01, shape)
+
+    def tearDown(self):
+        geostrophic._ref_cache.clear()
+
+    def test_pressure_axis(self):
+        s, t, p = self.s, self.t, self.p
+        axis = p[:, :1]
+        for pressure in (p, axis, np.broadcast_to(axis, p.shape), p.T.T):
+            np.testing.assert_array_equal(sw.svan(s, t, pressure),
+                                          svan(s, t, pressure))
+        self.assertEqual(len(geostrophic._ref_cache), 1)
+        ref = list(geostrophic._ref_cache.values())[0]
+        self.assertEqual(ref.shape, axis.shape)
+        self.assertFalse(ref.flags.writeable)
+
+    def test_distinct_columns(self):
+        p = self.p + np.arange(self.p.shape[1])
+        np.testing.assert_array_equal(sw.svan(self.s, self.t, p),
+                                      svan(self.s, self.t, p))
+        ref = list(geostrophic._ref_cache.values())[0]
+        self.assertEqual(ref.shape, p.shape)
+
+    def test_gpan(self):
+        expected = sw.gpan(self.s, self.t, self.p)
+        self.assertEqual(len(geostrophic._ref_cache), 1)
+        np.testing.assert_array_equal(sw.gpan(self.s, self.t, self.p),
+                                      expected)
+        np.testing.assert_array_equal(sw.gpan(self.s, self.t, self.p[:, :1]),
+                                      expected)
+        self.assertEqual(len(geostrophic._ref_cache), 1)
+
+    def test_bounded(self):
+        for k in range(geostrophic._ref_entries + 5):
+            sw.svan(35, 10, self.p[:, 0] + k)
+        self.assertEqual(len(geostrophic._ref_cache),
+                         geostrophic._ref_entries)
+        # The least recently used grids were dropped.
+        np.testing.assert_array_equal(sw.svan(35, 10, self.p[:, 0]),
+                                      svan(35, 10, self.p[:, 0]))
+        self.assertEqual(list(geostrophic._ref_cache.keys())[0][-1],
+                         (self.p[:, 0] + 6).tobytes())
+
+    def test_dtype_mode(self):
+        s, t, p = [x.astype(np.float32) for x in (self.s, self.t, self.p)]
+        expected = sw.svan(s, t, p)
+        geostrophic._ref_cache.clear()
+        sw.set_dtype_mode('preserve')
+        try:
+            sw.svan(s, t, p)
+        finally:
+            sw.set_dtype_mode('promote')
+        res = sw.svan(s, t, p)
+        self.assertEqual(res.dtype, expected.dtype)
+        np.testing.assert_array_equal(res, expected)
+        self.assertEqual(len(geostrophic._ref_cache), 2)
+
+    def test_scalar(self):
+        self.assertEqual(sw.svan(35, 10, 1000.), svan(35, 10, 1000.))
+        self.assertEqual(len(geostrophic._ref_cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
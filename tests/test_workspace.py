@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# test_workspace.py
+#
+# purpose:  Test the out= and Workspace arguments.
+#
+# obs:
+#
+
+
+from __future__ import division
+
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2.
+    tracemalloc = None
+
+import numpy as np
+import seawater as sw
+from seawater.library import T68conv, T90conv
+
+
+def _cases(n):
+    rng = np.random.RandomState(1983)
+    s = rng.uniform(30, 37, n)
+    t = rng.uniform(-1, 30, n)
+    p = rng.uniform(0, 6000, n)
+    r = rng.uniform(0.5, 1.5, n)
+    lat = rng.uniform(-80, 80, n)
+    lon = rng.uniform(-90, 90, n)  # No wrap around 180.
+    return dict(adtg=(sw.adtg, (s, t, p)),
+                alpha=(sw.alpha, (s, t, p)),
+                aonb=(sw.aonb, (s, t, p)),
+                beta=(sw.beta, (s, t, p)),
+                cp=(sw.cp, (s, t, p)),
+                dens0=(sw.dens0, (s, t)),
+                dens=(sw.dens, (s, t, p)),
+                dpth=(sw.dpth, (p, lat)),
+                fp=(sw.fp, (s, p)),
+                g=(sw.g, (lat, -p)),
+                pden=(sw.pden, (s, t, p, 1000.)),
+                pres=(sw.pres, (p, lat)),
+                ptmp=(sw.ptmp, (s, t, p, 1000.)),
+                salt=(sw.salt, (r, t, p)),
+                svel=(sw.svel, (s, t, p)),
+                temp=(sw.temp, (s, t, p, 1000.)),
+                salds=(sw.salds, (r ** 0.5, t - 15)),
+                salrp=(sw.salrp, (r, t, p)),
+                salrt=(sw.salrt, (t,)),
+                seck=(sw.seck, (s, t, p)),
+                sals=(sw.sals, (r, t)),
+                smow=(sw.smow, (t,)),
+                f=(sw.f, (lat,)),
+                satAr=(sw.satAr, (s, t)),
+                satN2=(sw.satN2, (s, t)),
+                satO2=(sw.satO2, (s, t)),
+                swvel=(sw.swvel, (p, p / 2)),
+                svan=(sw.svan, (s, t, p)),
+                dist=(sw.dist, (lat, lon)),
+                state=(sw.state, (s, t, p)))
+
+
+def _empty_like(res):
+    if isinstance(res, tuple):
+        return tuple(np.empty_like(x) for x in res)
+    return np.empty_like(res)
+
+
+class OutAndWorkspace(unittest.TestCase):
+    def setUp(self):
+        self.cases = _cases(1000)
+
+    def assert_same(self, a, b, msg):
+        if isinstance(a, tuple):
+            for x, y in zip(a, b):
+                self.assert_same(x, y, msg)
+        else:
+            np.testing.assert_array_equal(a, b, err_msg=msg)
+
+    def test_out(self):
+        ws = sw.Workspace()
+        for name, (func, args) in self.cases.items():
+            expected = func(*args)
+            out = _empty_like(expected)
+            for kw in (dict(out=out), dict(out=out, ws=ws)):
+                res = func(*args, **kw)
+                if isinstance(out, tuple):
+                    for x, y in zip(res, out):
+                        self.assertTrue(x is y, msg=name)
+                else:
+                    self.assertTrue(res is out, msg=name)
+                self.assert_same(res, expected, name)
+
+    def test_out_overlaps_input(self):
+        s, t, p = [np.array(x) for x in self.cases['dens'][1]]
+        expected = sw.dens(s, t, p)
+        res = sw.dens(s, t, p, out=s)
+        self.assertTrue(res is s)
+        np.testing.assert_array_equal(res, expected)
+
+    def test_temperature_conversions(self):
+        t = self.cases['smow'][1][0]
+        out = np.empty_like(t)
+        self.assertTrue(T68conv(t, out=out) is out)
+        np.testing.assert_array_equal(out, T68conv(t))
+        self.assertTrue(T90conv(t, out=out) is out)
+        np.testing.assert_array_equal(out, T90conv(t))
+
+    def test_profiles(self):
+        rng = np.random.RandomState(1983)
+        s = 34 + rng.uniform(0, 2, (20, 4))
+        t = np.linspace(25, 2, 20)[:, None] + rng.normal(0, 0.1, (20, 4))
+        p = np.linspace(0, 4000, 20)[:, None] * np.ones((1, 4))
+        lat, lon = np.array([-22., -21.5, -21., -20.5]), np.zeros(4)
+        ws = sw.Workspace()
+        ga = sw.gpan(s, t, p)
+        for func, args in ((sw.gpan, (s, t, p)),
+                           (sw.bfrq, (s, t, p, lat)),
+                           (sw.gvel, (ga, lat, lon))):
+            expected = func(*args)
+            out = _empty_like(expected)
+            for _ in range(2):
+                res = func(*args, out=out, ws=ws)
+                self.assert_same(res, expected, func.__name__)
+        # Squeezed output of a single profile.
+        expected = sw.gpan(s[:, 0], t[:, 0], p[:, 0])
+        out = np.empty_like(expected)
+        self.assertTrue(sw.gpan(s[:, 0], t[:, 0], p[:, 0], out=out) is out)
+        np.testing.assert_array_equal(out, expected)
+
+    def test_workspace(self):
+        ws = sw.Workspace()
+        self.assertEqual(ws.nbytes, 0)
+        func, args = self.cases['dens']
+        func(*args, ws=ws)
+        nbytes = ws.nbytes
+        self.assertTrue(nbytes > 0)
+        func(*args, ws=ws)
+        self.assertEqual(ws.nbytes, nbytes)
+        ws.clear()
+        self.assertEqual(ws.nbytes, 0)
+
+    def test_max_bytes(self):
+        func, (s, t, p) = self.cases['dens']
+        limit = 10 * s.nbytes
+        ws = sw.Workspace(max_bytes=limit)
+        for n in range(10, s.size, 10):
+            res = func(s[:n], t[:n], p[:n], ws=ws)
+            np.testing.assert_array_equal(res, func(s[:n], t[:n], p[:n]))
+            self.assertTrue(ws.nbytes <= limit)
+        self.assertTrue(ws.nbytes > 0)
+        # The least recently used arrays go first.
+        ws = sw.Workspace(max_bytes=100)
+        a, = ws.get('a', 1, (10,), np.float64)
+        b, = ws.get('b', 1, (10,), np.float64)
+        self.assertEqual(ws.nbytes, 80)
+        self.assertTrue(ws.get('b', 1, (10,), np.float64)[0] is b)
+        self.assertFalse(ws.get('a', 1, (10,), np.float64)[0] is a)
+
+
+@unittest.skipIf(tracemalloc is None, "tracemalloc is not available")
+class NoAllocation(unittest.TestCase):
+    """Repeated calls at a fixed shape must not allocate new arrays once the
+    workspace has warmed up."""
+    n = 100000
+
+    def test_no_allocation(self):
+        cases = _cases(self.n)
+        limit = 0.1 * np.empty(self.n).nbytes
+        for name, (func, args) in sorted(cases.items()):
+            ws = sw.Workspace()
+            out = _empty_like(func(*args))
+            func(*args, out=out, ws=ws)  # Warm up.
+            tracemalloc.start()
+            try:
+                for _ in range(3):
+                    func(*args, out=out, ws=ws)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertTrue(peak < limit,
+                            msg="%s allocated %d bytes" % (name, peak))
+
+    def test_no_allocation_profiles(self):
+        # NumPy may still use its small, fixed size, iterator buffer when an
+        # input is broadcast, e.g. the latitudes against the profiles.
+        rng = np.random.RandomState(1983)
+        shape = (400, 1000)
+        s = 34 + rng.uniform(0, 2, shape)
+        t = rng.uniform(2, 25, shape)
+        p = np.linspace(0, 4000, shape[0])[:, None] * np.ones(shape)
+        lat = rng.uniform(-30, 30, shape[1])
+        lon = np.linspace(0, 60, shape[1])
+        ga = sw.gpan(s, t, p)
+        limit = 0.1 * p.nbytes
+        for func, args in ((sw.gpan, (s, t, p)),
+                           (sw.bfrq, (s, t, p)),
+                           (sw.bfrq, (s, t, p, lat)),
+                           (sw.gvel, (ga, lat, lon))):
+            ws = sw.Workspace()
+            out = _empty_like(func(*args))
+            func(*args, out=out, ws=ws)  # Warm up.
+            tracemalloc.start()
+            try:
+                func(*args, out=out, ws=ws)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertTrue(peak < limit, msg="%s allocated %d bytes" %
+                            (func.__name__, peak))
+
+
+if __name__ == '__main__':
+    unittest.main()